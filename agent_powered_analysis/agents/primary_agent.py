@@ -20,9 +20,15 @@ class PrimaryAgent:
     natural language query intents.
     """
     
-    def __init__(self):
-        """Initialize the Primary Agent with OpenAI configuration."""
-        self.client = openai.OpenAI(api_key=config.openai.api_key)
+    def __init__(self, openai_client: Optional[openai.OpenAI] = None):
+        """
+        Initialize the Primary Agent with OpenAI configuration.
+
+        Args:
+            openai_client: Optional OpenAI client instance; sharing one
+                           client across agents reuses its HTTP connection pool
+        """
+        self.client = openai_client or openai.OpenAI(api_key=config.openai.api_key)
         self.model = config.openai.model
         self.temperature = config.openai.temperature
         self.max_tokens = config.openai.max_completion_tokens
@@ -7,7 +7,9 @@ import logging
 import sys
 import os
 from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+import numpy as np
 
 # Add rag_system to path for imports
 rag_system_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'rag_system')
@@ -15,9 +17,14 @@ sys.path.append(rag_system_path)
 
 try:
     from rag_system import CodeRAGSystem
+    # The store's own cache-backed embeddings: batch queries must embed
+    # with the same model the index was built with so the vectors can be
+    # passed straight into the similarity search
+    from rag_system.config.llms import EMBEDDINGS as RAG_EMBEDDINGS
 except ImportError as e:
     logging.getLogger(__name__).error(f"Failed to import RAG system: {e}")
     CodeRAGSystem = None
+    RAG_EMBEDDINGS = None
 
 
 @dataclass
@@ -84,17 +91,20 @@ class RAGAgent:
             self.logger.error(f"Error checking RAG availability: {str(e)}")
             return False
     
-    def search_documents(self, query: str, k: int = 5, language: Optional[str] = None, 
-                        directory: Optional[str] = None) -> RAGSearchResult:
+    def search_documents(self, query: str, k: int = 5, language: Optional[str] = None,
+                        directory: Optional[str] = None,
+                        query_embedding: Optional[List[float]] = None) -> RAGSearchResult:
         """
         Search for relevant code documents using vector similarity.
-        
+
         Args:
             query: Natural language query
             k: Number of top documents to retrieve
             language: Optional language filter (e.g., 'python', 'javascript')
             directory: Optional directory filter
-            
+            query_embedding: Optional precomputed embedding of query, reused
+                             instead of embedding the query again
+
         Returns:
             RAGSearchResult with search results and metadata
         """
@@ -118,7 +128,8 @@ class RAGAgent:
                 query=query,
                 k=k,
                 language=language,
-                directory=directory
+                directory=directory,
+                query_embedding=query_embedding
             )
             
             if result['documents_found'] == 0:
@@ -153,6 +164,68 @@ class RAGAgent:
                 error_message=f"RAG search failed: {str(e)}"
             )
     
+    def search_documents_batch(self, queries: List[str], k: int = 5,
+                               similarity_threshold: float = 0.95) -> List[RAGSearchResult]:
+        """
+        Search for multiple queries, sharing vector searches across near-duplicates.
+
+        All queries are embedded in one call through the store's shared
+        cache-backed embeddings, clustered by cosine similarity, and only
+        one vector search runs per cluster; members of a cluster share the
+        representative's results. The representative's embedding is passed
+        into the search as well, so the whole batch pays exactly one
+        embedding API call. Intents produced by the primary agent are
+        often near-paraphrases, so this cuts both embedding calls and
+        vector searches.
+
+        Args:
+            queries: List of natural language queries
+            k: Number of top documents to retrieve per query
+            similarity_threshold: Minimum cosine similarity to share results
+
+        Returns:
+            List of RAGSearchResult objects, aligned with the input queries
+        """
+        if not queries:
+            return []
+
+        try:
+            if RAG_EMBEDDINGS is None:
+                raise RuntimeError("RAG embeddings not available")
+            raw_embeddings = RAG_EMBEDDINGS.embed_documents(list(queries))
+            embeddings = np.asarray(raw_embeddings, dtype=np.float32)
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+            similarities = embeddings @ embeddings.T
+        except Exception as e:
+            self.logger.warning(f"Batch embedding failed, searching queries individually: {str(e)}")
+            return [self.search_documents(query, k=k) for query in queries]
+
+        # Greedy clustering: each query joins the first existing cluster
+        # whose representative is similar enough, else starts its own
+        cluster_of = {}  # query index -> representative index
+        representatives = []
+        for index in range(len(queries)):
+            for rep_index in representatives:
+                if similarities[index, rep_index] >= similarity_threshold:
+                    cluster_of[index] = rep_index
+                    break
+            else:
+                representatives.append(index)
+                cluster_of[index] = index
+
+        self.logger.info(f"RAG batch search: {len(queries)} queries in {len(representatives)} clusters")
+
+        rep_results = {
+            rep_index: self.search_documents(
+                queries[rep_index], k=k, query_embedding=raw_embeddings[rep_index])
+            for rep_index in representatives
+        }
+
+        return [
+            replace(rep_results[cluster_of[index]], query=queries[index])
+            for index in range(len(queries))
+        ]
+
     def get_system_info(self) -> Dict[str, Any]:
         """
         Get information about the RAG system status.
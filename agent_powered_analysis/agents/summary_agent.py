@@ -47,7 +47,7 @@ class SummaryAgent:
                 return "No matching code elements found in the codebase."
             
             # Prepare structured data for implementation guide generation
-            structured_data = self._prepare_data_for_summary(query_result.records)
+            structured_data = self._prepare_data_for_summary(query_result.to_columnar())
             
             prompt = self._create_summary_prompt(original_intent, structured_data, len(query_result.records))
             messages = [{"role": "user", "content": prompt}]
@@ -84,94 +84,89 @@ class SummaryAgent:
             self.logger.error(f"Summary generation failed: {str(e)}")
             return f"Unable to generate component summaries: {str(e)}"
     
-    def _prepare_data_for_summary(self, records: List[Dict[str, Any]]) -> str:
+    def _prepare_data_for_summary(self, columns: Dict[str, List[Any]]) -> str:
         """
         Prepare codebase analysis data for implementation guidance by extracting relevant patterns.
-        
+
         Args:
-            records: List of codebase analysis records
-            
+            columns: Columnar view of analysis records from QueryResult.to_columnar()
+
         Returns:
             Structured text representation focusing on implementation context
         """
-        if not records:
+        if not columns['names'] and not columns['relationship_types']:
             return "No data to summarize."
-        
+
         # Group records by type and extract implementation-relevant patterns
         patterns = {
             'classes': [],
             'functions': [],
             'methods': [],
             'modules': [],
-            'relationships': [],
+            'relationships': list(columns['relationship_types']),
             'files': set(),
             'code_samples': [],
             'other': []
         }
-        
-        for record in records:
-            for _, value in record.items():
-                if isinstance(value, dict) and 'labels' in value:
-                    labels = value.get('labels', [])
-                    properties = value.get('properties', {})
-                    
-                    if 'CLASS' in labels:
-                        class_info = {
-                            'name': properties.get('name', 'Unknown'),
-                            'file': properties.get('file_path', 'Unknown'),
-                            'has_code': 'code' in properties and properties['code'],
-                            'signature': properties.get('signature', ''),
-                            'code': properties.get('code', '')[:500] if properties.get('code') else ''  # First 500 chars for context
-                        }
-                        patterns['classes'].append(class_info)
-                        patterns['files'].add(properties.get('file_path', 'Unknown'))
-                        if properties.get('code'):
-                            patterns['code_samples'].append({'type': 'class', 'name': properties.get('name'), 'code': properties.get('code')[:300]})
-                    
-                    elif 'FUNCTION' in labels:
-                        func_info = {
-                            'name': properties.get('name', 'Unknown'),
-                            'file': properties.get('file_path', 'Unknown'),
-                            'has_signature': 'signature' in properties,
-                            'signature': properties.get('signature', ''),
-                            'code': properties.get('code', '')[:500] if properties.get('code') else ''
-                        }
-                        patterns['functions'].append(func_info)
-                        patterns['files'].add(properties.get('file_path', 'Unknown'))
-                        if properties.get('code'):
-                            patterns['code_samples'].append({'type': 'function', 'name': properties.get('name'), 'code': properties.get('code')[:300]})
-                    
-                    elif 'METHOD' in labels:
-                        method_info = {
-                            'name': properties.get('name', 'Unknown'),
-                            'class': properties.get('class', 'Unknown'),
-                            'file': properties.get('file_path', 'Unknown'),
-                            'signature': properties.get('signature', ''),
-                            'code': properties.get('code', '')[:500] if properties.get('code') else ''
-                        }
-                        patterns['methods'].append(method_info)
-                        patterns['files'].add(properties.get('file_path', 'Unknown'))
-                        if properties.get('code'):
-                            patterns['code_samples'].append({'type': 'method', 'name': f"{properties.get('class', 'Unknown')}.{properties.get('name', 'Unknown')}", 'code': properties.get('code')[:300]})
-                    
-                    elif 'MODULE' in labels:
-                        module_info = {
-                            'name': properties.get('name', 'Unknown'),
-                            'file': properties.get('file_path', 'Unknown')
-                        }
-                        patterns['modules'].append(module_info)
-                        patterns['files'].add(properties.get('file_path', 'Unknown'))
-                    
-                    else:
-                        patterns['other'].append({
-                            'labels': labels,
-                            'name': properties.get('name', 'Unknown')
-                        })
-                
-                elif isinstance(value, dict) and 'type' in value:
-                    # This is a relationship
-                    patterns['relationships'].append(value.get('type', 'Unknown'))
-        
+
+        # Tight loop over the aligned columns - flat list access per
+        # entity instead of nested dict hops per record
+        for name, labels, file_path, properties in zip(
+                columns['names'], columns['labels'],
+                columns['file_paths'], columns['properties']):
+            if 'CLASS' in labels:
+                class_info = {
+                    'name': name,
+                    'file': file_path,
+                    'has_code': 'code' in properties and properties['code'],
+                    'signature': properties.get('signature', ''),
+                    'code': properties.get('code', '')[:500] if properties.get('code') else ''  # First 500 chars for context
+                }
+                patterns['classes'].append(class_info)
+                patterns['files'].add(file_path)
+                if properties.get('code'):
+                    patterns['code_samples'].append({'type': 'class', 'name': name, 'code': properties.get('code')[:300]})
+
+            elif 'FUNCTION' in labels:
+                func_info = {
+                    'name': name,
+                    'file': file_path,
+                    'has_signature': 'signature' in properties,
+                    'signature': properties.get('signature', ''),
+                    'code': properties.get('code', '')[:500] if properties.get('code') else ''
+                }
+                patterns['functions'].append(func_info)
+                patterns['files'].add(file_path)
+                if properties.get('code'):
+                    patterns['code_samples'].append({'type': 'function', 'name': name, 'code': properties.get('code')[:300]})
+
+            elif 'METHOD' in labels:
+                method_info = {
+                    'name': name,
+                    'class': properties.get('class', 'Unknown'),
+                    'file': file_path,
+                    'signature': properties.get('signature', ''),
+                    'code': properties.get('code', '')[:500] if properties.get('code') else ''
+                }
+                patterns['methods'].append(method_info)
+                patterns['files'].add(file_path)
+                if properties.get('code'):
+                    patterns['code_samples'].append({'type': 'method', 'name': f"{properties.get('class', 'Unknown')}.{name}", 'code': properties.get('code')[:300]})
+
+            elif 'MODULE' in labels:
+                module_info = {
+                    'name': name,
+                    'file': file_path
+                }
+                patterns['modules'].append(module_info)
+                patterns['files'].add(file_path)
+
+            else:
+                patterns['other'].append({
+                    'labels': labels,
+                    'name': name
+                })
+
         # Build structured summary focusing on implementation context
         summary_parts = []
         
@@ -6,14 +6,29 @@ formal Cypher query strings for Neo4j using OpenAI Structured Outputs.
 
 import logging
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import openai
 import time
 from ..config import config
-from ..utils.prompts import TRANSLATOR_AGENT_SYSTEM_PROMPT, TRANSLATOR_AGENT_USER_PROMPT
-from ..models.agent_models import TranslatorAgentResponse
+from ..utils.prompts import (
+    TRANSLATOR_AGENT_SYSTEM_PROMPT,
+    TRANSLATOR_AGENT_USER_PROMPT,
+    TRANSLATOR_AGENT_BATCH_USER_PROMPT,
+)
+from ..models.agent_models import TranslatorAgentResponse, TranslatorBatchResponse
 from ..utils.openai_logger import openai_logger
 
+# Validation regexes compiled once at import; validate_cypher runs on every
+# generated and refined query, so per-call re.compile would dominate this
+# pure-Python path
+# One alternation scanned once with finditer yields every clause
+# boundary as a match event, so UNION validation traverses the query a
+# single time instead of a split pass plus a RETURN-clause scan per part
+_CLAUSE_KEYWORD_RE = re.compile(r'\b(UNION|RETURN|ORDER|LIMIT|WHERE)\b', re.IGNORECASE)
+_AS_ALIAS_RE = re.compile(r'\bAS\s+(\w+)', re.IGNORECASE)
+_COLUMN_CLEAN_RE = re.compile(r'[^\w.]')
+_DEPRECATED_EXISTS_RE = re.compile(r'\bexists\s*\([^)]+\.[^)]+\)', re.IGNORECASE)
+
 
 class TranslatorAgent:
     """
@@ -21,13 +36,24 @@ class TranslatorAgent:
     into Cypher queries for Neo4j.
     """
     
-    def __init__(self):
-        """Initialize the Translator Agent with OpenAI configuration."""
-        self.client = openai.OpenAI(api_key=config.openai.api_key)
+    def __init__(self, openai_client: Optional[openai.OpenAI] = None):
+        """
+        Initialize the Translator Agent with OpenAI configuration.
+
+        Args:
+            openai_client: Optional OpenAI client instance; sharing one
+                           client across agents reuses its HTTP connection pool
+        """
+        self.client = openai_client or openai.OpenAI(api_key=config.openai.api_key)
         self.model = config.openai.model
         self.temperature = config.openai.temperature
         self.max_tokens = config.openai.max_completion_tokens
         self.logger = logging.getLogger(__name__)
+
+        # Validation is deterministic per query text, so repeat calls on the
+        # same (whitespace-normalized) query reuse the first verdict
+        self._validation_cache: Dict[str, bool] = {}
+        self._validation_cache_max_entries = 128
     
     def translate_to_cypher(self, nl_intent: str) -> TranslatorAgentResponse:
         """
@@ -97,6 +123,90 @@ class TranslatorAgent:
             self.logger.error(f"Error in translate_to_cypher: {str(e)}")
             raise Exception(f"Failed to translate intent to Cypher: {str(e)}")
     
+    def translate_batch(self, nl_intents: List[str]) -> List[TranslatorAgentResponse]:
+        """
+        Convert multiple natural language intents into Cypher queries in one LLM call.
+
+        Sends all intents in a single structured-output request instead of one
+        round-trip per intent; results are aligned back to the input order by
+        index. Intents whose batched translation is missing or fails validation
+        fall back to individual translate_to_cypher calls.
+
+        Args:
+            nl_intents: List of natural language intents from the Primary Agent
+
+        Returns:
+            List of TranslatorAgentResponse objects, one per intent, in order
+
+        Raises:
+            Exception: If both the batch call and the per-intent fallback fail
+        """
+        if len(nl_intents) == 1:
+            return [self.translate_to_cypher(nl_intents[0])]
+
+        try:
+            self.logger.info(f"Batch translating {len(nl_intents)} intents to Cypher")
+
+            numbered_intents = "\n".join(
+                f"{index}. {intent}" for index, intent in enumerate(nl_intents)
+            )
+            messages = [
+                {"role": "system", "content": TRANSLATOR_AGENT_SYSTEM_PROMPT},
+                {"role": "user", "content": TRANSLATOR_AGENT_BATCH_USER_PROMPT.format(numbered_intents=numbered_intents)}
+            ]
+
+            start_time = time.time()
+            response = self.client.chat.completions.parse(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_completion_tokens=self.max_tokens,
+                response_format=TranslatorBatchResponse
+            )
+            duration_ms = (time.time() - start_time) * 1000
+
+            openai_logger.log_api_call(
+                method="chat.completions.parse",
+                messages=messages,
+                model=self.model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                response=response,
+                duration_ms=duration_ms,
+                agent_name="TranslatorAgent"
+            )
+
+            if response.choices[0].message.refusal:
+                self.logger.warning(f"Translator agent refused batch: {response.choices[0].message.refusal}")
+                raise Exception(f"Translator agent refused batch translation: {response.choices[0].message.refusal}")
+
+            by_index = {t.index: t for t in response.choices[0].message.parsed.translations}
+
+        except Exception as e:
+            # Batch call itself failed - translate every intent individually
+            self.logger.warning(f"Batch translation failed, falling back to per-intent calls: {str(e)}")
+            return [self.translate_to_cypher(intent) for intent in nl_intents]
+
+        results = []
+        for index, nl_intent in enumerate(nl_intents):
+            translation = by_index.get(index)
+            if translation is not None:
+                cleaned_query = self._clean_cypher_query(translation.cypher_query)
+                if self.validate_cypher(cleaned_query):
+                    results.append(TranslatorAgentResponse(
+                        cypher_query=cleaned_query,
+                        confidence=translation.confidence,
+                        explanation=translation.explanation
+                    ))
+                    continue
+                self.logger.warning(f"Batched query for intent {index} failed validation, retranslating individually")
+            else:
+                self.logger.warning(f"Batch response missing intent {index}, translating individually")
+
+            results.append(self.translate_to_cypher(nl_intent))
+
+        return results
+
     def refine_cypher(self, original_intent: str, current_query: str, feedback: str) -> TranslatorAgentResponse:
         """
         Refine a Cypher query based on feedback from query execution.
@@ -169,7 +279,53 @@ class TranslatorAgent:
         """
         if not cypher_query or len(cypher_query.strip()) < 5:
             return False
-        
+
+        cache_key = ' '.join(cypher_query.split())
+        cached = self._validation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._validate_cypher_uncached(cypher_query)
+        if len(self._validation_cache) >= self._validation_cache_max_entries:
+            self._validation_cache.clear()  # Bounded; queries rarely recur past this
+        self._validation_cache[cache_key] = result
+        return result
+
+    def validate_cypher_batch(self, queries: List[str]) -> List[bool]:
+        """
+        Validate several Cypher queries in one pass.
+
+        Duplicate queries (after whitespace normalization) are validated
+        once and share their verdict; validation is pure regex work, so
+        batching amortizes the per-call and cache-lookup overhead rather
+        than any network cost.
+
+        Args:
+            queries: The Cypher queries to validate
+
+        Returns:
+            List of validation verdicts aligned with queries
+        """
+        verdicts: Dict[str, bool] = {}
+        results = []
+        for query in queries:
+            key = ' '.join(query.split())
+            verdict = verdicts.get(key)
+            if verdict is None:
+                verdict = self.validate_cypher(query)
+                verdicts[key] = verdict
+            results.append(verdict)
+        return results
+
+    def _validate_cypher_uncached(self, cypher_query: str) -> bool:
+        """Run the actual validation checks behind the memoized wrapper.
+
+        Args:
+            cypher_query: The Cypher query to validate
+
+        Returns:
+            True if the query is valid, False otherwise
+        """
         # Check for basic Cypher syntax
         cypher_upper = cypher_query.upper()
         
@@ -201,7 +357,7 @@ class TranslatorAgent:
                 return False  # Fail validation for column count mismatches
         
         # Check for deprecated exists() syntax
-        if re.search(r'\bexists\s*\([^)]+\.[^)]+\)', cypher_query, re.IGNORECASE):
+        if _DEPRECATED_EXISTS_RE.search(cypher_query):
             self.logger.error("Deprecated exists() syntax detected - use 'property IS NOT NULL' instead")
             return False
         
@@ -223,39 +379,40 @@ class TranslatorAgent:
             True if UNION queries are valid, False otherwise
         """
         try:
-            # Split by UNION (case insensitive)
-            import re
-            union_parts = re.split(r'\bUNION\b', cypher_query, flags=re.IGNORECASE)
-            
-            if len(union_parts) < 2:
+            # Single pass: collect every clause-keyword event with its
+            # offset, then slice each RETURN clause out between its event
+            # and the next one
+            events = [(match.start(), match.end(), match.group(1).upper())
+                      for match in _CLAUSE_KEYWORD_RE.finditer(cypher_query)]
+
+            if not any(keyword == 'UNION' for _, _, keyword in events):
                 return True  # No actual UNION found
-            
+
             return_columns = []
-            
-            for part in union_parts:
-                part = part.strip()
-                if not part:
+
+            for idx, (start, end, keyword) in enumerate(events):
+                if keyword != 'RETURN':
                     continue
-                    
-                # Extract RETURN clause
-                return_match = re.search(r'\bRETURN\s+(.+?)(?:\s+ORDER|\s+LIMIT|\s+WHERE|$)', part, re.IGNORECASE | re.DOTALL)
-                if not return_match:
+
+                # The RETURN clause runs to the next clause keyword
+                # (UNION/ORDER/LIMIT/WHERE) or the end of the query
+                clause_end = events[idx + 1][0] if idx + 1 < len(events) else len(cypher_query)
+                return_clause = cypher_query[end:clause_end].strip()
+                if not return_clause:
                     continue
-                    
-                return_clause = return_match.group(1).strip()
-                
+
                 # Extract column names (handle AS aliases)
                 columns = []
                 for col in return_clause.split(','):
                     col = col.strip()
                     # Check for AS alias
                     if ' AS ' in col.upper():
-                        alias_match = re.search(r'\bAS\s+(\w+)', col, re.IGNORECASE)
+                        alias_match = _AS_ALIAS_RE.search(col)
                         if alias_match:
                             columns.append(alias_match.group(1).lower())
                     else:
                         # Use the column expression as-is, clean it
-                        clean_col = re.sub(r'[^\w.]', '', col.split('.')[-1])
+                        clean_col = _COLUMN_CLEAN_RE.sub('', col.split('.')[-1])
                         if clean_col:
                             columns.append(clean_col.lower())
                 
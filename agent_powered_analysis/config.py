@@ -32,6 +32,15 @@ class PipelineConfig:
     max_iterations: int = 5
     sufficiency_threshold: float = 0.8
     enable_logging: bool = True
+    max_intent_concurrency: int = 4
+    cache_ttl_s: float = 3600.0
+    intent_cache_size: int = 256
+    fast_sufficient_min_records: int = 5
+    final_report_mode: str = "interactive"  # "interactive" or "batch"
+    max_tokens_per_intent_summary: int = 300
+    max_tokens_merged_summary: int = 4000
+    max_tokens_final_context: int = 6000
+    enable_stagnation_early_exit: bool = True
 
 
 class Config:
@@ -76,7 +85,16 @@ class Config:
         return PipelineConfig(
             max_iterations=int(os.getenv("PIPELINE_MAX_ITERATIONS", "20")),
             sufficiency_threshold=float(os.getenv("PIPELINE_SUFFICIENCY_THRESHOLD", "0.8")),
-            enable_logging=os.getenv("PIPELINE_ENABLE_LOGGING", "true").lower() == "true"
+            enable_logging=os.getenv("PIPELINE_ENABLE_LOGGING", "true").lower() == "true",
+            max_intent_concurrency=int(os.getenv("PIPELINE_MAX_INTENT_CONCURRENCY", "4")),
+            cache_ttl_s=float(os.getenv("PIPELINE_CACHE_TTL_S", "3600")),
+            intent_cache_size=int(os.getenv("PIPELINE_INTENT_CACHE_SIZE", "256")),
+            fast_sufficient_min_records=int(os.getenv("PIPELINE_FAST_SUFFICIENT_MIN_RECORDS", "5")),
+            final_report_mode=os.getenv("PIPELINE_FINAL_REPORT_MODE", "interactive"),
+            max_tokens_per_intent_summary=int(os.getenv("PIPELINE_MAX_TOKENS_PER_INTENT_SUMMARY", "300")),
+            max_tokens_merged_summary=int(os.getenv("PIPELINE_MAX_TOKENS_MERGED_SUMMARY", "4000")),
+            max_tokens_final_context=int(os.getenv("PIPELINE_MAX_TOKENS_FINAL_CONTEXT", "6000")),
+            enable_stagnation_early_exit=os.getenv("PIPELINE_ENABLE_STAGNATION_EARLY_EXIT", "true").lower() == "true"
         )
 
 
@@ -4,40 +4,118 @@ Provides connection management and utility functions for interacting with Neo4j.
 """
 
 import logging
+import re
+import threading
+import time
 from typing import Optional, List, Dict, Any, Union
 from contextlib import contextmanager
 from neo4j import GraphDatabase, Driver, Session, Record
 from ..config import config
 
+# Client-side result cache settings for idempotent read queries
+_READ_CACHE_MAX_SIZE = 1024
+_READ_CACHE_TTL_SECONDS = 300
+_READ_QUERY_PREFIXES = ('MATCH', 'CALL DB.', 'RETURN', 'SHOW')
+
+# Clauses that mutate the graph. Generated Cypher can embed these even when
+# the caller assumed a read (e.g. MATCH ... SET), so queries containing any
+# of them are routed to the leader and never served from the read cache.
+_WRITE_CLAUSE_RE = re.compile(
+    r'\b(CREATE|MERGE|DELETE|DETACH|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b',
+    re.IGNORECASE
+)
+
+# Recommended schema DDL for the code property graph (immutable, shared)
+_CONSTRAINTS_AND_INDEXES = (
+    # Unique constraints for primary identifiers
+    "CREATE CONSTRAINT module_name_unique IF NOT EXISTS FOR (m:MODULE) REQUIRE m.name IS UNIQUE",
+    "CREATE CONSTRAINT class_name_path_unique IF NOT EXISTS FOR (c:CLASS) REQUIRE (c.name, c.file_path) IS UNIQUE",
+    "CREATE CONSTRAINT function_name_path_unique IF NOT EXISTS FOR (f:FUNCTION) REQUIRE (f.name, f.file_path) IS UNIQUE",
+    "CREATE CONSTRAINT method_name_class_unique IF NOT EXISTS FOR (m:METHOD) REQUIRE (m.name, m.class) IS UNIQUE",
+
+    # Indexes for frequently queried properties
+    "CREATE INDEX module_file_path_index IF NOT EXISTS FOR (m:MODULE) ON (m.file_path)",
+    "CREATE INDEX class_name_index IF NOT EXISTS FOR (c:CLASS) ON (c.name)",
+    "CREATE INDEX function_name_index IF NOT EXISTS FOR (f:FUNCTION) ON (f.name)",
+    "CREATE INDEX method_name_index IF NOT EXISTS FOR (m:METHOD) ON (m.name)",
+    "CREATE INDEX global_variable_name_index IF NOT EXISTS FOR (gv:GLOBAL_VARIABLE) ON (gv.name)",
+    "CREATE INDEX field_name_index IF NOT EXISTS FOR (f:FIELD) ON (f.name)",
+
+    # Text indexes so STARTS WITH predicates on code (e.g. the '<CODE>'
+    # metadata-format probe) are index-backed instead of label scans;
+    # text indexes are single-label, so one per code-carrying label
+    "CREATE TEXT INDEX class_code_text_index IF NOT EXISTS FOR (c:CLASS) ON (c.code)",
+    "CREATE TEXT INDEX function_code_text_index IF NOT EXISTS FOR (f:FUNCTION) ON (f.code)",
+    "CREATE TEXT INDEX method_code_text_index IF NOT EXISTS FOR (m:METHOD) ON (m.code)"
+)
+
 
 class Neo4jConnector:
     """
     Neo4j database connector that manages connections and provides helper functions.
     """
-    
+
     def __init__(self):
         """Initialize the Neo4j connector with configuration."""
         self.driver: Optional[Driver] = None
         self.logger = logging.getLogger(__name__)
+        self._read_cache: Dict[Any, Any] = {}  # key -> (expiry_timestamp, records)
+        self._write_epoch = 0  # Bumped on writes to invalidate cached reads
+        self._database = config.neo4j.database  # Cached - resolved on every session
+        # Bookmark manager gives causal consistency across routed queries
+        # (reads issued after a write observe that write on any cluster member)
+        try:
+            self._bookmark_manager = GraphDatabase.bookmark_manager()
+        except AttributeError:
+            # Older 5.x drivers without bookmark manager support
+            self._bookmark_manager = None
         self._connect()
     
     def _connect(self) -> None:
         """Establish connection to Neo4j database."""
         try:
+            neo4j_config = config.neo4j
             self.driver = GraphDatabase.driver(
-                config.neo4j.uri,
-                auth=(config.neo4j.username, config.neo4j.password)
+                neo4j_config.uri,
+                auth=(neo4j_config.username, neo4j_config.password),
+                keep_alive=True
             )
-            
+
             # Test the connection
-            with self.driver.session(database=config.neo4j.database) as session:
+            with self.driver.session(database=self._database) as session:
                 session.run("RETURN 1")
-            
-            self.logger.info(f"Successfully connected to Neo4j at {config.neo4j.uri}")
-            
+
+            self.logger.info(f"Successfully connected to Neo4j at {neo4j_config.uri}")
+
+            # Warm the server-side caches in the background so the first
+            # real query doesn't pay the cold-start penalty.
+            warmup_thread = threading.Thread(target=self._warm_cache, daemon=True)
+            warmup_thread.start()
+
         except Exception as e:
             self.logger.error(f"Failed to connect to Neo4j: {str(e)}")
             raise Exception(f"Neo4j connection failed: {str(e)}")
+
+    def _warm_cache(self) -> None:
+        """
+        Preload Neo4j's page cache so the first user query runs at warm-state speed.
+
+        Uses APOC's warmup procedure when available, otherwise falls back to
+        representative count queries that touch all nodes and relationships.
+        """
+        try:
+            with self.get_session() as session:
+                session.run("CALL apoc.warmup.run(true, true, true)").consume()
+            self.logger.info("Neo4j cache warmed via apoc.warmup.run")
+        except Exception:
+            # APOC not installed - fall back to full-store count scans
+            try:
+                with self.get_session() as session:
+                    session.run("MATCH (n) RETURN count(n)").consume()
+                    session.run("MATCH ()-[r]->() RETURN count(r)").consume()
+                self.logger.info("Neo4j cache warmed via count scans")
+            except Exception as e:
+                self.logger.debug(f"Cache warmup skipped: {str(e)}")
     
     @contextmanager
     def get_session(self):
@@ -50,42 +128,135 @@ class Neo4jConnector:
         if not self.driver:
             raise Exception("Neo4j driver not initialized")
         
-        session = self.driver.session(database=config.neo4j.database)
+        session = self.driver.session(database=self._database)
         try:
             yield session
         finally:
             session.close()
     
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Record]:
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                      routing: str = "r") -> List[Record]:
         """
         Execute a Cypher query and return results.
-        
+
         Args:
             query: Cypher query string
             parameters: Optional query parameters
-            
+            routing: Routing hint - "r" routes to read replicas in a cluster,
+                     "w" forces the leader. Queries containing write clauses
+                     are upgraded to "w" regardless of this hint.
+
         Returns:
             List of Neo4j Record objects
-            
+
         Raises:
             Exception: If query execution fails
         """
         try:
-            self.logger.info(f"Executing query: {query}")
-            if parameters:
-                self.logger.debug(f"Query parameters: {parameters}")
-            
-            with self.get_session() as session:
-                result = session.run(query, parameters or {})
-                records = list(result)
-                
-            self.logger.info(f"Query returned {len(records)} records")
+            self.logger.info("Executing query: %s", query)
+            if parameters and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Query parameters: %s", parameters)
+
+            if routing == "r" and _WRITE_CLAUSE_RE.search(query):
+                self.logger.debug("Write clause detected - routing query to the leader")
+                routing = "w"
+
+            cache_key = self._read_cache_key(query, parameters) if routing == "r" else None
+            if cache_key is not None:
+                cached = self._read_cache.get(cache_key)
+                if cached and cached[0] > time.monotonic():
+                    self.logger.debug("Returning cached result for read query")
+                    return cached[1]
+
+            if routing == "w":
+                # Writes invalidate any cached read results
+                self._write_epoch += 1
+
+            records = self._run_routed_query(query, parameters, routing).records
+
+            if cache_key is not None:
+                if len(self._read_cache) >= _READ_CACHE_MAX_SIZE:
+                    self._read_cache.clear()  # Simple bound; entries are cheap to recompute
+                self._read_cache[cache_key] = (time.monotonic() + _READ_CACHE_TTL_SECONDS, records)
+
+            self.logger.info("Query returned %d records", len(records))
             return records
-            
+
         except Exception as e:
             self.logger.error(f"Query execution failed: {str(e)}")
             raise Exception(f"Failed to execute query: {str(e)}")
-    
+
+    def iter_query(self, query: str, parameters: Optional[Dict[str, Any]] = None):
+        """
+        Execute a Cypher query and yield records as the driver streams them.
+
+        Unlike execute_query, records are never buffered into a list: the
+        consumer sees the first record after one round-trip and can break
+        early, keeping memory O(1) for large scans. Results are not cached
+        since the stream is consumed once.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+
+        Yields:
+            Neo4j Record objects
+
+        Raises:
+            Exception: If query execution fails
+        """
+        try:
+            self.logger.info("Streaming query: %s", query)
+            with self.get_session() as session:
+                yield from session.run(query, parameters or {})
+        except Exception as e:
+            self.logger.error(f"Streaming query execution failed: {str(e)}")
+            raise Exception(f"Failed to execute query: {str(e)}")
+
+    def _read_cache_key(self, query: str, parameters: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """
+        Build a cache key for an idempotent read query, or None if not cacheable.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+
+        Returns:
+            Hashable cache key tuple, or None for writes/unhashable parameters
+        """
+        normalized = " ".join(query.split())
+        if not normalized.upper().startswith(_READ_QUERY_PREFIXES):
+            return None
+        try:
+            param_items = tuple(sorted((parameters or {}).items()))
+            hash(param_items)
+        except TypeError:
+            # Unhashable parameter values (lists, dicts) - skip caching
+            return None
+        return (normalized, param_items, self._write_epoch)
+
+    def _run_routed_query(self, query: str, parameters: Optional[Dict[str, Any]],
+                          routing: str) -> Any:
+        """
+        Run a query through the driver's execute_query API with a routing hint.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+            routing: "r" for read routing, "w" for write routing
+
+        Returns:
+            EagerResult with records, summary, and keys
+        """
+        kwargs: Dict[str, Any] = {
+            'parameters_': parameters or {},
+            'database_': self._database,
+            'routing_': routing,
+        }
+        if self._bookmark_manager is not None:
+            kwargs['bookmark_manager_'] = self._bookmark_manager
+        return self.driver.execute_query(query, **kwargs)
+
     def execute_write_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Any:
         """
         Execute a write query (CREATE, MERGE, DELETE, etc.).
@@ -98,13 +269,14 @@ class Neo4jConnector:
             Query result summary
         """
         try:
-            self.logger.info(f"Executing write query: {query}")
-            
-            with self.get_session() as session:
-                result = session.run(query, parameters or {})
-                summary = result.consume()
-                
-            self.logger.info(f"Write query completed: {summary.counters}")
+            self.logger.info("Executing write query: %s", query)
+
+            # Writes invalidate any cached read results
+            self._write_epoch += 1
+
+            summary = self._run_routed_query(query, parameters, "w").summary
+
+            self.logger.info("Write query completed: %s", summary.counters)
             return summary
             
         except Exception as e:
@@ -171,29 +343,13 @@ class Neo4jConnector:
     def create_constraints_and_indexes(self) -> None:
         """Create recommended constraints and indexes for the code property graph."""
         try:
-            constraints_and_indexes = [
-                # Unique constraints for primary identifiers
-                "CREATE CONSTRAINT module_name_unique IF NOT EXISTS FOR (m:MODULE) REQUIRE m.name IS UNIQUE",
-                "CREATE CONSTRAINT class_name_path_unique IF NOT EXISTS FOR (c:CLASS) REQUIRE (c.name, c.file_path) IS UNIQUE", 
-                "CREATE CONSTRAINT function_name_path_unique IF NOT EXISTS FOR (f:FUNCTION) REQUIRE (f.name, f.file_path) IS UNIQUE",
-                "CREATE CONSTRAINT method_name_class_unique IF NOT EXISTS FOR (m:METHOD) REQUIRE (m.name, m.class) IS UNIQUE",
-                
-                # Indexes for frequently queried properties
-                "CREATE INDEX module_file_path_index IF NOT EXISTS FOR (m:MODULE) ON (m.file_path)",
-                "CREATE INDEX class_name_index IF NOT EXISTS FOR (c:CLASS) ON (c.name)",
-                "CREATE INDEX function_name_index IF NOT EXISTS FOR (f:FUNCTION) ON (f.name)",
-                "CREATE INDEX method_name_index IF NOT EXISTS FOR (m:METHOD) ON (m.name)",
-                "CREATE INDEX global_variable_name_index IF NOT EXISTS FOR (gv:GLOBAL_VARIABLE) ON (gv.name)",
-                "CREATE INDEX field_name_index IF NOT EXISTS FOR (f:FIELD) ON (f.name)"
-            ]
-            
-            for statement in constraints_and_indexes:
+            for statement in _CONSTRAINTS_AND_INDEXES:
                 try:
                     self.execute_write_query(statement)
-                    self.logger.info(f"Created constraint/index: {statement}")
+                    self.logger.info("Created constraint/index: %s", statement)
                 except Exception as e:
                     # Constraint/index might already exist
-                    self.logger.debug(f"Constraint/index creation skipped: {str(e)}")
+                    self.logger.debug("Constraint/index creation skipped: %s", str(e))
             
         except Exception as e:
             self.logger.error(f"Failed to create constraints and indexes: {str(e)}")
@@ -4,25 +4,81 @@ Handles query execution, result processing, and error handling.
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Union
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass
 from neo4j import Record
 from .neo4j_connector import Neo4jConnector
 from ..utils.code_extractor import CodeExtractor
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QueryResult:
     """
     Structured result from a Cypher query execution.
+
+    Immutable: records are coerced to a tuple and the summary to a
+    read-only mapping view at construction, so consumers can iterate and
+    share results without defensive copies.
     """
-    records: List[Dict[str, Any]]
-    summary: Dict[str, Any]
+    records: Tuple[Dict[str, Any], ...]
+    summary: Mapping[str, Any]
     success: bool
     error_message: Optional[str] = None
     query: Optional[str] = None
     execution_time_ms: Optional[float] = None
 
+    def __post_init__(self):
+        object.__setattr__(self, 'records', tuple(self.records))
+        if not isinstance(self.summary, MappingProxyType):
+            object.__setattr__(self, 'summary', MappingProxyType(dict(self.summary)))
+
+    def to_columnar(self) -> Dict[str, List[Any]]:
+        """Flatten the nested node records into parallel columns.
+
+        Each record maps row keys to node dicts ({'labels': [...],
+        'properties': {...}, 'id': N}), so reducer loops over many rows
+        pay several hash probes per field. The columnar view extracts
+        the commonly read fields once into aligned lists, letting
+        consumers zip over flat lists instead of re-walking the nesting.
+
+        Returns:
+            Dict with aligned 'names', 'labels', 'file_paths', 'ids' and
+            'properties' lists for node values, plus a
+            'relationship_types' list for relationship values
+        """
+        names: List[Any] = []
+        labels: List[Any] = []
+        file_paths: List[Any] = []
+        ids: List[Any] = []
+        properties: List[Any] = []
+        relationship_types: List[Any] = []
+
+        for record in self.records:
+            for value in record.values():
+                # Mapping rather than dict: frozen fixtures wrap node
+                # dicts in read-only proxy views
+                if not isinstance(value, Mapping):
+                    continue
+                if 'labels' in value:
+                    props = value.get('properties', {})
+                    names.append(props.get('name', 'Unknown'))
+                    labels.append(value.get('labels', []))
+                    file_paths.append(props.get('file_path', 'Unknown'))
+                    ids.append(value.get('id'))
+                    properties.append(props)
+                elif 'type' in value:
+                    relationship_types.append(value.get('type', 'Unknown'))
+
+        return {
+            'names': names,
+            'labels': labels,
+            'file_paths': file_paths,
+            'ids': ids,
+            'properties': properties,
+            'relationship_types': relationship_types,
+        }
+
 
 class QueryExecutor:
     """
@@ -113,6 +169,66 @@ class QueryExecutor:
         
         return results
     
+    def execute_many(self, queries: List[str], parameters_list: Optional[List[Dict[str, Any]]] = None) -> List[QueryResult]:
+        """
+        Execute multiple read queries in a single session and transaction.
+
+        One Bolt round-trip covers all queries instead of one per query,
+        which also lets the server share compiled plans across structurally
+        similar queries. Falls back to per-query execution if the shared
+        transaction fails.
+
+        Args:
+            queries: List of Cypher query strings
+            parameters_list: Optional list of parameter dictionaries for each query
+
+        Returns:
+            List of QueryResult objects, aligned with the input queries
+        """
+        if parameters_list and len(parameters_list) != len(queries):
+            raise ValueError("Parameters list length must match queries list length")
+
+        if not queries:
+            return []
+
+        try:
+            import time
+
+            self.logger.info(f"Executing {len(queries)} queries in one transaction")
+
+            timings = []
+
+            def _run_all(tx):
+                all_records = []
+                for i, query in enumerate(queries):
+                    params = parameters_list[i] if parameters_list else None
+                    start_time = time.time()
+                    result = tx.run(query, params or {})
+                    all_records.append(list(result))
+                    timings.append((time.time() - start_time) * 1000)
+                return all_records
+
+            with self.connector.get_session() as session:
+                record_lists = session.execute_read(_run_all)
+
+            results = []
+            for query, records, execution_time in zip(queries, record_lists, timings):
+                results.append(QueryResult(
+                    records=self._process_records(records),
+                    summary=self._create_summary(records, query, execution_time),
+                    success=True,
+                    query=query,
+                    execution_time_ms=execution_time
+                ))
+
+            self.logger.info(f"Batch transaction returned {sum(len(r.records) for r in results)} total records")
+            return results
+
+        except Exception as e:
+            self.logger.warning(f"Batch transaction failed, falling back to per-query execution: {str(e)}")
+            return [self.execute(query, parameters_list[i] if parameters_list else None)
+                    for i, query in enumerate(queries)]
+
     def _process_records(self, records: List[Record]) -> List[Dict[str, Any]]:
         """
         Process Neo4j records into Python dictionaries.
@@ -124,16 +240,18 @@ class QueryExecutor:
             List of dictionaries with processed data
         """
         processed = []
-        
+
         for record in records:
-            processed_record = {}
-            
-            for key in record.keys():
-                value = record[key]
-                processed_record[key] = self._process_value(value)
-            
+            # record.data() builds the whole dict in one driver-level pass
+            # instead of a per-key Python loop with __getitem__ calls
+            processed_record = record.data()
+
+            for key, value in processed_record.items():
+                if isinstance(value, str) and value.startswith('<CODE>'):
+                    processed_record[key] = self._process_value(value)
+
             processed.append(processed_record)
-        
+
         return processed
     
     def _process_value(self, value: Any) -> Any:
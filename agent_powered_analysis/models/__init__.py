@@ -5,14 +5,22 @@ This module contains all the structured response models used throughout
 the application to ensure reliable JSON parsing and type safety.
 """
 
-from .agent_models import QueryIntent, PrimaryAgentResponse, TranslatorAgentResponse
+from .agent_models import (
+    QueryIntent,
+    PrimaryAgentResponse,
+    TranslatorAgentResponse,
+    IndexedCypherTranslation,
+    TranslatorBatchResponse,
+)
 from .analysis_models import SufficiencyAnalysis
 from .search_models import SearchResultFormatted, SearchIteration, SearchResult
 
 __all__ = [
     'QueryIntent',
     'PrimaryAgentResponse',
-    'TranslatorAgentResponse', 
+    'TranslatorAgentResponse',
+    'IndexedCypherTranslation',
+    'TranslatorBatchResponse',
     'SufficiencyAnalysis',
     'SearchResultFormatted',
     'SearchIteration',
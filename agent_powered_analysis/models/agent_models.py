@@ -57,6 +57,38 @@ class PrimaryAgentResponse(BaseModel):
         return min(self.query_intents, key=lambda x: x.priority).nl_intent
 
 
+class IndexedCypherTranslation(BaseModel):
+    """A single translated intent within a batch translation response."""
+    index: int = Field(
+        description="Zero-based index of the intent this Cypher query implements",
+        ge=0
+    )
+    cypher_query: str = Field(
+        description="The Cypher query that implements the intent at this index"
+    )
+    confidence: float = Field(
+        description="Confidence score between 0.0 and 1.0 for the query translation",
+        ge=0.0,
+        le=1.0
+    )
+    explanation: Optional[str] = Field(
+        description="Brief explanation of the Cypher query logic",
+        default=None
+    )
+
+
+class TranslatorBatchResponse(BaseModel):
+    """
+    Structured response for translating multiple intents in one request.
+
+    Collapses N per-intent round-trips into a single LLM call; the
+    translations are aligned back to their intents by index.
+    """
+    translations: List[IndexedCypherTranslation] = Field(
+        description="One translation per input intent, aligned by index"
+    )
+
+
 class TranslatorAgentResponse(BaseModel):
     """
     Structured response from the Translator Agent.
@@ -3,7 +3,7 @@ Pydantic models for analysis responses using OpenAI Structured Outputs.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 
 class SufficiencyAnalysis(BaseModel):
@@ -29,7 +29,11 @@ class SufficiencyAnalysis(BaseModel):
         description="Suggested follow-up query to get missing information. Empty string if sufficient.",
         default=""
     )
+    refined_query: Optional[str] = Field(
+        description="Refined natural language version of the original query that addresses the missing information. Empty string if sufficient.",
+        default=None
+    )
     reasoning: Optional[str] = Field(
         description="Brief explanation of why the results are or aren't sufficient",
         default=None
-    )
\ No newline at end of file
+    )
@@ -2,17 +2,26 @@
 Pydantic models for search results using OpenAI Structured Outputs.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Any, Dict
 from dataclasses import dataclass
 import logging
 import json
 import os
+import re
 from datetime import datetime
 
+# Pre-compiled matcher for the fixed '<CODE>{"S":..,"E":..,"F":".."}</CODE>'
+# metadata shape, so the common case skips the full JSON decoder.
+_CODE_METADATA_RE = re.compile(
+    r'^<CODE>\{"S":(\d+),"E":(\d+),"F":"((?:[^"\\]|\\.)*)"\}</CODE>$'
+)
+
 
 class CodeElement(BaseModel):
     """Represents a single code element found in search results."""
+    model_config = ConfigDict(extra='forbid')
+
     name: str = Field(description="Name of the code element")
     type: str = Field(description="Type of element (CLASS, FUNCTION, METHOD, etc.)")
     file_path: str = Field(description="File path where the element is located")
@@ -21,6 +30,8 @@ class CodeElement(BaseModel):
 
 class SearchSection(BaseModel):
     """Represents a section of the formatted search results."""
+    model_config = ConfigDict(extra='forbid')
+
     title: str = Field(description="Section title")
     elements: List[CodeElement] = Field(description="Code elements in this section")
     summary: Optional[str] = Field(description="Summary of this section", default=None)
@@ -33,6 +44,8 @@ class SearchResultFormatted(BaseModel):
     This model ensures consistent formatting of search results
     with proper sections and summaries.
     """
+    model_config = ConfigDict(extra='forbid')
+
     title: str = Field(description="Main title for the search results")
     sections: List[SearchSection] = Field(description="Organized sections of results")
     summary: str = Field(description="Overall summary of the findings")
@@ -44,7 +57,10 @@ class SearchResultFormatted(BaseModel):
     )
 
 
-@dataclass
+# frozen: iterations are write-once records - nothing mutates one after
+# construction (use dataclasses.replace for amended copies), and frozen
+# instances are safe to share across threads and cache entries
+@dataclass(slots=True, frozen=True)
 class SearchIteration:
     """Represents a single iteration in the search pipeline."""
     iteration_number: int
@@ -61,7 +77,7 @@ class SearchIteration:
     rag_documents_count: int = 0  # Number of RAG documents found
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Final result from the iterative search pipeline."""
     original_query: str
@@ -71,6 +87,7 @@ class SearchResult:
     total_execution_time_ms: float
     error_message: Optional[str] = None
     records: List[Dict[str, Any]] = None  # Raw records from all successful queries
+    final_answer_batch_id: Optional[str] = None  # Batch API job id when the final report is deferred
     
     def save_to_file(self, output_path: str, format: str = "md") -> bool:
         """
@@ -106,26 +123,34 @@ class SearchResult:
                 code_ref = record['code']
                 # Parse <CODE>{"S":start,"E":end,"F":"filepath"}</CODE> format
                 if code_ref.startswith('<CODE>') and code_ref.endswith('</CODE>'):
-                    json_str = code_ref[6:-7]  # Remove <CODE> and </CODE>
-                    try:
-                        code_info = json.loads(json_str)
+                    # Fast path: the metadata has a fixed 3-key shape, so a
+                    # pre-compiled regex avoids json.loads per record.
+                    match = _CODE_METADATA_RE.match(code_ref)
+                    if match:
+                        start_line = int(match.group(1))
+                        end_line = int(match.group(2))
+                        file_path = match.group(3).encode('utf-8').decode('unicode_escape')
+                    else:
+                        # Fallback for unusual payloads (extra keys, whitespace)
+                        json_str = code_ref[6:-7]  # Remove <CODE> and </CODE>
+                        try:
+                            code_info = json.loads(json_str)
+                        except json.JSONDecodeError:
+                            return "No code available"
                         file_path = code_info.get('F')
                         start_line = code_info.get('S')
                         end_line = code_info.get('E')
-                        
-                        if file_path and start_line is not None and end_line is not None:
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    lines = f.readlines()
-                                    # Convert to 0-based indexing and extract lines
-                                    start_idx = max(0, start_line - 1)
-                                    end_idx = min(len(lines), end_line)
-                                    code_lines = lines[start_idx:end_idx]
-                                    return ''.join(code_lines).rstrip()
-                            except (IOError, OSError):
-                                return f"Could not read file: {file_path}"
-                    except json.JSONDecodeError:
-                        pass
+                    if file_path and start_line is not None and end_line is not None:
+                        try:
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                lines = f.readlines()
+                                # Convert to 0-based indexing and extract lines
+                                start_idx = max(0, start_line - 1)
+                                end_idx = min(len(lines), end_line)
+                                code_lines = lines[start_idx:end_idx]
+                                return ''.join(code_lines).rstrip()
+                        except (IOError, OSError):
+                            return f"Could not read file: {file_path}"
             return "No code available"
         except Exception:
             return "Error extracting code"
@@ -166,12 +191,12 @@ class SearchResult:
             ]
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
             json.dump(result_data, f, indent=2, ensure_ascii=False)
     
     def _save_as_text(self, output_path: str):
         """Save results in human-readable text format."""
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write("=" * 80 + "\n")
             f.write("SEARCH RESULTS\n")
             f.write("=" * 80 + "\n\n")
@@ -209,15 +234,18 @@ class SearchResult:
     
     def _save_as_markdown(self, output_path: str):
         """Save only the final formatted report as markdown."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Add metadata header
-            f.write(f"---\n")
-            f.write(f"title: System Analysis Report\n")
-            f.write(f"generated: {datetime.now().isoformat()}\n")
-            f.write(f"query: \"{self.original_query}\"\n")
-            f.write(f"execution_time: {self.total_execution_time_ms:.2f}ms\n")
-            f.write(f"iterations: {len(self.iterations)}\n")
-            f.write(f"---\n\n")
-            
+        # Build the metadata header once so the file is written in two large
+        # chunks instead of many small ones
+        front_matter = (
+            f"---\n"
+            f"title: System Analysis Report\n"
+            f"generated: {datetime.now().isoformat()}\n"
+            f"query: \"{self.original_query}\"\n"
+            f"execution_time: {self.total_execution_time_ms:.2f}ms\n"
+            f"iterations: {len(self.iterations)}\n"
+            f"---\n\n"
+        )
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20, newline='\n') as f:
+            f.write(front_matter)
             # Write the final formatted answer (which is the full report from RESULT_FORMATTING_PROMPT)
             f.write(self.final_answer)
\ No newline at end of file
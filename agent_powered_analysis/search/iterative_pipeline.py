@@ -3,8 +3,16 @@ Iterative pipeline for multi-step LLM → Cypher → result → sufficiency chec
 Implements the core search logic with iterative refinement using OpenAI Structured Outputs.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
 from typing import Dict, List, Optional
+import httpx
 import openai
 import time
 
@@ -15,12 +23,48 @@ from ..agents.rag_agent import RAGAgent
 from ..graphdb.neo4j_connector import Neo4jConnector
 from ..graphdb.query_executor import QueryExecutor, QueryResult
 from ..config import config
-from ..utils.prompts import SUFFICIENCY_ANALYSIS_PROMPT, RESULT_FORMATTING_PROMPT, DELTY_SYSTEM_REPORT
+from ..utils.prompts import (
+    SUFFICIENCY_ANALYSIS_SYSTEM_PROMPT,
+    SUFFICIENCY_ANALYSIS_USER_PROMPT,
+    RESULT_FORMATTING_PROMPT,
+    DELTY_SYSTEM_REPORT,
+)
 from ..utils.openai_logger import openai_logger
+from ..utils.persistent_cache import DiskCache
+from ..utils.semantic_cache import SemanticCache
+from ..utils.text import count_tokens, select_relevant_sentences, truncate_to_tokens
 from ..models.analysis_models import SufficiencyAnalysis
 from ..models.search_models import SearchIteration, SearchResult
 
 
+# Heuristic signals for routing an intent to the graph or RAG branch.
+# Structural vocabulary and code identifiers point at the graph; open-ended
+# "how/why/explain" phrasing points at documents. Anything mixed runs both.
+_GRAPH_INTENT_RE = re.compile(
+    r'\b(call(?:s|er|ers|ed)?|inherit(?:s|ance)?|subclass(?:es)?|superclass(?:es)?|'
+    r'import(?:s|ed)?|depend(?:s|ency|encies)?|reference(?:s|d)?|signature|'
+    r'parameter(?:s)?|return type|attribute(?:s)?|defin(?:ed|ition|itions)|declared)\b',
+    re.IGNORECASE
+)
+_RAG_INTENT_RE = re.compile(
+    r'\b(how|why|explain|describe|overview|summar(?:y|ize)|purpose|rationale|'
+    r'design|architecture|pattern(?:s)?|documentation|readme|concept(?:s)?)\b',
+    re.IGNORECASE
+)
+# Dotted calls, snake_case, or CamelCase tokens - strong sign of a concrete
+# code identifier the graph can resolve
+_CODE_IDENTIFIER_RE = re.compile(
+    r'\w+\.\w+\(|\b[a-z][a-z0-9]*(?:_[a-z0-9]+)+\b|\b[A-Z][a-z0-9]+(?:[A-Z][a-z0-9]+)+\b'
+)
+
+# Token and sentence budgets for single sufficiency prompts; token length
+# drives both time-to-first-token and cost on every iteration
+_SUFFICIENCY_PROMPT_TOKEN_LIMIT = 3000
+_SUFFICIENCY_SUMMARY_MAX_SENTENCES = 10
+
+# Checkpointed sufficiency analyses older than a day are recomputed
+_SUFFICIENCY_CHECKPOINT_TTL_S = 86400
+
 
 class IterativePipeline:
     """
@@ -34,7 +78,8 @@ class IterativePipeline:
                  summary_agent: Optional[SummaryAgent] = None,
                  query_executor: Optional[QueryExecutor] = None,
                  rag_agent: Optional[RAGAgent] = None,
-                 base_path: Optional[str] = None):
+                 base_path: Optional[str] = None,
+                 cache_path: Optional[str] = None):
         """
         Initialize the iterative pipeline.
         
@@ -46,19 +91,74 @@ class IterativePipeline:
             query_executor: Query executor for running Cypher queries
             rag_agent: RAG agent for document-based search
             base_path: Base path for resolving source code file paths
+            cache_path: Optional SQLite file backing the LLM cache; cached
+                        results then survive process restarts
         """
+        # One pooled HTTP client shared by every LLM call site: concurrent
+        # intents reuse warm keep-alive connections instead of paying a
+        # fresh TCP/TLS handshake per call
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+        self.openai_client = openai.OpenAI(
+            api_key=config.openai.api_key,
+            http_client=self._http_client
+        )
+
         self.connector = connector or Neo4jConnector()
-        self.primary_agent = primary_agent or PrimaryAgent()
-        self.translator_agent = translator_agent or TranslatorAgent()
-        self.summary_agent = summary_agent or SummaryAgent()
+        self.primary_agent = primary_agent or PrimaryAgent(openai_client=self.openai_client)
+        self.translator_agent = translator_agent or TranslatorAgent(openai_client=self.openai_client)
+        self.summary_agent = summary_agent or SummaryAgent(openai_client=self.openai_client)
         self.query_executor = query_executor or QueryExecutor(self.connector, base_path=base_path)
         self.rag_agent = rag_agent or RAGAgent()
-        
-        self.openai_client = openai.OpenAI(api_key=config.openai.api_key)
         self.logger = logging.getLogger(__name__)
         
         self.max_iterations = config.pipeline.max_iterations
         self.sufficiency_threshold = config.pipeline.sufficiency_threshold
+        self.max_intent_concurrency = config.pipeline.max_intent_concurrency
+
+        # Semantic cache over the pipeline's own LLM calls - repeat and
+        # near-paraphrase prompts skip the round-trip entirely
+        self._llm_cache = SemanticCache(
+            embed_fn=self._embed_for_cache,
+            ttl_seconds=config.pipeline.cache_ttl_s,
+            cache_path=cache_path
+        )
+
+        # Separate cache for sufficiency analyses: higher similarity bar
+        # since a wrong hit here steers the whole iteration loop
+        self._sufficiency_cache = SemanticCache(
+            embed_fn=self._embed_for_cache,
+            threshold=0.93,
+            ttl_seconds=config.pipeline.cache_ttl_s,
+            max_entries=1024
+        )
+
+        # Crash-safe checkpoint of per-iteration sufficiency analyses so
+        # interrupted searches resume without re-paying completed calls
+        checkpoint_dir = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cache'
+        )
+        try:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            self._sufficiency_checkpoint = DiskCache(
+                os.path.join(checkpoint_dir, 'sufficiency_checkpoint.db')
+            )
+        except Exception as e:
+            self.logger.warning(f"Sufficiency checkpoint unavailable: {str(e)}")
+            self._sufficiency_checkpoint = None
+
+        # Content-hash cache over agent responses: identical queries and
+        # intents recur across iterations, so re-understanding/re-translating
+        # them would repeat whole LLM round-trips
+        self._agent_cache: Dict[str, object] = {}
+        self._agent_cache_size = config.pipeline.intent_cache_size
+        self._agent_cache_hits = 0
+        self._agent_cache_misses = 0
+
+        # Memo of text hash -> embedding so the user query and other
+        # verbatim-repeated texts are embedded once per run
+        self._embedding_memo: Dict[str, List[float]] = {}
         
         # Log RAG availability
         if self.rag_agent.is_available():
@@ -78,247 +178,55 @@ class IterativePipeline:
         """
         import time
         start_time = time.time()
-        
+
         self.logger.info(f"Starting iterative search for query: {user_query}")
-        
+
+        iterations = []
         try:
-            iterations = []
-            all_records = []  # Collect all records from all iterations
-            current_query = user_query
-            
-            for iteration_num in range(1, self.max_iterations + 1):
-                self.logger.info(f"Starting iteration {iteration_num}")
-                
-                # Step 1: Primary Agent - understand the query and generate multiple intents
-                try:
-                    primary_response = self.primary_agent.understand_query(current_query)
-                    query_intents = primary_response.query_intents
-                    self.logger.info(f"Primary agent generated {len(query_intents)} query intent(s)")
-                    for i, intent in enumerate(query_intents):
-                        self.logger.info(f"  Intent {i+1} (priority {intent.priority}): {intent.nl_intent}")
-                except Exception as e:
-                    return self._create_error_result(user_query, f"Primary agent failed: {str(e)}", iterations)
-                
-                # Step 2: Process each intent through BOTH graph and RAG pipelines
-                all_intent_results = []
-                combined_cypher_queries = []
-                
-                for intent_idx, query_intent in enumerate(query_intents):
-                    self.logger.info(f"Processing intent {intent_idx + 1}/{len(query_intents)}: {query_intent.nl_intent}")
-                    
-                    intent_result = {
-                        'intent': query_intent,
-                        'graph_result': None,
-                        'rag_result': None,
-                        'combined_summary': None,
-                        'success': False
-                    }
-                    
-                    # 2.1: Execute on Graph Database
-                    try:
-                        translator_response = self.translator_agent.translate_to_cypher(query_intent.nl_intent)
-                        cypher_query = translator_response.cypher_query
-                        combined_cypher_queries.append(f"-- Intent {intent_idx + 1}: {query_intent.nl_intent}\n{cypher_query}")
-                        
-                        graph_result = self.query_executor.execute(cypher_query)
-                        intent_result['graph_result'] = {
-                            'cypher': cypher_query,
-                            'result': graph_result,
-                            'translator_response': translator_response,
-                            'success': graph_result.success,
-                            'records_count': len(graph_result.records)
-                        }
-                        
-                        self.logger.info(f"Graph query for intent {intent_idx + 1}: {len(graph_result.records)} results")
-                        
-                    except Exception as e:
-                        self.logger.error(f"Graph query failed for intent {intent_idx + 1}: {str(e)}")
-                        intent_result['graph_result'] = {
-                            'cypher': f"ERROR: {str(e)}",
-                            'result': None,
-                            'success': False,
-                            'records_count': 0,
-                            'error': str(e)
-                        }
-                    
-                    # 2.2: Execute on RAG Pipeline
-                    if self.rag_agent.is_available():
-                        try:
-                            rag_search_result = self.rag_agent.search_documents(
-                                query=query_intent.nl_intent,
-                                k=5
-                            )
-                            intent_result['rag_result'] = {
-                                'search_result': rag_search_result,
-                                'success': rag_search_result.success,
-                                'documents_count': rag_search_result.documents_found
-                            }
-                            
-                            self.logger.info(f"RAG search for intent {intent_idx + 1}: {rag_search_result.documents_found} documents")
-                            
-                        except Exception as e:
-                            self.logger.error(f"RAG search failed for intent {intent_idx + 1}: {str(e)}")
-                            intent_result['rag_result'] = {
-                                'success': False,
-                                'documents_count': 0,
-                                'error': str(e)
-                            }
-                    else:
-                        intent_result['rag_result'] = {
-                            'success': False,
-                            'documents_count': 0,
-                            'error': 'RAG agent not available'
-                        }
-                    
-                    # 2.3: Generate combined summary for this intent
-                    intent_result['combined_summary'] = self._generate_intent_summary(
-                        query_intent.nl_intent, 
-                        intent_result['graph_result'], 
-                        intent_result['rag_result']
-                    )
-                    # Do not generate a summary; concatenate raw results into a single string
-                    # try:
-                    #     graph_text = ""
-                    #     if (
-                    #         intent_result['graph_result']
-                    #         and intent_result['graph_result'].get('success')
-                    #         and intent_result['graph_result'].get('result')
-                    #     ):
-                    #         records = intent_result['graph_result']['result'].records
-                    #         graph_text = json.dumps(records, ensure_ascii=False)
-                    #     rag_text = ""
-                    #     if (
-                    #         intent_result['rag_result']
-                    #         and intent_result['rag_result'].get('success')
-                    #         and intent_result['rag_result'].get('documents_count', 0) > 0
-                    #         and intent_result['rag_result'].get('search_result')
-                    #     ):
-                    #         key_files = intent_result['rag_result']['search_result'].key_files
-                    #         rag_text = json.dumps(key_files, ensure_ascii=False)
-                    #     intent_result['combined_summary'] = f"graph={graph_text} | rag={rag_text}"
-                    # except Exception as _e:
-                    #     intent_result['combined_summary'] = "graph= | rag="
-                    
-                    # Mark as successful if either source provided results
-                    intent_result['success'] = (
-                        (intent_result['graph_result']['success'] and intent_result['graph_result']['records_count'] > 0) or
-                        (intent_result['rag_result']['success'] and intent_result['rag_result']['documents_count'] > 0)
-                    )
-                    
-                    all_intent_results.append(intent_result)
-                
-                # Step 3: Combine results from all intents (for backward compatibility metrics)
-                combined_query_result = self._combine_intent_results(all_intent_results)
-                
-                # Collect all records from this iteration's successful queries
-                if combined_query_result.success and combined_query_result.records:
-                    all_records.extend(combined_query_result.records)
-                
-                # For logging and iteration tracking, use the primary intent
-                primary_intent = min(query_intents, key=lambda x: x.priority)
-                nl_intent = primary_intent.nl_intent
-                cypher_query = "\n\n".join(combined_cypher_queries)
-                
-                # Step 4: Merge all individual summaries into comprehensive overview
-                result_summary = self._merge_all_summaries(user_query, all_intent_results)
-                
-                # Calculate total counts for tracking
-                total_graph_records = sum(
-                    intent['graph_result']['records_count'] for intent in all_intent_results
-                    if intent['graph_result'] and intent['graph_result']['success']
-                )
-                total_rag_documents = sum(
-                    intent['rag_result']['documents_count'] for intent in all_intent_results
-                    if intent['rag_result'] and intent['rag_result']['success']
-                )
-                
-                # Step 5: Perform sufficiency check on combined summary
-                sufficiency_analysis = self._analyze_combined_sufficiency(
-                    user_query, result_summary, all_intent_results, iteration_num
-                )
-                
-                # Safety mechanism: If we have valid results and tried multiple iterations, 
-                # consider it sufficient to prevent infinite loops
-                if (combined_query_result.success and 
-                    len(combined_query_result.records) > 0 and 
-                    iteration_num >= 2):
-                    sufficiency_analysis.sufficient = True
-                    sufficiency_analysis.confidence = max(sufficiency_analysis.confidence, 0.8)
-                    self.logger.info(f"Auto-marking as sufficient after {iteration_num} iterations with {len(combined_query_result.records)} results")
-                
-                # Additional safety mechanism: If we consistently get 0 results after multiple iterations,
-                # consider it sufficient to prevent infinite loops when no relevant data exists
-                elif (combined_query_result.success and 
-                      len(combined_query_result.records) == 0 and 
-                      iteration_num >= 3):
-                    sufficiency_analysis.sufficient = True
-                    sufficiency_analysis.confidence = 0.9  # High confidence that no data exists
-                    sufficiency_analysis.missing_info = ''
-                    sufficiency_analysis.suggested_followup = ''
-                    self.logger.info(f"Auto-marking as sufficient after {iteration_num} iterations with consistent 0 results - no relevant data found")
-                
-                iteration = SearchIteration(
-                    iteration_number=iteration_num,
-                    nl_intent=nl_intent,
-                    cypher_query=cypher_query,
-                    result_summary=result_summary,
-                    records_count=total_graph_records,
-                    execution_time_ms=combined_query_result.execution_time_ms,
-                    sufficient=sufficiency_analysis.sufficient,
-                    confidence=sufficiency_analysis.confidence,
-                    feedback=sufficiency_analysis.missing_info,
-                    query_success=combined_query_result.success,
-                    rag_summary="Integrated in combined summary",  # RAG is now integrated
-                    rag_documents_count=total_rag_documents
-                )
-                
-                iterations.append(iteration)
-                
-                # Check if results are sufficient
-                if (sufficiency_analysis.sufficient and 
-                    sufficiency_analysis.confidence >= self.sufficiency_threshold):
-                    self.logger.info(f"Sufficient results found after {iteration_num} iterations")
-                    break
-                
-                # Prepare for next iteration if not at max
-                if iteration_num < self.max_iterations:
-                    if sufficiency_analysis.suggested_followup:
-                        current_query = sufficiency_analysis.suggested_followup
-                    else:
-                        # Use the feedback to refine the query
-                        current_query = self._refine_query_for_next_iteration(
-                            user_query, sufficiency_analysis.missing_info
-                        )
-                    
-                    self.logger.info(f"Refined query for next iteration: {current_query}")
-            
+            iterations, all_records, error_message = self._run_iterations(user_query)
+            if error_message:
+                return self._create_error_result(user_query, error_message, iterations)
+
             # Format final results
             # print(f"\n📄 FINAL iterations:")
             # print(iterations)
             self.logger.info(f"Generating final report for query: {user_query}")
-            final_answer = self._format_final_results(user_query, iterations)
-            
+            # In batch mode the report is submitted as a deferred Batch API
+            # job (half the token cost); interactive mode blocks as before
+            final_answer_batch_id = None
+            if config.pipeline.final_report_mode == "batch":
+                final_answer_batch_id = self._submit_final_report_batch(user_query, iterations)
+
+            if final_answer_batch_id:
+                final_answer = (
+                    f"Final report submitted as Batch API job {final_answer_batch_id}; "
+                    f"retrieve it with poll_batch('{final_answer_batch_id}')"
+                )
+            else:
+                final_answer = self._format_final_results(user_query, iterations)
+
             # all_records has been populated during iteration processing above
-            
+
             total_time = (time.time() - start_time) * 1000
-            
+
             search_result = SearchResult(
                 original_query=user_query,
                 iterations=iterations,
                 final_answer=final_answer,
                 success=True,
                 total_execution_time_ms=total_time,
-                records=all_records
+                records=all_records,
+                final_answer_batch_id=final_answer_batch_id
             )
-            
+
             self.logger.info(f"Search completed successfully - {len(iterations)} iterations, {len(all_records)} total records, {total_time:.1f}ms")
-            
+
             return search_result
-        
+
         except Exception as e:
             self.logger.error(f"Pipeline execution failed: {str(e)}")
             total_time = (time.time() - start_time) * 1000
-            
+
             return SearchResult(
                 original_query=user_query,
                 iterations=iterations,
@@ -328,9 +236,663 @@ class IterativePipeline:
                 error_message=str(e),
                 records=[]
             )
-    
-    
-    
+
+    def search_stream(self, user_query: str):
+        """
+        Execute the iterative search pipeline, streaming the final report.
+
+        Runs the same iteration phase as search(), then yields the final
+        report as chunks arrive from the LLM instead of blocking on the
+        whole decode - perceived latency drops to time-to-first-token.
+
+        Args:
+            user_query: Natural language query from the user
+
+        Yields:
+            Chunks of the final report text as they are generated
+        """
+        self.logger.info(f"Starting streaming iterative search for query: {user_query}")
+
+        try:
+            iterations, all_records, error_message = self._run_iterations(user_query)
+            if error_message:
+                yield f"Search failed: {error_message}"
+                return
+
+            self.logger.info(f"Streaming final report for query: {user_query}")
+            yield from self._format_final_results_stream(user_query, iterations)
+
+        except Exception as e:
+            self.logger.error(f"Streaming pipeline execution failed: {str(e)}")
+            yield f"Search failed: {str(e)}"
+
+    def _run_iterations(self, user_query: str):
+        """
+        Run the iterative refinement loop up to (but not including) the final report.
+
+        Args:
+            user_query: Natural language query from the user
+
+        Returns:
+            Tuple of (iterations, all_records, error_message); error_message
+            is None unless the primary agent failed
+        """
+        iterations = []
+        all_records = []  # Collect all records from all iterations
+        seen_record_hashes = set()  # Content hashes of records already collected
+        current_query = user_query
+
+        for iteration_num in range(1, self.max_iterations + 1):
+            self.logger.info(f"Starting iteration {iteration_num}")
+            
+            # Step 1: Primary Agent - understand the query and generate multiple intents
+            try:
+                primary_response = self._cached_agent_call(self.primary_agent.understand_query, current_query)
+                query_intents = primary_response.query_intents
+                self.logger.info(f"Primary agent generated {len(query_intents)} query intent(s)")
+                for i, intent in enumerate(query_intents):
+                    self.logger.info(f"  Intent {i+1} (priority {intent.priority}): {intent.nl_intent}")
+            except Exception as e:
+                return iterations, all_records, f"Primary agent failed: {str(e)}"
+
+            # Step 2: Process all intents through BOTH graph and RAG pipelines
+            # concurrently - intents are independent, so wall time is
+            # roughly the slowest intent instead of the sum of all of them
+            all_intent_results = self._execute_intents(query_intents)
+
+            combined_cypher_queries = [
+                f"-- Intent {intent_idx + 1}: {intent_result['intent'].nl_intent}\n{intent_result['graph_result']['cypher']}"
+                for intent_idx, intent_result in enumerate(all_intent_results)
+                if intent_result['graph_result'] and 'error' not in intent_result['graph_result']
+            ]
+            
+            # Step 3: Combine results from all intents (for backward compatibility metrics)
+            combined_query_result = self._combine_intent_results(all_intent_results)
+            
+            # Collect all records from this iteration's successful queries.
+            # Iterations often re-retrieve overlapping nodes, so duplicates
+            # are dropped by content hash before they reach the final result
+            if combined_query_result.success and combined_query_result.records:
+                new_records = 0
+                for record in combined_query_result.records:
+                    record_hash = self._record_hash(record)
+                    if record_hash not in seen_record_hashes:
+                        seen_record_hashes.add(record_hash)
+                        all_records.append(record)
+                        new_records += 1
+                duplicates = len(combined_query_result.records) - new_records
+                if duplicates:
+                    self.logger.info(f"Iteration {iteration_num}: dropped {duplicates}/"
+                                     f"{len(combined_query_result.records)} duplicate records")
+            
+            # For logging and iteration tracking, use the primary intent
+            primary_intent = min(query_intents, key=lambda x: x.priority)
+            nl_intent = primary_intent.nl_intent
+            cypher_query = "\n\n".join(combined_cypher_queries)
+            
+            # Step 4: Merge all individual summaries into comprehensive overview
+            result_summary = self._merge_all_summaries(user_query, all_intent_results)
+            
+            # Calculate total counts for tracking
+            total_graph_records = sum(
+                intent['graph_result']['records_count'] for intent in all_intent_results
+                if intent['graph_result'] and intent['graph_result']['success']
+            )
+            total_rag_documents = sum(
+                intent['rag_result']['documents_count'] for intent in all_intent_results
+                if intent['rag_result'] and intent['rag_result']['success']
+            )
+            
+            # Step 5: Perform sufficiency check on combined summary.
+            # Fast path: when every intent succeeded on the first iteration
+            # with enough results, sufficiency is clear and the LLM check
+            # can be skipped entirely
+            fast_sufficient = (
+                iteration_num == 1 and
+                all_intent_results and
+                all(intent_result['success'] for intent_result in all_intent_results) and
+                total_graph_records + total_rag_documents >= config.pipeline.fast_sufficient_min_records
+            )
+            prefetch_thread = None
+            if fast_sufficient:
+                self.logger.info(f"All intents succeeded with {total_graph_records + total_rag_documents} results - skipping sufficiency LLM call")
+                sufficiency_analysis = SufficiencyAnalysis(
+                    sufficient=True,
+                    confidence=0.95,
+                    missing_info='',
+                    suggested_followup=''
+                )
+            else:
+                # Speculative prefetch: when results look clearly
+                # insufficient another round is near-certain, so intent
+                # generation for the most likely next query (the original
+                # query, which the zero-result and refusal paths fall back
+                # to) runs while the sufficiency round-trip is in flight.
+                # A wrong guess only costs one cached agent call
+                if (iteration_num < self.max_iterations and
+                        current_query != user_query and
+                        total_graph_records + total_rag_documents <
+                        config.pipeline.fast_sufficient_min_records):
+                    prefetch_thread = threading.Thread(
+                        target=self._prefetch_intents, args=(user_query,), daemon=True
+                    )
+                    prefetch_thread.start()
+
+                sufficiency_analysis = self._analyze_combined_sufficiency(
+                    user_query, result_summary, all_intent_results, iteration_num
+                )
+            
+            # Safety mechanism: If we have valid results and tried multiple iterations, 
+            # consider it sufficient to prevent infinite loops
+            if (combined_query_result.success and 
+                len(combined_query_result.records) > 0 and 
+                iteration_num >= 2):
+                sufficiency_analysis.sufficient = True
+                sufficiency_analysis.confidence = max(sufficiency_analysis.confidence, 0.8)
+                self.logger.info(f"Auto-marking as sufficient after {iteration_num} iterations with {len(combined_query_result.records)} results")
+            
+            iteration = SearchIteration(
+                iteration_number=iteration_num,
+                nl_intent=nl_intent,
+                cypher_query=cypher_query,
+                result_summary=result_summary,
+                records_count=total_graph_records,
+                execution_time_ms=combined_query_result.execution_time_ms,
+                sufficient=sufficiency_analysis.sufficient,
+                confidence=sufficiency_analysis.confidence,
+                feedback=sufficiency_analysis.missing_info,
+                query_success=combined_query_result.success,
+                rag_summary="Integrated in combined summary",  # RAG is now integrated
+                rag_documents_count=total_rag_documents
+            )
+            
+            iterations.append(iteration)
+            
+            # Check if results are sufficient
+            if (sufficiency_analysis.sufficient and
+                sufficiency_analysis.confidence >= self.sufficiency_threshold):
+                self.logger.info(f"Sufficient results found after {iteration_num} iterations")
+                break
+
+            # Stop spending LLM budget when iterations stop improving or
+            # keep returning nothing - format what we have instead
+            if (config.pipeline.enable_stagnation_early_exit and
+                    self._should_early_exit(iterations)):
+                break
+
+            # Prepare for next iteration if not at max
+            if iteration_num < self.max_iterations:
+                # Let any speculative prefetch land in the agent cache
+                # before the next round looks it up
+                if prefetch_thread is not None:
+                    prefetch_thread.join(timeout=30)
+
+                # The sufficiency call already produced a refined query,
+                # so no separate refinement round-trip is needed
+                if sufficiency_analysis.refined_query:
+                    current_query = sufficiency_analysis.refined_query
+                elif sufficiency_analysis.suggested_followup:
+                    current_query = sufficiency_analysis.suggested_followup
+                else:
+                    # Fallback: use the feedback to refine the query
+                    current_query = self._refine_query_for_next_iteration(
+                        user_query, sufficiency_analysis.missing_info
+                    )
+                
+                self.logger.info(f"Refined query for next iteration: {current_query}")
+
+        return iterations, all_records, None
+
+    def _should_early_exit(self, iterations: List[SearchIteration]) -> bool:
+        """
+        Decide whether to abandon further iterations as unproductive.
+
+        Exits when the last three iterations all returned zero records
+        (no relevant data exists) or when both confidence and record count
+        failed to improve over the previous iteration (stagnation).
+
+        Args:
+            iterations: Iterations completed so far, in order
+
+        Returns:
+            True if the loop should stop and format what it has
+        """
+        if len(iterations) >= 3 and all(it.records_count == 0 for it in iterations[-3:]):
+            self.logger.info(f"No results across {len(iterations)} iterations - "
+                             f"no relevant data found, exiting early")
+            return True
+
+        if len(iterations) < 2:
+            return False
+
+        current, previous = iterations[-1], iterations[-2]
+        if (current.confidence <= previous.confidence and
+                current.records_count <= previous.records_count):
+            self.logger.info("Stagnation detected - confidence and record count "
+                             "not improving, exiting early")
+            return True
+
+        return False
+
+    @staticmethod
+    def _record_hash(record: Dict) -> str:
+        """
+        Content hash of a record for cross-iteration deduplication.
+
+        Args:
+            record: Record dictionary from a query result
+
+        Returns:
+            Hex digest stable across dict ordering
+        """
+        try:
+            serialized = json.dumps(record, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            serialized = repr(sorted(record.items(), key=lambda item: item[0]))
+        return hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _cached_agent_call(self, fn, key_str: str):
+        """
+        Call an agent function through the content-hash cache.
+
+        Args:
+            fn: Agent method taking a single string argument
+            key_str: The input string; its hash (with the function name as a
+                     namespace) is the cache key
+
+        Returns:
+            The agent's response, from cache when the same input was seen before
+        """
+        key = hashlib.blake2b(
+            f"{fn.__qualname__}:{key_str}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+
+        if key in self._agent_cache:
+            self._agent_cache_hits += 1
+            self.logger.info(f"Agent cache hit for {fn.__qualname__} "
+                             f"({self._agent_cache_hits} hits / {self._agent_cache_misses} misses)")
+            return self._agent_cache[key]
+
+        self._agent_cache_misses += 1
+        result = fn(key_str)
+
+        if len(self._agent_cache) >= self._agent_cache_size:
+            self._agent_cache.clear()  # Simple bound; repopulates quickly
+        self._agent_cache[key] = result
+        return result
+
+    def _prefetch_intents(self, query: str) -> None:
+        """
+        Best-effort warm-up of the agent cache for a speculated next query.
+
+        Runs in a background thread alongside the sufficiency check; any
+        failure is logged and swallowed since the main loop will simply
+        make the call itself if the cache stays cold.
+
+        Args:
+            query: The query the next iteration is expected to use
+        """
+        try:
+            self._cached_agent_call(self.primary_agent.understand_query, query)
+        except Exception as e:
+            self.logger.debug(f"Speculative intent prefetch failed: {str(e)}")
+
+    def _embed_for_cache(self, text: str) -> List[float]:
+        """
+        Embed text for semantic cache similarity lookups.
+
+        Identical texts (the user query and its verbatim reuses across
+        iteration prompts) are embedded once per run and served from a
+        small memo afterwards.
+
+        Args:
+            text: Prompt text to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        memo_key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._embedding_memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        response = self.openai_client.embeddings.create(
+            model="text-embedding-3-small",
+            input=text
+        )
+        embedding = response.data[0].embedding
+
+        if len(self._embedding_memo) >= 256:
+            self._embedding_memo.clear()  # Simple bound; repopulates quickly
+        self._embedding_memo[memo_key] = embedding
+        return embedding
+
+    def _execute_intents(self, query_intents: List) -> List[Dict]:
+        """
+        Execute all query intents concurrently through graph and RAG pipelines.
+
+        Args:
+            query_intents: List of QueryIntent objects from the primary agent
+
+        Returns:
+            List of intent result dictionaries, in the same order as the intents
+        """
+        # Route each intent first: clearly structural intents skip the RAG
+        # branch, clearly semantic ones skip the graph branch, and anything
+        # ambiguous runs both as before
+        routes = [self._classify_intent(query_intent.nl_intent) for query_intent in query_intents]
+        self.logger.info(f"Intent routing: {routes.count('graph')} graph-only, "
+                         f"{routes.count('rag')} rag-only, {routes.count('both')} both")
+        graph_indices = [i for i, route in enumerate(routes) if route != 'rag']
+        rag_indices = [i for i, route in enumerate(routes) if route != 'graph']
+
+        # Translate the graph-bound intents in one LLM call up front;
+        # individual intents fall back to per-intent translation if the
+        # batch misses any
+        translator_responses = [None] * len(query_intents)
+        if len(graph_indices) > 1:
+            try:
+                batch_responses = self.translator_agent.translate_batch(
+                    [query_intents[i].nl_intent for i in graph_indices]
+                )
+                for i, response in zip(graph_indices, batch_responses):
+                    translator_responses[i] = response
+            except Exception as e:
+                self.logger.warning(f"Batch translation unavailable, using per-intent calls: {str(e)}")
+                translator_responses = [None] * len(query_intents)
+
+        # When every graph-bound intent translated, run all Cypher in one
+        # Neo4j transaction - one Bolt round-trip instead of one per intent
+        graph_results = [None] * len(query_intents)
+        if len(graph_indices) > 1 and all(translator_responses[i] is not None for i in graph_indices):
+            batch_results = self._execute_graph_batch([translator_responses[i] for i in graph_indices])
+            for i, graph_result in zip(graph_indices, batch_results):
+                graph_results[i] = graph_result
+        for i, route in enumerate(routes):
+            if route == 'rag':
+                graph_results[i] = self._skipped_graph_result()
+
+        # Batch the RAG searches as well: near-duplicate intents share one
+        # embedding call and one vector search instead of repeating both
+        rag_results = [None] * len(query_intents)
+        if len(rag_indices) > 1 and self.rag_agent.is_available():
+            batch_results = self._execute_rag_batch([query_intents[i] for i in rag_indices])
+            for i, rag_result in zip(rag_indices, batch_results):
+                rag_results[i] = rag_result
+        for i, route in enumerate(routes):
+            if route == 'graph':
+                rag_results[i] = self._skipped_rag_result()
+
+        async def _gather_intents():
+            semaphore = asyncio.Semaphore(self.max_intent_concurrency)
+            tasks = [
+                self._process_intent(semaphore, intent_idx, query_intent, len(query_intents),
+                                     translator_responses[intent_idx], graph_results[intent_idx],
+                                     rag_results[intent_idx])
+                for intent_idx, query_intent in enumerate(query_intents)
+            ]
+            return await asyncio.gather(*tasks)
+
+        return list(asyncio.run(_gather_intents()))
+
+    def _execute_graph_batch(self, translator_responses: List) -> List[Dict]:
+        """
+        Execute all pre-translated Cypher queries in a single transaction.
+
+        Args:
+            translator_responses: Translator responses, one per intent
+
+        Returns:
+            List of graph result dictionaries aligned with the responses,
+            or a list of Nones if the batch execution failed
+        """
+        try:
+            query_results = self.query_executor.execute_many(
+                [response.cypher_query for response in translator_responses]
+            )
+        except Exception as e:
+            self.logger.warning(f"Batched graph execution failed, using per-intent queries: {str(e)}")
+            return [None] * len(translator_responses)
+
+        graph_results = []
+        for intent_idx, (translator_response, query_result) in enumerate(zip(translator_responses, query_results)):
+            if query_result.success:
+                self.logger.info(f"Graph query for intent {intent_idx + 1}: {len(query_result.records)} results")
+                graph_results.append({
+                    'cypher': translator_response.cypher_query,
+                    'result': query_result,
+                    'translator_response': translator_response,
+                    'success': True,
+                    'records_count': len(query_result.records)
+                })
+            else:
+                self.logger.error(f"Graph query failed for intent {intent_idx + 1}: {query_result.error_message}")
+                graph_results.append({
+                    'cypher': translator_response.cypher_query,
+                    'result': query_result,
+                    'success': False,
+                    'records_count': 0,
+                    'error': query_result.error_message or 'Unknown error'
+                })
+
+        return graph_results
+
+    def _execute_rag_batch(self, query_intents: List) -> List[Dict]:
+        """
+        Run all RAG searches through the batch API with shared embeddings.
+
+        Args:
+            query_intents: QueryIntent objects, one per intent
+
+        Returns:
+            List of RAG result dictionaries aligned with the intents,
+            or a list of Nones if the batch search failed
+        """
+        try:
+            rag_search_results = self.rag_agent.search_documents_batch(
+                [query_intent.nl_intent for query_intent in query_intents], k=5
+            )
+        except Exception as e:
+            self.logger.warning(f"Batched RAG search failed, using per-intent searches: {str(e)}")
+            return [None] * len(query_intents)
+
+        rag_results = []
+        for intent_idx, rag_search_result in enumerate(rag_search_results):
+            self.logger.info(f"RAG search for intent {intent_idx + 1}: {rag_search_result.documents_found} documents")
+            rag_results.append({
+                'search_result': rag_search_result,
+                'success': rag_search_result.success,
+                'documents_count': rag_search_result.documents_found
+            })
+
+        return rag_results
+
+    @staticmethod
+    def _classify_intent(nl_intent: str) -> str:
+        """
+        Route an intent to the graph branch, the RAG branch, or both.
+
+        Zero-LLM keyword/regex heuristic: structural vocabulary or concrete
+        code identifiers point at the graph, open-ended "how/why/explain"
+        phrasing points at documents, and mixed or unclear intents keep the
+        default of running both branches.
+
+        Args:
+            nl_intent: Natural language intent text
+
+        Returns:
+            'graph', 'rag', or 'both'
+        """
+        graph_signal = bool(_GRAPH_INTENT_RE.search(nl_intent)) or \
+            bool(_CODE_IDENTIFIER_RE.search(nl_intent))
+        rag_signal = bool(_RAG_INTENT_RE.search(nl_intent))
+
+        if graph_signal and not rag_signal:
+            return 'graph'
+        if rag_signal and not graph_signal:
+            return 'rag'
+        return 'both'
+
+    @staticmethod
+    def _skipped_graph_result() -> Dict:
+        """Placeholder graph result for intents routed to the RAG branch only."""
+        return {
+            'cypher': '',
+            'result': None,
+            'success': False,
+            'records_count': 0,
+            'skipped': True,
+            'error': 'Skipped: intent routed to RAG branch'
+        }
+
+    @staticmethod
+    def _skipped_rag_result() -> Dict:
+        """Placeholder RAG result for intents routed to the graph branch only."""
+        return {
+            'search_result': None,
+            'success': False,
+            'documents_count': 0,
+            'skipped': True,
+            'error': 'Skipped: intent routed to graph branch'
+        }
+
+    async def _process_intent(self, semaphore: asyncio.Semaphore, intent_idx: int,
+                              query_intent, total_intents: int,
+                              translator_response=None, graph_result=None,
+                              rag_result=None) -> Dict:
+        """
+        Process a single intent: graph and RAG branches run concurrently,
+        then a combined summary is generated from both.
+
+        Args:
+            semaphore: Concurrency limiter shared across intents
+            intent_idx: Zero-based index of this intent
+            query_intent: The QueryIntent to process
+            total_intents: Total number of intents (for logging)
+            translator_response: Optional pre-translated Cypher from the batch call
+            graph_result: Optional graph result from the batched transaction;
+                          when set, the graph branch is skipped entirely
+            rag_result: Optional RAG result from the batched search;
+                        when set, the RAG branch is skipped entirely
+
+        Returns:
+            Intent result dictionary with graph, RAG, and summary data
+        """
+        async with semaphore:
+            self.logger.info(f"Processing intent {intent_idx + 1}/{total_intents}: {query_intent.nl_intent}")
+
+            if graph_result is not None and rag_result is not None:
+                pass
+            elif graph_result is not None:
+                rag_result = await asyncio.to_thread(self._execute_rag_intent, intent_idx, query_intent)
+            elif rag_result is not None:
+                graph_result = await asyncio.to_thread(
+                    self._execute_graph_intent, intent_idx, query_intent, translator_response
+                )
+            else:
+                graph_result, rag_result = await asyncio.gather(
+                    asyncio.to_thread(self._execute_graph_intent, intent_idx, query_intent, translator_response),
+                    asyncio.to_thread(self._execute_rag_intent, intent_idx, query_intent)
+                )
+
+            combined_summary = await asyncio.to_thread(
+                self._generate_intent_summary, query_intent.nl_intent, graph_result, rag_result
+            )
+
+            return {
+                'intent': query_intent,
+                'graph_result': graph_result,
+                'rag_result': rag_result,
+                'combined_summary': combined_summary,
+                # Successful if either source provided results
+                'success': (
+                    (graph_result['success'] and graph_result['records_count'] > 0) or
+                    (rag_result['success'] and rag_result['documents_count'] > 0)
+                )
+            }
+
+    def _execute_graph_intent(self, intent_idx: int, query_intent, translator_response=None) -> Dict:
+        """
+        Translate an intent to Cypher and execute it on the graph database.
+
+        Args:
+            intent_idx: Zero-based index of this intent (for logging)
+            query_intent: The QueryIntent to execute
+            translator_response: Optional pre-translated response from the batch
+                                 call; translated individually when None
+
+        Returns:
+            Graph result dictionary
+        """
+        try:
+            if translator_response is None:
+                translator_response = self._cached_agent_call(
+                    self.translator_agent.translate_to_cypher, query_intent.nl_intent
+                )
+            cypher_query = translator_response.cypher_query
+
+            graph_result = self.query_executor.execute(cypher_query)
+
+            self.logger.info(f"Graph query for intent {intent_idx + 1}: {len(graph_result.records)} results")
+
+            return {
+                'cypher': cypher_query,
+                'result': graph_result,
+                'translator_response': translator_response,
+                'success': graph_result.success,
+                'records_count': len(graph_result.records)
+            }
+
+        except Exception as e:
+            self.logger.error(f"Graph query failed for intent {intent_idx + 1}: {str(e)}")
+            return {
+                'cypher': f"ERROR: {str(e)}",
+                'result': None,
+                'success': False,
+                'records_count': 0,
+                'error': str(e)
+            }
+
+    def _execute_rag_intent(self, intent_idx: int, query_intent) -> Dict:
+        """
+        Execute an intent against the RAG document pipeline.
+
+        Args:
+            intent_idx: Zero-based index of this intent (for logging)
+            query_intent: The QueryIntent to search for
+
+        Returns:
+            RAG result dictionary
+        """
+        if not self.rag_agent.is_available():
+            return {
+                'success': False,
+                'documents_count': 0,
+                'error': 'RAG agent not available'
+            }
+
+        try:
+            rag_search_result = self.rag_agent.search_documents(
+                query=query_intent.nl_intent,
+                k=5
+            )
+
+            self.logger.info(f"RAG search for intent {intent_idx + 1}: {rag_search_result.documents_found} documents")
+
+            return {
+                'search_result': rag_search_result,
+                'success': rag_search_result.success,
+                'documents_count': rag_search_result.documents_found
+            }
+
+        except Exception as e:
+            self.logger.error(f"RAG search failed for intent {intent_idx + 1}: {str(e)}")
+            return {
+                'success': False,
+                'documents_count': 0,
+                'error': str(e)
+            }
+
     def _combine_query_results(self, all_query_results: List[Dict]) -> QueryResult:
         """
         Combine multiple query results into a single QueryResult.
@@ -341,29 +903,30 @@ class IterativePipeline:
         Returns:
             Combined QueryResult object
         """
-        combined_records = []
-        combined_execution_time = 0.0
-        successful_queries = 0
-        error_messages = []
-        
-        for query_data in all_query_results:
-            result = query_data['result']
-            intent = query_data['intent']
-            
-            if result and result.success:
-                # Add records without debug metadata
-                for record in result.records:
-                    combined_records.append(dict(record))
-                
-                combined_execution_time += result.execution_time_ms
-                successful_queries += 1
-            else:
-                error_msg = f"Intent '{intent.nl_intent}': {query_data['cypher']}"
-                error_messages.append(error_msg)
+        successful = [
+            query_data for query_data in all_query_results
+            if query_data['result'] and query_data['result'].success
+        ]
+
+        # Single comprehension flattens all record lists without per-row
+        # .append lookups; executor records are already plain dicts, so
+        # only genuine Record objects pay for a copy
+        combined_records = [
+            record if isinstance(record, dict) else dict(record)
+            for query_data in successful
+            for record in query_data['result'].records
+        ]
+        combined_execution_time = sum(
+            query_data['result'].execution_time_ms for query_data in successful
+        )
+        successful_queries = len(successful)
+        error_messages = [
+            f"Intent '{query_data['intent'].nl_intent}': {query_data['cypher']}"
+            for query_data in all_query_results
+            if not (query_data['result'] and query_data['result'].success)
+        ]
         
         # Create combined QueryResult
-        from ..graphdb.query_executor import QueryResult
-        
         combined_result = QueryResult(
             records=combined_records,
             summary={"total_intents": len(all_query_results), "successful_queries": successful_queries},
@@ -392,120 +955,283 @@ class IterativePipeline:
             refinement_prompt = f"""
             Original query: "{original_query}"
             Feedback on missing information: "{feedback}"
-            
+
             Provide a refined version of the original query that addresses the missing information.
             Make it more specific or ask for additional related information.
             Keep it as a natural language query.
             """
-            
-            response = self.openai_client.chat.completions.create(
-                model=config.openai.model,
-                messages=[{"role": "user", "content": refinement_prompt}],
-                temperature=1.0,
-                max_completion_tokens=None
-            )
-            
-            refined_query = response.choices[0].message.content.strip()
-            return refined_query
-            
+
+            def _call_refinement():
+                response = self.openai_client.chat.completions.create(
+                    model=config.openai.model,
+                    messages=[{"role": "user", "content": refinement_prompt}],
+                    temperature=1.0,
+                    max_completion_tokens=None
+                )
+                return response.choices[0].message.content.strip()
+
+            return self._llm_cache.get_or_compute(refinement_prompt, _call_refinement)
+
         except Exception as e:
             self.logger.error(f"Query refinement failed: {str(e)}")
             # Fallback to original query
             return original_query
     
-    def _format_final_results(self, original_query: str, iterations: List[SearchIteration]) -> str:
+    def _build_final_report_prompt(self, original_query: str, iterations: List[SearchIteration]) -> str:
         """
-        Format the final results from all iterations into a user-friendly response.
-        
+        Build the final-report prompt from all iteration summaries.
+
         Args:
             original_query: The original user query
             iterations: List of all search iterations
-            
+
         Returns:
-            Formatted final answer
+            Formatted prompt string for the final report LLM call
+        """
+        # Collect all summaries from iterations (both graph and RAG results)
+        all_summaries = []
+        total_records = 0
+        total_rag_documents = 0
+
+        for iteration in iterations:
+            if iteration.query_success and iteration.result_summary:
+                capped_summary = truncate_to_tokens(
+                    iteration.result_summary, config.pipeline.max_tokens_merged_summary
+                )
+                all_summaries.append(f"Iteration {iteration.iteration_number}: {capped_summary}")
+                total_records += iteration.records_count
+                total_rag_documents += iteration.rag_documents_count
+
+        # Format summaries for final report, bounded so final-report latency
+        # stays flat regardless of iteration depth
+        if all_summaries:
+            results_text = "\n\n".join(all_summaries)
+            pre_tokens = count_tokens(results_text)
+            results_text = truncate_to_tokens(results_text, config.pipeline.max_tokens_final_context)
+            if pre_tokens > config.pipeline.max_tokens_final_context:
+                self.logger.info(f"Final report context truncated from {pre_tokens} to "
+                                 f"{count_tokens(results_text)} tokens")
+            results_text += f"\n\n**Summary Statistics:**\n"
+            results_text += f"- Graph Database Results: {total_records} records\n"
+            results_text += f"- Document Search Results: {total_rag_documents} documents"
+        else:
+            results_text = "No results found across all iterations."
+
+        return RESULT_FORMATTING_PROMPT.format(
+            original_query=original_query,
+            search_results=results_text,
+            delty_system_report = DELTY_SYSTEM_REPORT
+        )
+
+    def _format_final_results_stream(self, original_query: str, iterations: List[SearchIteration]):
+        """
+        Stream the final report, yielding text chunks as the LLM generates them.
+
+        Args:
+            original_query: The original user query
+            iterations: List of all search iterations
+
+        Yields:
+            Chunks of the final report text
         """
         try:
-            # Collect all summaries from iterations (both graph and RAG results)
-            all_summaries = []
-            total_records = 0
-            total_rag_documents = 0
-            
-            for iteration in iterations:
-                if iteration.query_success and iteration.result_summary:
-                    all_summaries.append(f"Iteration {iteration.iteration_number}: {iteration.result_summary}")
-                    total_records += iteration.records_count
-                    total_rag_documents += iteration.rag_documents_count
-            
-            # Format summaries for final report
-            if all_summaries:
-                results_text = "\n\n".join(all_summaries)
-                results_text += f"\n\n**Summary Statistics:**\n"
-                results_text += f"- Graph Database Results: {total_records} records\n"
-                results_text += f"- Document Search Results: {total_rag_documents} documents"
-            else:
-                results_text = "No results found across all iterations."
-            
-            prompt = RESULT_FORMATTING_PROMPT.format(
-                original_query=original_query,
-                search_results=results_text,
-                delty_system_report = DELTY_SYSTEM_REPORT
-            )
-            
-            # Log the final report generation API call
+            prompt = self._build_final_report_prompt(original_query, iterations)
+
             start_time = time.time()
             messages = [{"role": "user", "content": prompt}]
 
-            client = openai.OpenAI(api_key=config.openai.api_key)
-            response = client.responses.create(
-                model="gpt-5",
-                input=prompt,
-                reasoning={
-                    "effort": "low"
-                }
+            stream = self.openai_client.chat.completions.create(
+                model=config.openai.model,
+                messages=messages,
+                temperature=1.0,
+                max_completion_tokens=None,
+                stream=True
             )
-            
-            # response = self.openai_client.chat.completions.create(
-            #     model="gpt-5-2025-08-07",
-            #     #messages=messages,
-            #     #temperature=1.0,
-            #     #max_completion_tokens=None
-            #     input=prompt,
-            #     text={
-            #         "effort": "high"
-            #     }
-            # )
-            
-            # Log the API call details
+
+            collected = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    collected.append(delta)
+                    yield delta
+
             duration_ms = (time.time() - start_time) * 1000
             openai_logger.log_api_call(
                 method="chat.completions.create",
                 messages=messages,
-                model="gpt-5",
+                model=config.openai.model,
                 temperature=1.0,
                 max_tokens=None,
-                response=response,
+                response="".join(collected),
                 duration_ms=duration_ms,
                 agent_name="FinalReportAgent"
             )
-            
+
+        except Exception as e:
+            self.logger.error(f"Streaming result formatting failed: {str(e)}")
+            # Fall back to the blocking formatter's report in one chunk
+            yield self._format_final_results(original_query, iterations)
+
+    def _submit_final_report_batch(self, original_query: str,
+                                   iterations: List[SearchIteration]) -> Optional[str]:
+        """
+        Submit the final report generation as an OpenAI Batch API job.
+
+        The report is the single largest LLM call in a search and is only
+        needed once, so offline callers can trade minutes of latency for
+        half the token cost by deferring it to the batch queue.
+
+        Args:
+            original_query: The original user query
+            iterations: List of all search iterations
+
+        Returns:
+            The batch job id, or None if submission failed (the caller
+            falls back to the interactive endpoint)
+        """
+        try:
+            prompt = self._build_final_report_prompt(original_query, iterations)
+            request_line = json.dumps({
+                "custom_id": "final-report-1",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {
+                    "model": "gpt-5",
+                    "input": prompt,
+                    "reasoning": {"effort": "low"}
+                }
+            })
+
+            with tempfile.NamedTemporaryFile('wb', suffix='.jsonl', delete=False) as batch_file:
+                batch_file.write((request_line + "\n").encode('utf-8'))
+                batch_path = batch_file.name
+
+            try:
+                with open(batch_path, 'rb') as file_handle:
+                    input_file = self.openai_client.files.create(file=file_handle, purpose="batch")
+            finally:
+                os.unlink(batch_path)
+
+            batch = self.openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/responses",
+                completion_window="24h"
+            )
+            self.logger.info(f"Submitted final report as batch job {batch.id}")
+            return batch.id
+
+        except Exception as e:
+            self.logger.warning(f"Batch submission failed, falling back to interactive final report: {str(e)}")
+            return None
+
+    def poll_batch(self, batch_id: str) -> Optional[str]:
+        """
+        Fetch the final report for a previously submitted batch job.
+
+        Args:
+            batch_id: Batch job id from a SearchResult's final_answer_batch_id
+
+        Returns:
+            The final report text once the job has completed, or None while
+            it is still in progress
+
+        Raises:
+            RuntimeError: If the batch job failed, expired, or was cancelled
+        """
+        batch = self.openai_client.batches.retrieve(batch_id)
+
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch job {batch_id} ended with status '{batch.status}'")
+        if batch.status != "completed":
+            self.logger.info(f"Batch job {batch_id} not ready yet (status: {batch.status})")
+            return None
+
+        output = self.openai_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
             # Extract content from GPT-5 responses API format
-            if hasattr(response, 'output') and response.output:
-                # Find the message output in the output array
-                for output_item in response.output:
-                    if hasattr(output_item, 'type') and output_item.type == 'message':
-                        if hasattr(output_item, 'content') and output_item.content:
-                            for content_item in output_item.content:
-                                if hasattr(content_item, 'text'):
-                                    return content_item.text.strip()
-            
-            # Fallback to old format if available
-            elif hasattr(response, 'choices') and response.choices:
-                return response.choices[0].message.content.strip()
-            
-            # Last resort fallback
-            self.logger.error(f"Unexpected response format: {type(response)}")
-            return str(response)
-            
+            for output_item in body.get("output", []):
+                if output_item.get("type") == "message":
+                    for content_item in output_item.get("content", []):
+                        if content_item.get("type") == "output_text":
+                            return content_item.get("text", "")
+
+        return ""
+
+    def _format_final_results(self, original_query: str, iterations: List[SearchIteration]) -> str:
+        """
+        Format the final results from all iterations into a user-friendly response.
+
+        Args:
+            original_query: The original user query
+            iterations: List of all search iterations
+
+        Returns:
+            Formatted final answer
+        """
+        try:
+            prompt = self._build_final_report_prompt(original_query, iterations)
+
+            def _call_final_report():
+                # Log the final report generation API call
+                start_time = time.time()
+                messages = [{"role": "user", "content": prompt}]
+
+                response = self.openai_client.responses.create(
+                    model="gpt-5",
+                    input=prompt,
+                    reasoning={
+                        "effort": "low"
+                    }
+                )
+
+                # response = self.openai_client.chat.completions.create(
+                #     model="gpt-5-2025-08-07",
+                #     #messages=messages,
+                #     #temperature=1.0,
+                #     #max_completion_tokens=None
+                #     input=prompt,
+                #     text={
+                #         "effort": "high"
+                #     }
+                # )
+
+                # Log the API call details
+                duration_ms = (time.time() - start_time) * 1000
+                openai_logger.log_api_call(
+                    method="chat.completions.create",
+                    messages=messages,
+                    model="gpt-5",
+                    temperature=1.0,
+                    max_tokens=None,
+                    response=response,
+                    duration_ms=duration_ms,
+                    agent_name="FinalReportAgent"
+                )
+
+                # Extract content from GPT-5 responses API format
+                if hasattr(response, 'output') and response.output:
+                    # Find the message output in the output array
+                    for output_item in response.output:
+                        if hasattr(output_item, 'type') and output_item.type == 'message':
+                            if hasattr(output_item, 'content') and output_item.content:
+                                for content_item in output_item.content:
+                                    if hasattr(content_item, 'text'):
+                                        return content_item.text.strip()
+
+                # Fallback to old format if available
+                elif hasattr(response, 'choices') and response.choices:
+                    return response.choices[0].message.content.strip()
+
+                # Last resort fallback
+                self.logger.error(f"Unexpected response format: {type(response)}")
+                return str(response)
+
+            return self._llm_cache.get_or_compute(prompt, _call_final_report)
+
         except Exception as e:
             self.logger.error(f"Result formatting failed: {str(e)}")
             
@@ -589,9 +1315,18 @@ class IterativePipeline:
             total_graph_results = 0
             total_rag_documents = 0
             
-            for i, intent_result in enumerate(all_intent_results):
+            # Highest-priority intents first, so they survive the total cap
+            indexed_results = sorted(
+                enumerate(all_intent_results),
+                key=lambda pair: pair[1]['intent'].priority
+            )
+            for i, intent_result in indexed_results:
                 if intent_result['success'] and intent_result['combined_summary']:
-                    summary = f"**Intent {i+1} ({intent_result['intent'].nl_intent}):** {intent_result['combined_summary']}"
+                    capped_summary = truncate_to_tokens(
+                        intent_result['combined_summary'],
+                        config.pipeline.max_tokens_per_intent_summary
+                    )
+                    summary = f"**Intent {i+1} ({intent_result['intent'].nl_intent}):** {capped_summary}"
                     successful_summaries.append(summary)
                     
                     # Count results
@@ -609,7 +1344,15 @@ class IterativePipeline:
             merged_summary += f"**Summary:** Found {total_graph_results} graph records and {total_rag_documents} relevant documents across {len(successful_summaries)} successful intents.\n\n"
             merged_summary += "**Detailed Findings:**\n\n"
             merged_summary += "\n\n".join(successful_summaries)
-            
+
+            # Bound the merged summary so sufficiency-check latency stays
+            # flat regardless of how many intents the iteration produced
+            pre_tokens = count_tokens(merged_summary)
+            merged_summary = truncate_to_tokens(merged_summary, config.pipeline.max_tokens_merged_summary)
+            if pre_tokens > config.pipeline.max_tokens_merged_summary:
+                self.logger.info(f"Merged summary truncated from {pre_tokens} to "
+                                 f"{count_tokens(merged_summary)} tokens")
+
             return merged_summary
             
         except Exception as e:
@@ -626,28 +1369,33 @@ class IterativePipeline:
         Returns:
             Combined QueryResult object
         """
-        combined_records = []
-        combined_execution_time = 0.0
-        successful_queries = 0
-        error_messages = []
-        
-        for intent_result in all_intent_results:
-            graph_result = intent_result.get('graph_result')
-            
-            if graph_result and graph_result['success'] and graph_result['result']:
-                # Add records from successful graph queries
-                for record in graph_result['result'].records:
-                    combined_records.append(dict(record))
-                
-                combined_execution_time += graph_result['result'].execution_time_ms
-                successful_queries += 1
-            elif graph_result and not graph_result['success']:
-                error_msg = f"Intent '{intent_result['intent'].nl_intent}': {graph_result.get('error', 'Unknown error')}"
-                error_messages.append(error_msg)
+        successful = [
+            intent_result for intent_result in all_intent_results
+            if intent_result.get('graph_result')
+            and intent_result['graph_result']['success']
+            and intent_result['graph_result']['result']
+        ]
+
+        # Records from successful graph queries, flattened in one
+        # comprehension; executor records are already plain dicts, so
+        # only genuine Record objects pay for a copy
+        combined_records = [
+            record if isinstance(record, dict) else dict(record)
+            for intent_result in successful
+            for record in intent_result['graph_result']['result'].records
+        ]
+        combined_execution_time = sum(
+            intent_result['graph_result']['result'].execution_time_ms
+            for intent_result in successful
+        )
+        successful_queries = len(successful)
+        error_messages = [
+            f"Intent '{intent_result['intent'].nl_intent}': {intent_result['graph_result'].get('error', 'Unknown error')}"
+            for intent_result in all_intent_results
+            if intent_result.get('graph_result') and not intent_result['graph_result']['success']
+        ]
         
         # Create combined QueryResult
-        from ..graphdb.query_executor import QueryResult
-        
         combined_result = QueryResult(
             records=combined_records,
             summary={"total_intents": len(all_intent_results), "successful_queries": successful_queries},
@@ -676,6 +1424,21 @@ class IterativePipeline:
             SufficiencyAnalysis object
         """
         try:
+            # Resume from checkpoint: a crash mid-search should not re-pay
+            # sufficiency calls for iterations that already completed
+            checkpoint_key = None
+            if self._sufficiency_checkpoint is not None:
+                checkpoint_key = hashlib.blake2b(
+                    f"sufficiency:{original_query}:{iteration}:{config.openai.model}".encode('utf-8'),
+                    digest_size=16
+                ).hexdigest()
+                checkpointed = self._sufficiency_checkpoint.get(checkpoint_key)
+                if checkpointed is not None:
+                    value, saved_at = checkpointed
+                    if time.time() - saved_at < _SUFFICIENCY_CHECKPOINT_TTL_S:
+                        self.logger.info(f"Resuming iteration {iteration} sufficiency from checkpoint")
+                        return SufficiencyAnalysis.model_validate(value)
+
             # Calculate overall success metrics
             successful_intents = sum(1 for result in all_intent_results if result['success'])
             total_graph_records = sum(
@@ -696,9 +1459,48 @@ class IterativePipeline:
                     suggested_followup=original_query
                 )
             
+            # Rule-based fast paths: deterministic verdicts skip the LLM
+            # round-trip entirely and only ambiguous cases fall through
+            # iteration is 1-based (the caller passes iteration_num)
+            if iteration >= self.max_iterations:
+                self.logger.info("Final iteration reached - skipping sufficiency LLM call")
+                return SufficiencyAnalysis(
+                    sufficient=True,
+                    confidence=0.6,
+                    missing_info='Max iterations reached',
+                    suggested_followup=''
+                )
+
+            if (successful_intents == len(all_intent_results) and
+                    total_graph_records + total_rag_documents >=
+                    config.pipeline.fast_sufficient_min_records):
+                self.logger.info(
+                    f"All {successful_intents} intents succeeded with "
+                    f"{total_graph_records + total_rag_documents} results - "
+                    f"skipping sufficiency LLM call"
+                )
+                return SufficiencyAnalysis(
+                    sufficient=True,
+                    confidence=0.85,
+                    missing_info='',
+                    suggested_followup=''
+                )
+
+            # Trim the merged summary to the sentences most relevant to the
+            # query before it rides along on every iteration's LLM call
+            trimmed_summary = select_relevant_sentences(
+                merged_summary, original_query,
+                max_sentences=_SUFFICIENCY_SUMMARY_MAX_SENTENCES
+            )
+            if len(trimmed_summary) < len(merged_summary):
+                self.logger.info(
+                    f"Trimmed sufficiency summary from {len(merged_summary)} to "
+                    f"{len(trimmed_summary)} chars"
+                )
+
             # Use the standard sufficiency analysis prompt with combined results
             combined_results_text = f"""
-            Combined Analysis Results: {merged_summary}
+            Combined Analysis Results: {trimmed_summary}
             
             Metrics:
             - Successful intents: {successful_intents}/{len(all_intent_results)}
@@ -706,60 +1508,133 @@ class IterativePipeline:
             - Relevant documents: {total_rag_documents}
             """
             
-            combined_prompt = SUFFICIENCY_ANALYSIS_PROMPT.format(
+            analysis = self._analyze_sufficiency_single(original_query, combined_results_text, iteration)
+
+            if checkpoint_key is not None:
+                self._sufficiency_checkpoint.set(checkpoint_key, analysis.model_dump())
+
+            return analysis
+
+        except Exception as e:
+            self.logger.error(f"Combined sufficiency analysis failed: {str(e)}")
+            # Default to insufficient if analysis fails
+            return SufficiencyAnalysis(
+                sufficient=False,
+                confidence=0.0,
+                missing_info='Unable to analyze combined results sufficiency',
+                suggested_followup=original_query
+            )
+
+    def _analyze_sufficiency_single(self, original_query: str, results_text: str,
+                                    iteration: int) -> SufficiencyAnalysis:
+        """
+        Run one sufficiency analysis LLM call through the semantic cache.
+
+        Args:
+            original_query: The query being answered
+            results_text: Formatted results to judge sufficiency against
+            iteration: Current iteration number
+
+        Returns:
+            SufficiencyAnalysis object
+        """
+        try:
+            # Static instructions ride in the system message so provider
+            # prompt-prefix caching hash-matches them across calls; only the
+            # small user suffix changes per iteration
+            user_prompt = SUFFICIENCY_ANALYSIS_USER_PROMPT.format(
                 original_query=original_query,
-                current_results=combined_results_text,
+                current_results=truncate_to_tokens(results_text, _SUFFICIENCY_PROMPT_TOKEN_LIMIT),
                 iteration=iteration,
                 max_iterations=self.max_iterations
             )
-            
-            # Log the sufficiency analysis API call
-            start_time = time.time()
-            messages = [{"role": "user", "content": combined_prompt}]
-            
-            response = self.openai_client.chat.completions.parse(
-                model=config.openai.model,
-                messages=messages,
-                temperature=1.0,
-                max_completion_tokens=None,
-                response_format=SufficiencyAnalysis
-            )
-            
-            # Log the API call details
-            duration_ms = (time.time() - start_time) * 1000
-            openai_logger.log_api_call(
-                method="chat.completions.parse",
-                messages=messages,
-                model=config.openai.model,
-                temperature=1.0,
-                max_tokens=None,
-                response=response,
-                duration_ms=duration_ms,
-                agent_name="SufficiencyAgent"
-            )
-            
-            if response.choices[0].message.refusal:
-                self.logger.warning(f"Sufficiency analysis refused: {response.choices[0].message.refusal}")
-                return SufficiencyAnalysis(
-                    sufficient=False,
-                    confidence=0.0,
-                    missing_info='Analysis was refused for safety reasons',
-                    suggested_followup=original_query
+            combined_prompt = SUFFICIENCY_ANALYSIS_SYSTEM_PROMPT + user_prompt
+
+            def _call_sufficiency():
+                # Log the sufficiency analysis API call
+                start_time = time.time()
+                messages = [
+                    {"role": "system", "content": SUFFICIENCY_ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ]
+
+                response = self.openai_client.chat.completions.parse(
+                    model=config.openai.model,
+                    messages=messages,
+                    temperature=1.0,
+                    max_completion_tokens=None,
+                    response_format=SufficiencyAnalysis
                 )
-            
-            analysis = response.choices[0].message.parsed
-            return analysis
-            
+
+                # Log the API call details
+                duration_ms = (time.time() - start_time) * 1000
+                openai_logger.log_api_call(
+                    method="chat.completions.parse",
+                    messages=messages,
+                    model=config.openai.model,
+                    temperature=1.0,
+                    max_tokens=None,
+                    response=response,
+                    duration_ms=duration_ms,
+                    agent_name="SufficiencyAgent"
+                )
+
+                if response.choices[0].message.refusal:
+                    self.logger.warning(f"Sufficiency analysis refused: {response.choices[0].message.refusal}")
+                    return SufficiencyAnalysis(
+                        sufficient=False,
+                        confidence=0.0,
+                        missing_info='Analysis was refused for safety reasons',
+                        suggested_followup=original_query
+                    )
+
+                return response.choices[0].message.parsed
+
+            # Repeat and near-paraphrase sufficiency prompts are served from
+            # the semantic cache; the copy keeps cached entries immutable
+            # against the safety clauses that adjust the returned analysis
+            analysis = self._sufficiency_cache.get_or_compute(
+                combined_prompt,
+                lambda: self._call_with_backoff(_call_sufficiency, "Sufficiency analysis")
+            )
+            return analysis.model_copy()
+
         except Exception as e:
-            self.logger.error(f"Combined sufficiency analysis failed: {str(e)}")
+            self.logger.error(f"Sufficiency analysis failed: {str(e)}")
             # Default to insufficient if analysis fails
             return SufficiencyAnalysis(
                 sufficient=False,
                 confidence=0.0,
-                missing_info='Unable to analyze combined results sufficiency',
+                missing_info='Unable to analyze results sufficiency',
                 suggested_followup=original_query
             )
-    
+
+    def _call_with_backoff(self, fn, description: str, attempts: int = 3,
+                           base_delay: float = 1.0):
+        """
+        Retry transient OpenAI failures with exponential backoff.
+
+        Args:
+            fn: Zero-argument callable performing the API call
+            description: Label for log messages
+            attempts: Total attempts before the error propagates
+            base_delay: Delay before the first retry, doubled each attempt
+
+        Returns:
+            The callable's return value
+        """
+        for attempt in range(attempts):
+            try:
+                return fn()
+            except (openai.RateLimitError, openai.APIConnectionError,
+                    openai.InternalServerError) as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = base_delay * (2 ** attempt)
+                self.logger.warning(f"{description} hit {e.__class__.__name__}, "
+                                    f"retrying in {delay:.0f}s")
+                time.sleep(delay)
+
     def _create_error_result(self, user_query: str, error_message: str, iterations: List[SearchIteration]) -> SearchResult:
         """
         Create an error result for failed pipeline execution.
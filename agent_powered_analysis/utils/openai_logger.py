@@ -3,8 +3,11 @@ Utility for logging OpenAI API interactions.
 Provides comprehensive logging of requests, responses, and token usage.
 """
 
+import atexit
 import logging
 import json
+import queue
+import threading
 import time
 from functools import wraps
 from typing import Any, Dict, List, Optional, Callable
@@ -12,12 +15,20 @@ from datetime import datetime
 
 
 class OpenAILogger:
-    """Utility class for logging OpenAI API interactions."""
-    
+    """Utility class for logging OpenAI API interactions.
+
+    Records are pushed onto a queue and formatted by a daemon thread, so
+    callers on the LLM hot path never pay the string-formatting or
+    handler-I/O cost themselves.
+    """
+
     def __init__(self, logger_name: str = "openai_api"):
         """Initialize with a specific logger."""
         self.logger = logging.getLogger(logger_name)
-    
+        self._queue: "queue.Queue" = queue.Queue()
+        self._drain_thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
     def log_api_call(
         self,
         method: str,
@@ -30,8 +41,8 @@ class OpenAILogger:
         agent_name: str = "Unknown"
     ) -> None:
         """
-        Log a complete OpenAI API interaction.
-        
+        Queue a complete OpenAI API interaction for background logging.
+
         Args:
             method: API method (e.g., 'chat.completions.parse')
             messages: Request messages
@@ -42,21 +53,55 @@ class OpenAILogger:
             duration_ms: Request duration in milliseconds
             agent_name: Name of the agent making the call
         """
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": agent_name,
-            "method": method,
-            "request": {
-                "model": model,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "messages": messages
-            },
-            "response": self._extract_response_data(response),
-            "duration_ms": duration_ms
-        }
-        
-        # Log as structured JSON for easy parsing
+        # Extract response data eagerly (cheap attribute access) so the
+        # record is self-contained, then hand everything to the drain thread
+        response_data = self._extract_response_data(response)
+        self._ensure_drain_thread()
+        self._queue.put_nowait(
+            (method, messages, model, temperature, max_tokens,
+             response_data, duration_ms, agent_name)
+        )
+
+    def _ensure_drain_thread(self) -> None:
+        """Start the background drain thread on first use."""
+        if self._drain_thread is not None and self._drain_thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._drain_thread is not None and self._drain_thread.is_alive():
+                return
+            self._drain_thread = threading.Thread(target=self._drain, daemon=True)
+            self._drain_thread.start()
+            atexit.register(self.flush)
+
+    def _drain(self) -> None:
+        """Consume queued records and emit them through the logger."""
+        while True:
+            record = self._queue.get()
+            try:
+                self._emit(*record)
+            except Exception as e:
+                self.logger.warning(f"Failed to emit API log record: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait briefly for queued records to be written (used at exit)."""
+        deadline = time.time() + timeout
+        while not self._queue.empty() and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _emit(
+        self,
+        method: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        response_data: Dict[str, Any],
+        duration_ms: float,
+        agent_name: str
+    ) -> None:
+        """Format and write one queued API interaction."""
         self.logger.info("=" * 80)
         self.logger.info(f"OpenAI API Call - {agent_name}")
         self.logger.info("=" * 80)
@@ -68,7 +113,6 @@ class OpenAILogger:
             else:
                 self.logger.info(f"  [{i+1}] {msg['role'].upper()}: {msg['content'][:200]}{'...' if len(msg['content']) > 200 else ''}")
         
-        response_data = self._extract_response_data(response)
         if response_data.get('content'):
             self.logger.info(f"Response Content: {response_data['content']}")
         
@@ -81,8 +125,28 @@ class OpenAILogger:
         self.logger.info(f"Duration: {duration_ms:.2f}ms | Model: {model} | Temp: {temperature}")
         self.logger.info("=" * 80)
         
-        # Also log the full structured data for programmatic access
-        self.logger.debug(f"FULL_API_LOG: {json.dumps(log_entry, indent=2)}")
+        # Also log the full structured data for programmatic access. The
+        # payload is only serialized when DEBUG is actually enabled, and with
+        # compact separators - pretty-printing large message lists on every
+        # API call was a measurable cost at INFO level
+        if self.logger.isEnabledFor(logging.DEBUG):
+            log_entry = {
+                "timestamp": datetime.now().isoformat(),
+                "agent": agent_name,
+                "method": method,
+                "request": {
+                    "model": model,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    "messages": messages
+                },
+                "response": response_data,
+                "duration_ms": duration_ms
+            }
+            self.logger.debug(
+                "FULL_API_LOG: "
+                + json.dumps(log_entry, separators=(',', ':'), default=str)
+            )
     
     def _extract_response_data(self, response: Any) -> Dict[str, Any]:
         """Extract relevant data from OpenAI response object."""
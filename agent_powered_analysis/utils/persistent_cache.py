@@ -0,0 +1,128 @@
+"""
+Disk-backed key-value store for cached LLM results and prompt embeddings.
+Lets warm boots reuse cached values across process restarts instead of
+re-paying the LLM cost after every redeploy.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+class DiskCache:
+    """
+    SQLite-backed KV store keyed by prompt hash.
+
+    Runs in WAL mode with a large mmap so lookups are served from the OS
+    page cache and readers never block the writer. Values are stored as
+    JSON; embeddings as raw float32 bytes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Filesystem path for the SQLite database file
+        """
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA mmap_size=1073741824")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, embedding BLOB, value BLOB, ts REAL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Fetch a cached value.
+
+        Args:
+            key: Cache key (prompt hash)
+
+        Returns:
+            Tuple of (value, wall-clock timestamp) or None if absent
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, ts FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, embedding: Optional[np.ndarray] = None) -> None:
+        """
+        Store a value (and optionally its prompt embedding).
+
+        Non-JSON-serializable values are skipped with a debug log rather
+        than failing the caller - persistence is best-effort.
+
+        Args:
+            key: Cache key (prompt hash)
+            value: JSON-serializable value to persist
+            embedding: Optional float32 embedding of the prompt
+        """
+        try:
+            serialized = json.dumps(value, separators=(',', ':'))
+        except (TypeError, ValueError) as e:
+            self.logger.debug("Skipping non-serializable cache value: %s", str(e))
+            return
+
+        embedding_blob = None
+        if embedding is not None:
+            embedding_blob = np.asarray(embedding, dtype=np.float32).tobytes()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, embedding, value, ts) VALUES (?, ?, ?, ?)",
+                (key, embedding_blob, serialized, time.time())
+            )
+
+    def load_entries(self, max_age_seconds: Optional[float] = None,
+                     limit: Optional[int] = None) -> List[Tuple[str, Optional[np.ndarray], Any]]:
+        """
+        Load persisted entries, newest first, for warming an in-memory cache.
+
+        Args:
+            max_age_seconds: Skip entries older than this (None keeps all)
+            limit: Maximum number of entries to return (None keeps all)
+
+        Returns:
+            List of (key, embedding-or-None, value) tuples
+        """
+        query = "SELECT key, embedding, value, ts FROM cache ORDER BY ts DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        now = time.time()
+        entries = []
+        with self._lock:
+            rows = self._conn.execute(query).fetchall()
+
+        for key, embedding_blob, serialized, ts in rows:
+            if max_age_seconds is not None and now - ts >= max_age_seconds:
+                continue
+            embedding = None
+            if embedding_blob:
+                embedding = np.frombuffer(embedding_blob, dtype=np.float32)
+            try:
+                value = json.loads(serialized)
+            except (TypeError, ValueError):
+                continue
+            entries.append((key, embedding, value))
+
+        return entries
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
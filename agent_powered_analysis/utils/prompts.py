@@ -199,26 +199,43 @@ Query Focus: Find existing authentication patterns, user models, and API structu
 Query: MATCH (c:CLASS)-[:HAS_METHOD]->(m:METHOD) WHERE m.name CONTAINS "auth" OR m.name CONTAINS "login" OR c.name CONTAINS "User" RETURN c.name, c.file_path, c.code, m.name, m.signature, m.code
 """
 
-# Sufficiency Analysis Prompts
-SUFFICIENCY_ANALYSIS_PROMPT = """
-You are analyzing whether search results are sufficient to answer the user's original query.
+TRANSLATOR_AGENT_BATCH_USER_PROMPT = """
+Convert each of the following implementation intents into a Cypher query for codebase analysis.
 
-Original Query: {original_query}
-Current Results: {current_results}
-Iteration: {iteration} of {max_iterations}
+Implementation Intents:
+{numbered_intents}
 
-Analyze the results and provide:
-- sufficient: Whether the current search results fully answer the user's query (true/false)
-- confidence: Your confidence level (0.0-1.0) in this sufficiency determination
-- missing_info: Description of what information is missing if results are insufficient (empty string if sufficient)
-- suggested_followup: Suggested follow-up query to get missing information (empty string if sufficient)
-- reasoning: Brief explanation of why the results are or aren't sufficient (optional)
+Your goal is to gather information from the codebase that will help generate step-by-step implementation guidance.
 
-Guidelines:
-- If results contain relevant information that answers the query, set sufficient=true
-- Use confidence 0.8+ for sufficient results, 0.3-0.7 for uncertain, 0.0-0.3 for clearly insufficient
-- Be specific about missing information to help refine the next query
-- Empty strings for missing_info and suggested_followup when sufficient=true
+Provide one translation per intent, aligned by its zero-based index:
+- index: The index of the intent this query implements
+- cypher_query: The Cypher query that gathers relevant codebase information
+- confidence: Your confidence level (0.0-1.0) in the query effectiveness
+- explanation: Brief explanation of the query logic
+
+Each query must independently follow the graph schema and Cypher syntax rules above.
+"""
+
+# Sufficiency Analysis Prompts
+# Static system prefix, kept byte-for-byte identical across calls so the
+# provider's automatic prompt-prefix caching can hash-match it
+SUFFICIENCY_ANALYSIS_SYSTEM_PROMPT = """
+Judge whether the results given by the user are sufficient to answer the query.
+
+Provide:
+- sufficient: results fully answer the query (true/false)
+- confidence: 0.8+ sufficient, 0.3-0.7 uncertain, 0.0-0.3 clearly insufficient
+- missing_info: what is missing ("" if sufficient)
+- suggested_followup: follow-up query for the missing information ("" if sufficient)
+- refined_query: more specific natural-language rewrite of the query ("" if sufficient)
+- reasoning: brief justification (optional)
+"""
+
+# Small dynamic suffix holding only the per-call values
+SUFFICIENCY_ANALYSIS_USER_PROMPT = """
+Query: {original_query}
+Results: {current_results}
+Iteration: {iteration} of {max_iterations}
 """
 
 # Implementation Guide Formatting Prompts
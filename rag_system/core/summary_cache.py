@@ -0,0 +1,93 @@
+"""Persistent content-addressed cache for generated summaries."""
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """SQLite-backed cache for insight dictionaries.
+
+    Keys are content-addressed (query plus the retrieved documents'
+    hashes), so a hit means the exact same summarization was produced
+    before - the LLM call can be skipped entirely, and entries stay
+    valid across process restarts and even reindexing of unchanged
+    content. Least-recently-used entries are evicted past the cap.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 10000):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_entries: Maximum number of cached summaries
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, ts INTEGER, payload TEXT)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open summary cache at {db_path}: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached insights for key, or None on a miss."""
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT payload FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            # Touch the entry so LRU eviction sees it as recently used
+            self._conn.execute(
+                "UPDATE summaries SET ts = ? WHERE key = ?", (int(time.time()), key)
+            )
+            self._conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Summary cache read failed: {e}")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store insights under key, evicting the oldest entries if full."""
+        if self._conn is None:
+            return
+        try:
+            payload = json.dumps(value, separators=(',', ':'), default=str)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, ts, payload) VALUES (?, ?, ?)",
+                (key, int(time.time()), payload)
+            )
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                "SELECT key FROM summaries ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every cached summary."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute("DELETE FROM summaries")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache clear failed: {e}")
@@ -1,8 +1,20 @@
 """Vector store for code repository using InMemoryVectorStore with cache."""
 
+import ast
+import asyncio
+import hashlib
+import mmap
 import os
 import json
 import pickle
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import openai
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from langchain_core.documents import Document
@@ -17,21 +29,245 @@ from langchain_text_splitters import (
 from ..config.llms import EMBEDDINGS
 import logging
 
+# Optional ANN acceleration for large corpora; the exact NumPy scan is
+# always available as the fallback
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# File extension to language mapping for semantic chunking (module level so
+# worker processes can use it without pickling the store)
+EXTENSION_TO_LANGUAGE = {
+    '.py': Language.PYTHON,
+    '.js': Language.JS,
+    '.jsx': Language.JS,
+    '.ts': Language.TS,
+    '.tsx': Language.TS,
+    '.java': Language.JAVA,
+    '.cpp': Language.CPP,
+    '.c': Language.C,
+    '.cc': Language.CPP,
+    '.cxx': Language.CPP,
+    '.go': Language.GO,
+    '.rs': Language.RUST,
+    '.rb': Language.RUBY,
+    '.php': Language.PHP,
+    '.swift': Language.SWIFT,
+    '.kt': Language.KOTLIN,
+    '.scala': Language.SCALA,
+    '.cs': Language.CSHARP,
+    '.lua': Language.LUA,
+    '.pl': Language.PERL,
+    '.hs': Language.HASKELL,
+    '.ex': Language.ELIXIR,
+    '.exs': Language.ELIXIR,
+    '.md': Language.MARKDOWN,
+    '.markdown': Language.MARKDOWN,
+    '.tex': Language.LATEX,
+    '.html': Language.HTML,
+    '.htm': Language.HTML,
+    '.sol': Language.SOL,
+    '.ps1': Language.POWERSHELL,
+    '.vb': Language.VISUALBASIC6,
+    '.cob': Language.COBOL,
+}
+
+# One splitter per language, built lazily in each process; 'default' keys
+# the fallback splitter. Splitter constructors compile separator lists, so
+# instances are shared across all documents a process chunks
+_SPLITTER_CACHE: Dict[Any, Any] = {}
+
+# Below this many documents the process-pool spawn cost outweighs the win
+_PARALLEL_CHUNK_MIN_DOCS = 32
+
+# Below this many chunks the exact scan is already fast enough that HNSW
+# build time and approximation are not worth it
+_ANN_MIN_CHUNKS = 10_000
+
+
+@lru_cache(maxsize=1024)
+def _embed_query_cached(query: str) -> tuple:
+    """Embed a query, serving repeats from an in-process LRU.
+
+    CacheBackedEmbeddings only caches document embeddings, so repeated
+    exploratory queries would otherwise pay the network round trip every
+    time. Returned as a tuple to stay hashable and immutable in the cache.
+    """
+    return tuple(EMBEDDINGS.embed_query(query))
+
+
+def _get_splitter(language: Optional[Language]):
+    """Return the per-process splitter for a language ('default' if None)."""
+    key = language if language is not None else 'default'
+    splitter = _SPLITTER_CACHE.get(key)
+    if splitter is not None:
+        return splitter
+
+    if language is None:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1500,
+            chunk_overlap=150,
+            length_function=len,
+        )
+    elif language == Language.PYTHON:
+        splitter = PythonCodeTextSplitter(
+            chunk_size=1500,
+            chunk_overlap=150,
+            length_function=len,
+        )
+    elif language == Language.MARKDOWN:
+        splitter = MarkdownTextSplitter(
+            chunk_size=1500,
+            chunk_overlap=150,
+            length_function=len,
+        )
+    elif language == Language.LATEX:
+        splitter = LatexTextSplitter(
+            chunk_size=1500,
+            chunk_overlap=150,
+            length_function=len,
+        )
+    else:
+        # Use RecursiveCharacterTextSplitter with language-specific separators
+        splitter = RecursiveCharacterTextSplitter.from_language(
+            language=language,
+            chunk_size=1500,
+            chunk_overlap=150,
+            length_function=len,
+        )
+
+    _SPLITTER_CACHE[key] = splitter
+    return splitter
+
+
+def _split_python_by_ast(code: str, chunk_size: int = 1500) -> List[str]:
+    """Split Python source at real top-level statement boundaries.
+
+    One ast.parse gives exact function/class extents (including
+    decorators), so chunks never cut through a definition the way the
+    splitter's separator strings can. Small neighbouring statements are
+    merged into chunk_size buckets; a single oversized definition is
+    re-split with the default splitter so it stays embeddable.
+
+    Args:
+        code: Python source text
+        chunk_size: Target maximum characters per chunk
+
+    Returns:
+        List of chunk texts covering the whole source
+
+    Raises:
+        SyntaxError: If the source does not parse (caller falls back)
+    """
+    tree = ast.parse(code)
+    if not tree.body:
+        return [code] if code.strip() else []
+
+    lines = code.splitlines(keepends=True)
+    segments = []
+    prev_end = 0
+    for node in tree.body:
+        # Span from the previous node's end so comments, blank lines, and
+        # decorators between definitions are kept with the following one
+        segment = ''.join(lines[prev_end:node.end_lineno])
+        prev_end = node.end_lineno
+        if segment:
+            segments.append(segment)
+    trailing = ''.join(lines[prev_end:])
+    if trailing.strip():
+        segments.append(trailing)
+
+    chunks = []
+    bucket, bucket_len = [], 0
+    for segment in segments:
+        if bucket and bucket_len + len(segment) > chunk_size:
+            chunks.append(''.join(bucket))
+            bucket, bucket_len = [], 0
+        if len(segment) > chunk_size:
+            chunks.extend(_get_splitter(None).split_text(segment))
+            continue
+        bucket.append(segment)
+        bucket_len += len(segment)
+    if bucket:
+        chunks.append(''.join(bucket))
+    return chunks
+
+
+def _chunk_one(doc: Document) -> List[Document]:
+    """Chunk a single document (module level so worker processes can run it).
+
+    Args:
+        doc: Document to split
+
+    Returns:
+        List of chunk documents with chunking metadata attached
+    """
+    filename = doc.metadata.get('filename', '')
+    file_ext = os.path.splitext(filename)[1].lower()
+
+    language = EXTENSION_TO_LANGUAGE.get(file_ext)
+    if language is not None:
+        texts = None
+        chunking_strategy = 'semantic'
+        if language == Language.PYTHON:
+            # A real parse beats separator strings: one linear ast.parse
+            # and chunks land exactly on definition boundaries
+            try:
+                texts = _split_python_by_ast(doc.page_content)
+                chunking_strategy = 'ast'
+                logger.debug(f"Used AST chunking for {filename}")
+            except SyntaxError as e:
+                logger.debug(f"AST chunking failed for {filename}: {e}, "
+                             f"falling back to splitter")
+        if texts is None:
+            try:
+                texts = _get_splitter(language).split_text(doc.page_content)
+                logger.debug(f"Used {language.value} semantic chunking for {filename}")
+            except Exception as e:
+                logger.warning(f"Failed to use semantic chunking for {filename}: {e}, falling back to default")
+                texts = _get_splitter(None).split_text(doc.page_content)
+        detected_language = language.value
+    else:
+        # Use default text splitter for unknown file types
+        texts = _get_splitter(None).split_text(doc.page_content)
+        logger.debug(f"Used default chunking for {filename}")
+        chunking_strategy = 'default'
+        detected_language = 'unknown'
+
+    chunks = []
+    for text in texts:
+        chunk_metadata = dict(doc.metadata)
+        # File-level dedup hashes must not leak onto chunks, or every
+        # chunk of a file would alias the same hash; chunks are re-hashed
+        # individually at ingest
+        chunk_metadata.pop('content_hash', None)
+        chunk_metadata.pop('duplicate_of', None)
+        chunk_metadata['chunking_strategy'] = chunking_strategy
+        chunk_metadata['detected_language'] = detected_language
+        chunks.append(Document(page_content=text, metadata=chunk_metadata))
+    return chunks
+
+
 class CodeVectorStore:
     """Vector store for code embeddings using cached InMemoryVectorStore."""
     
-    def __init__(self, cache_directory: str = "./cache"):
+    def __init__(self, cache_directory: str = "./cache", quantize_embeddings: bool = False):
         """Initialize vector store.
-        
+
         Args:
             cache_directory: Directory to store cache files
+            quantize_embeddings: Hold the search matrix as int8 with
+                                 per-row scales (4x less RAM, slightly
+                                 approximate scores) instead of float32
         """
         self.cache_directory = cache_directory
+        self.quantize_embeddings = quantize_embeddings
         self.vector_store = InMemoryVectorStore(embedding=EMBEDDINGS)
         
         # Create cache directory if it doesn't exist
@@ -40,141 +276,174 @@ class CodeVectorStore:
         # Cache files
         self.documents_cache_file = os.path.join(cache_directory, "repo_documents.pkl")
         self.metadata_file = os.path.join(cache_directory, "repo_metadata.json")
+
+        # Array-based cache: embeddings as an mmap-able .npy, texts as one
+        # blob with offsets, per-document metadata as JSON. Loading rebuilds
+        # the store without re-embedding anything
+        self.embeddings_cache_file = os.path.join(cache_directory, "repo_embeddings.npy")
+        self.texts_cache_file = os.path.join(cache_directory, "repo_texts.bin")
+        self.doc_meta_cache_file = os.path.join(cache_directory, "repo_doc_meta.json")
         
         # Default text splitter for general files
-        self.default_text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1500,
-            chunk_overlap=150,
-            length_function=len,
-        )
-        
+        self.default_text_splitter = _get_splitter(None)
+
         # File extension to language mapping for semantic chunking
-        self.extension_to_language = {
-            '.py': Language.PYTHON,
-            '.js': Language.JS,
-            '.jsx': Language.JS,
-            '.ts': Language.TS,
-            '.tsx': Language.TS,
-            '.java': Language.JAVA,
-            '.cpp': Language.CPP,
-            '.c': Language.C,
-            '.cc': Language.CPP,
-            '.cxx': Language.CPP,
-            '.go': Language.GO,
-            '.rs': Language.RUST,
-            '.rb': Language.RUBY,
-            '.php': Language.PHP,
-            '.swift': Language.SWIFT,
-            '.kt': Language.KOTLIN,
-            '.scala': Language.SCALA,
-            '.cs': Language.CSHARP,
-            '.lua': Language.LUA,
-            '.pl': Language.PERL,
-            '.hs': Language.HASKELL,
-            '.ex': Language.ELIXIR,
-            '.exs': Language.ELIXIR,
-            '.md': Language.MARKDOWN,
-            '.markdown': Language.MARKDOWN,
-            '.tex': Language.LATEX,
-            '.html': Language.HTML,
-            '.htm': Language.HTML,
-            '.sol': Language.SOL,
-            '.ps1': Language.POWERSHELL,
-            '.vb': Language.VISUALBASIC6,
-            '.cob': Language.COBOL,
-        }
+        self.extension_to_language = EXTENSION_TO_LANGUAGE
         
+        # Row-normalized embedding matrix and aligned store entries, built
+        # lazily from the InMemoryVectorStore so filtered searches run as a
+        # masked matrix-vector product instead of rebuilding temp stores
+        self._emb_matrix: Optional[np.ndarray] = None
+        self._matrix_entries: List[Dict[str, Any]] = []
+        self._meta_arrays: Dict[str, np.ndarray] = {}
+        self._matrix_store_size = -1
+
+        # Row-index buckets per filter combination, built on first use so
+        # repeated filtered searches scan only the matching rows
+        self._filter_row_cache: Dict[tuple, np.ndarray] = {}
+
+        # int8-quantized matrix plus per-row scales, used instead of the
+        # float32 matrix when quantize_embeddings is set
+        self._emb_matrix_int8: Optional[np.ndarray] = None
+        self._emb_row_scale: Optional[np.ndarray] = None
+
+        # HNSW index over the matrix, built when faiss is installed and the
+        # corpus is large enough that the exact scan becomes the bottleneck
+        self._ann_index = None
+
+        # Columnar view of cached-document metadata (dict of object arrays)
+        # so stats and scans run as vectorized column operations instead of
+        # per-document attribute lookups
+        self._meta_cols: Dict[str, np.ndarray] = {}
+        self._meta_cols_size = -1
+
+        # Memoized stats (unique languages/directories/file types), valid
+        # until the document count changes; downstream suggestion builders
+        # read these instead of re-running np.unique per call
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_size = -1
+
         # Load existing cache
         self.cached_documents = []
         self._load_cache()
     
-    def _get_semantic_chunks(self, documents: List[Document]) -> List[Document]:
-        """Split documents using semantic chunking based on file type and content structure."""
-        chunks = []
-        
+    def _iter_chunks(self, documents: List[Document]):
+        """Yield chunks lazily instead of materializing them all.
+
+        Consumers pull chunks as they batch and embed, so peak memory is
+        one in-flight group of batches rather than every chunk in the
+        repository. Large document sets still chunk in worker processes -
+        executor.map is consumed lazily, overlapping chunking of later
+        documents with embedding of earlier ones.
+
+        Args:
+            documents: Documents to split
+
+        Yields:
+            Chunk documents with chunking metadata attached
+        """
+        if len(documents) >= _PARALLEL_CHUNK_MIN_DOCS:
+            produced = False
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    for chunk_list in executor.map(_chunk_one, documents, chunksize=16):
+                        produced = True
+                        yield from chunk_list
+                return
+            except Exception as e:
+                if produced:
+                    # Some chunks were already consumed downstream;
+                    # restarting would duplicate them
+                    raise
+                logger.warning(f"Parallel chunking failed, chunking serially: {e}")
+
         for doc in documents:
-            filename = doc.metadata.get('filename', '')
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            # Select appropriate text splitter based on file extension
-            if file_ext in self.extension_to_language:
-                language = self.extension_to_language[file_ext]
-                
-                try:
-                    if language == Language.PYTHON:
-                        splitter = PythonCodeTextSplitter(
-                            chunk_size=1500,
-                            chunk_overlap=150,
-                            length_function=len,
-                        )
-                    elif language == Language.MARKDOWN:
-                        splitter = MarkdownTextSplitter(
-                            chunk_size=1500,
-                            chunk_overlap=150,
-                            length_function=len,
-                        )
-                    elif language == Language.LATEX:
-                        splitter = LatexTextSplitter(
-                            chunk_size=1500,
-                            chunk_overlap=150,
-                            length_function=len,
-                        )
-                    else:
-                        # Use RecursiveCharacterTextSplitter with language-specific separators
-                        splitter = RecursiveCharacterTextSplitter.from_language(
-                            language=language,
-                            chunk_size=1500,
-                            chunk_overlap=150,
-                            length_function=len,
-                        )
-                    
-                    doc_chunks = splitter.split_documents([doc])
-                    logger.debug(f"Used {language.value} semantic chunking for {filename}")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to use semantic chunking for {filename}: {e}, falling back to default")
-                    doc_chunks = self.default_text_splitter.split_documents([doc])
-            else:
-                # Use default text splitter for unknown file types
-                doc_chunks = self.default_text_splitter.split_documents([doc])
-                logger.debug(f"Used default chunking for {filename}")
-            
-            # Add semantic metadata to chunks
-            for chunk in doc_chunks:
-                if file_ext in self.extension_to_language:
-                    chunk.metadata['chunking_strategy'] = 'semantic'
-                    chunk.metadata['detected_language'] = self.extension_to_language[file_ext].value
-                else:
-                    chunk.metadata['chunking_strategy'] = 'default'
-                    chunk.metadata['detected_language'] = 'unknown'
-            
-            chunks.extend(doc_chunks)
-        
-        return chunks
-        
+            yield from _chunk_one(doc)
+
+
     def _load_cache(self):
-        """Load cached documents if they exist."""
+        """Load cached documents if they exist.
+
+        Prefers the array-based cache, which restores vectors straight into
+        the store (embeddings stay mmap-backed, texts come from one blob)
+        with no embedding calls; falls back to the legacy pickle cache.
+        """
         try:
+            if self._load_array_cache():
+                return
+
             if os.path.exists(self.documents_cache_file):
                 with open(self.documents_cache_file, 'rb') as f:
                     self.cached_documents = pickle.load(f)
-                
+
                 # Add cached documents to vector store
                 if self.cached_documents:
                     self.vector_store.add_documents(self.cached_documents)
                     logger.info(f"Loaded {len(self.cached_documents)} cached documents")
-                    
+
         except Exception as e:
             logger.warning(f"Error loading cache: {e}")
             self.cached_documents = []
-            
+
+    def _load_array_cache(self) -> bool:
+        """Restore the store from the array-based cache files.
+
+        Returns:
+            True if the cache was present and loaded
+        """
+        if not (os.path.exists(self.embeddings_cache_file) and
+                os.path.exists(self.texts_cache_file) and
+                os.path.exists(self.doc_meta_cache_file)):
+            return False
+
+        try:
+            # mmap keeps the embedding matrix out of heap memory; rows are
+            # materialized lazily as searches touch them
+            embeddings = np.load(self.embeddings_cache_file, mmap_mode='r')
+            # mmap the content blob too: texts are sliced out of the page
+            # cache on demand instead of the whole blob being copied onto
+            # the heap up front
+            with open(self.texts_cache_file, 'rb') as f:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self.doc_meta_cache_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+
+            ids = payload['ids']
+            metadatas = payload['metadata']
+            offsets = payload['offsets']
+            if not (len(ids) == len(metadatas) == len(offsets) - 1 == len(embeddings)):
+                logger.warning("Array cache files are inconsistent, ignoring them")
+                return False
+
+            for i, (doc_id, metadata) in enumerate(zip(ids, metadatas)):
+                text = blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+                self.vector_store.store[doc_id] = {
+                    'id': doc_id,
+                    'vector': embeddings[i],
+                    'text': text,
+                    'metadata': metadata,
+                }
+                self.cached_documents.append(Document(page_content=text, metadata=metadata))
+
+            logger.info(f"Loaded {len(ids)} cached documents from array cache")
+            return True
+        except Exception as e:
+            logger.warning(f"Error loading array cache: {e}")
+            self.cached_documents = []
+            return False
+
     def _save_cache(self, all_documents: List[Document], repo_path: str = None):
-        """Save documents to cache."""
+        """Save documents to cache.
+
+        Writes the array-based cache (embeddings .npy, text blob with
+        offsets, metadata JSON) from the store; falls back to pickling the
+        Document list if the store's vectors are unavailable.
+        """
         try:
-            # Save documents
-            with open(self.documents_cache_file, 'wb') as f:
-                pickle.dump(all_documents, f)
-                
+            if not self._save_array_cache():
+                with open(self.documents_cache_file, 'wb') as f:
+                    pickle.dump(all_documents, f)
+
             # Save metadata
             metadata = {
                 'repository_path': repo_path,
@@ -182,176 +451,886 @@ class CodeVectorStore:
                 'last_indexed': datetime.now().isoformat(),
                 'cache_directory': self.cache_directory
             }
-            
+
             with open(self.metadata_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
-                
+
             logger.info(f"Cached {len(all_documents)} documents")
-            
+
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
+
+    def _save_array_cache(self) -> bool:
+        """Write the store's vectors, texts and metadata as array files.
+
+        Returns:
+            True if the array cache was written
+        """
+        try:
+            store = getattr(self.vector_store, 'store', None)
+            if not store:
+                return False
+
+            entries = [entry for entry in store.values() if entry.get('vector') is not None]
+            if not entries:
+                return False
+
+            vectors = np.asarray([entry['vector'] for entry in entries], dtype=np.float32)
+
+            offsets = [0]
+            encoded_texts = []
+            for entry in entries:
+                encoded = entry['text'].encode('utf-8')
+                encoded_texts.append(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+
+            np.save(self.embeddings_cache_file, vectors)
+            with open(self.texts_cache_file, 'wb') as f:
+                f.write(b''.join(encoded_texts))
+            with open(self.doc_meta_cache_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'ids': [entry['id'] for entry in entries],
+                    'metadata': [entry.get('metadata') or {} for entry in entries],
+                    'offsets': offsets,
+                }, f, separators=(',', ':'))
+            return True
+        except Exception as e:
+            logger.warning(f"Could not write array cache, falling back to pickle: {e}")
+            return False
             
-    def add_documents(self, documents: List[Document], repo_path: str = None) -> List[str]:
-        """Add documents to the vector store in batches.
-        
+    def add_documents(self, documents: List[Document], repo_path: str = None,
+                      use_batch_api: bool = False) -> List[str]:
+        """Add documents to the vector store with bulk embedding calls.
+
+        Chunks are embedded in provider-maximal super-batches via a single
+        embed_documents call each and the resulting vectors are written
+        straight into the store, instead of paying one embeddings request
+        per small add_documents group. With use_batch_api, embeddings go
+        through OpenAI's /v1/batches endpoint instead - half the price and
+        far higher rate-limit headroom, at the cost of indexing latency.
+
         Args:
             documents: List of Document objects to add
             repo_path: Path to the repository (for metadata)
-            
+            use_batch_api: Route embeddings through the Batch API (offline
+                           indexing only; can take minutes to hours)
+
         Returns:
             List of document IDs
         """
         if not documents:
             logger.warning("No documents provided to add")
             return []
-            
+
         logger.info(f"Adding {len(documents)} documents to vector store...")
-        
+
         try:
-            # Split all documents into chunks using semantic chunking
-            all_chunks = []
-            for i, doc in enumerate(documents, 1):
-                chunks = self._get_semantic_chunks([doc])
-                filename = doc.metadata.get('filename', f'doc_{i}')
-                logger.info(f"Prepared file {i}/{len(documents)}: {filename} ({len(chunks)} chunks)")
-                all_chunks.extend(chunks)
-                
-            logger.info(f"Created {len(all_chunks)} total chunks, processing in batches of 100...")
-            
-            # Process in smaller batches to stay under OpenAI's 300K token limit
-            # With 2000 char chunks, 50 chunks ≈ 100K chars ≈ 75K tokens (safe margin)
-            batch_size = 200
             all_ids = []
             successful_chunks = []
-            
-            for i in range(0, len(all_chunks), batch_size):
-                batch = all_chunks[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(all_chunks) + batch_size - 1) // batch_size
-                
-                logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} chunks)")
-                
+            duplicate_chunks = []
+            seen = self._seed_seen_hashes()
+            total_chunks = 0
+            dedup_done = False
+
+            if use_batch_api:
+                # The Batch API needs every input up front, so this path
+                # materializes the chunks; it is offline indexing anyway
+                all_chunks = list(self._iter_chunks(documents))
+                total_chunks = len(all_chunks)
+                unique_chunks, duplicate_chunks = self._split_duplicate_chunks(all_chunks, seen)
                 try:
-                    # Calculate approximate token count for the batch
-                    total_chars = sum(len(chunk.page_content) for chunk in batch)
-                    estimated_tokens = int(total_chars * 0.75)  # Rough estimate: 0.75 tokens per char
-                    
-                    if estimated_tokens > 250000:  # Conservative limit (250K tokens)
-                        logger.warning(f"Batch {batch_num} estimated tokens ({estimated_tokens}) too high, processing individually")
-                        # Process chunks individually if batch is too large
-                        for chunk in batch:
-                            try:
-                                chunk_ids = self.vector_store.add_documents([chunk])
-                                all_ids.extend(chunk_ids)
-                                successful_chunks.append(chunk)
-                            except Exception as chunk_error:
-                                filename = chunk.metadata.get('filename', 'unknown')
-                                logger.warning(f"Failed to add chunk from {filename}: {chunk_error}")
-                                continue
-                    else:
-                        # Add batch to vector store
-                        batch_ids = self.vector_store.add_documents(batch)
-                        all_ids.extend(batch_ids)
-                        successful_chunks.extend(batch)
-                        logger.info(f"Successfully processed batch {batch_num} ({estimated_tokens} estimated tokens)")
+                    embeddings = self._embed_via_batch_api(
+                        [chunk.page_content for chunk in unique_chunks]
+                    )
+                    all_ids.extend(self._bulk_insert(unique_chunks, embeddings))
+                    successful_chunks.extend(unique_chunks)
+                    unique_chunks = []
                 except Exception as e:
-                    logger.warning(f"Failed to process batch {batch_num}: {e}")
-                    # Try adding chunks one by one in this batch
-                    for j, chunk in enumerate(batch):
+                    logger.warning(f"Batch API embedding failed, falling back to "
+                                   f"synchronous embedding: {e}")
+                chunk_iter = iter(unique_chunks)
+                dedup_done = True
+            else:
+                chunk_iter = self._iter_chunks(documents)
+
+            # Super-batches are pulled lazily from the chunk generator and
+            # embedded in concurrent groups: wall time tracks the slowest
+            # batch in a group while peak memory stays at one group of
+            # chunks instead of the whole repository's
+            def _flush_group(group: List[List[Document]]):
+                batch_embeddings = asyncio.run(self._embed_batches_concurrently(group))
+                for batch, embeddings in zip(group, batch_embeddings):
+                    if embeddings is not None:
+                        all_ids.extend(self._bulk_insert(batch, embeddings))
+                        successful_chunks.extend(batch)
+                        continue
+                    # Try embedding chunks one by one in this batch
+                    for chunk in batch:
                         try:
-                            chunk_ids = self.vector_store.add_documents([chunk])
-                            all_ids.extend(chunk_ids)
+                            embedding = EMBEDDINGS.embed_documents([chunk.page_content])[0]
+                            all_ids.extend(self._bulk_insert([chunk], [embedding]))
                             successful_chunks.append(chunk)
                         except Exception as chunk_error:
                             filename = chunk.metadata.get('filename', 'unknown')
                             logger.warning(f"Failed to add chunk from {filename}: {chunk_error}")
-                            continue
-                            
+
+            pending_group = []
+            batch_count = 0
+            for raw_batch in self._batched_by_tokens(chunk_iter):
+                batch_count += 1
+                if dedup_done:
+                    unique_batch = raw_batch
+                else:
+                    total_chunks += len(raw_batch)
+                    # Exact duplicates share the first occurrence's vector
+                    unique_batch, batch_duplicates = self._split_duplicate_chunks(
+                        raw_batch, seen
+                    )
+                    duplicate_chunks.extend(batch_duplicates)
+                if unique_batch:
+                    pending_group.append(unique_batch)
+                if len(pending_group) >= 8:
+                    _flush_group(pending_group)
+                    pending_group = []
+            if pending_group:
+                _flush_group(pending_group)
+
+            if duplicate_chunks:
+                dup_ids, dup_chunks, leftovers = self._replicate_duplicate_embeddings(
+                    duplicate_chunks
+                )
+                all_ids.extend(dup_ids)
+                successful_chunks.extend(dup_chunks)
+                for chunk in leftovers:
+                    try:
+                        embedding = EMBEDDINGS.embed_documents([chunk.page_content])[0]
+                        all_ids.extend(self._bulk_insert([chunk], [embedding]))
+                        successful_chunks.append(chunk)
+                    except Exception as chunk_error:
+                        filename = chunk.metadata.get('filename', 'unknown')
+                        logger.warning(f"Failed to add chunk from {filename}: {chunk_error}")
+
             # Update cached documents
             self.cached_documents.extend(successful_chunks)
-            
+
             # Save to cache
             self._save_cache(self.cached_documents, repo_path)
-            
-            total_batches = (len(all_chunks) + batch_size - 1) // batch_size
-            logger.info(f"Successfully added {len(successful_chunks)}/{len(all_chunks)} chunks in {total_batches} batches")
+
+            logger.info(f"Successfully added {len(successful_chunks)}/{total_chunks} chunks "
+                        f"in {batch_count} embedding calls")
             return all_ids
-            
+
         except Exception as e:
             logger.error(f"Error adding documents to vector store: {e}")
             raise
+
+    @staticmethod
+    def _batched_by_tokens(chunks: List[Document], max_tokens: int = 250_000,
+                           max_items: int = 2048):
+        """Yield chunk batches sized to provider embedding limits.
+
+        OpenAI accepts up to 2048 inputs and ~300K tokens per embeddings
+        request; batches are cut just under both using the rough 0.75
+        tokens-per-char estimate.
+
+        Args:
+            chunks: Chunks to batch
+            max_tokens: Estimated token budget per batch
+            max_items: Maximum inputs per batch
+
+        Yields:
+            Lists of chunks, each within the request limits
+        """
+        batch, batch_tokens = [], 0
+        for chunk in chunks:
+            estimated = int(len(chunk.page_content) * 0.75)
+            if batch and (len(batch) >= max_items or batch_tokens + estimated > max_tokens):
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(chunk)
+            batch_tokens += estimated
+        if batch:
+            yield batch
+
+    async def _embed_batches_concurrently(self, batches: List[List[Document]],
+                                          max_concurrency: int = 8):
+        """Embed super-batches concurrently under a semaphore.
+
+        Args:
+            batches: Chunk batches from _batched_by_tokens
+            max_concurrency: Maximum in-flight embeddings requests
+
+        Returns:
+            Per-batch embedding lists aligned with batches; None marks a
+            batch that failed and should fall back to per-chunk embedding
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _embed(batch_num: int, batch: List[Document]):
+            async with semaphore:
+                try:
+                    embeddings = await EMBEDDINGS.aembed_documents(
+                        [chunk.page_content for chunk in batch]
+                    )
+                    logger.info(f"Embedded batch {batch_num}/{len(batches)} ({len(batch)} chunks)")
+                    return embeddings
+                except Exception as e:
+                    logger.warning(f"Failed to embed batch {batch_num}: {e}")
+                    return None
+
+        return await asyncio.gather(
+            *(_embed(batch_num, batch) for batch_num, batch in enumerate(batches, 1))
+        )
+
+    def _bulk_insert(self, chunks: List[Document], embeddings: List[List[float]]) -> List[str]:
+        """Write pre-embedded chunks straight into the InMemoryVectorStore.
+
+        Args:
+            chunks: Chunks to insert
+            embeddings: Embedding vectors aligned with chunks
+
+        Returns:
+            List of generated document IDs
+        """
+        ids = []
+        for chunk, embedding in zip(chunks, embeddings):
+            doc_id = str(uuid.uuid4())
+            self.vector_store.store[doc_id] = {
+                'id': doc_id,
+                'vector': embedding,
+                'text': chunk.page_content,
+                'metadata': chunk.metadata,
+            }
+            ids.append(doc_id)
+        return ids
+
+    def _embed_via_batch_api(self, texts: List[str], poll_interval: float = 5.0,
+                             timeout_s: float = 24 * 3600.0) -> List[List[float]]:
+        """Embed texts through OpenAI's Batch API (50% of synchronous cost).
+
+        Uploads one JSONL request per text, waits for the batch to finish
+        with exponential backoff on the poll interval, and returns the
+        embeddings aligned with the input order.
+
+        Args:
+            texts: Texts to embed
+            poll_interval: Initial seconds between status polls
+            timeout_s: Give up waiting after this many seconds
+
+        Returns:
+            Embedding vectors aligned with texts
+
+        Raises:
+            RuntimeError: If the batch fails, expires, times out, or any
+                          text comes back without an embedding
+        """
+        if not texts:
+            return []
+
+        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False,
+                                         encoding='utf-8') as f:
+            input_path = f.name
+            for i, text in enumerate(texts):
+                f.write(json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {"model": "text-embedding-3-large", "input": text}
+                }, separators=(',', ':')) + '\n')
+
+        try:
+            with open(input_path, 'rb') as f:
+                upload = client.files.create(file=f, purpose="batch")
+            batch = client.batches.create(
+                endpoint="/v1/embeddings",
+                input_file_id=upload.id,
+                completion_window="24h"
+            )
+            logger.info(f"Submitted embedding batch {batch.id} with {len(texts)} inputs")
+
+            deadline = time.time() + timeout_s
+            interval = poll_interval
+            while True:
+                batch = client.batches.retrieve(batch.id)
+                if batch.status == "completed":
+                    break
+                if batch.status in ("failed", "expired", "cancelled"):
+                    raise RuntimeError(f"Embedding batch {batch.id} ended as {batch.status}")
+                if time.time() > deadline:
+                    raise RuntimeError(f"Embedding batch {batch.id} timed out")
+                time.sleep(interval)
+                interval = min(interval * 2, 60.0)
+
+            output = client.files.content(batch.output_file_id).text
+            embeddings_by_id = {}
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                body = (entry.get('response') or {}).get('body') or {}
+                data = body.get('data') or []
+                if data:
+                    embeddings_by_id[entry['custom_id']] = data[0]['embedding']
+
+            missing = [i for i in range(len(texts)) if str(i) not in embeddings_by_id]
+            if missing:
+                raise RuntimeError(f"Embedding batch {batch.id} returned no embedding "
+                                   f"for {len(missing)} inputs")
+            return [embeddings_by_id[str(i)] for i in range(len(texts))]
+        finally:
+            try:
+                os.remove(input_path)
+            except OSError:
+                pass
             
-    def similarity_search(self, query: str, k: int = 5, filter_dict: Dict[str, Any] = None) -> List[Document]:
+    def add_documents_async(self, documents: List[Document], repo_path: str = None,
+                            batch_size: int = 256, concurrency: int = 16) -> List[str]:
+        """Add documents using concurrent batched embedding calls.
+
+        Chunks are embedded in large batches dispatched concurrently with
+        asyncio.gather, saturating provider throughput instead of paying
+        one round-trip per small group. Embeddings still go through the
+        cache-backed store, so already-embedded chunks are never re-sent.
+
+        Args:
+            documents: List of Document objects to add
+            repo_path: Path to the repository (for metadata)
+            batch_size: Number of chunks per embedding request
+            concurrency: Maximum number of in-flight embedding requests
+
+        Returns:
+            List of document IDs
+        """
+        if not documents:
+            logger.warning("No documents provided to add")
+            return []
+
+        logger.info(f"Adding {len(documents)} documents to vector store (async batches)...")
+
+        try:
+            all_chunks = list(self._iter_chunks(documents))
+            logger.info(f"Created {len(all_chunks)} total chunks, "
+                        f"embedding in batches of {batch_size}...")
+
+            # Collapse exact duplicates (license headers, boilerplate) to a
+            # single embedding call; their vectors are replicated afterwards
+            unique_chunks, duplicate_chunks = self._split_duplicate_chunks(all_chunks)
+            if duplicate_chunks:
+                logger.info(f"Collapsed {len(duplicate_chunks)} duplicate chunks - "
+                            f"embedding {len(unique_chunks)} unique chunks")
+
+            all_ids, successful_chunks = asyncio.run(
+                self._add_chunks_batched(unique_chunks, batch_size, concurrency)
+            )
+
+            if duplicate_chunks:
+                dup_ids, dup_chunks, leftovers = self._replicate_duplicate_embeddings(
+                    duplicate_chunks
+                )
+                all_ids.extend(dup_ids)
+                successful_chunks.extend(dup_chunks)
+                if leftovers:
+                    # Representatives that failed to embed leave their
+                    # duplicates without a vector to copy - embed those
+                    extra_ids, extra_chunks = asyncio.run(
+                        self._add_chunks_batched(leftovers, batch_size, concurrency)
+                    )
+                    all_ids.extend(extra_ids)
+                    successful_chunks.extend(extra_chunks)
+
+            # Update cached documents
+            self.cached_documents.extend(successful_chunks)
+
+            # Save to cache
+            self._save_cache(self.cached_documents, repo_path)
+
+            logger.info(f"Successfully added {len(successful_chunks)}/{len(all_chunks)} chunks")
+            return all_ids
+
+        except Exception as e:
+            logger.error(f"Error adding documents to vector store: {e}")
+            raise
+
+    @staticmethod
+    def _chunk_hash(text: str) -> str:
+        """Content hash used to detect identical chunks across files."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _seed_seen_hashes(self) -> set:
+        """Content hashes already in the store, for cross-call dedup."""
+        seen = set()
+        try:
+            for entry in (getattr(self.vector_store, 'store', None) or {}).values():
+                stored_hash = (entry.get('metadata') or {}).get('content_hash')
+                if stored_hash:
+                    seen.add(stored_hash)
+        except Exception as e:
+            logger.debug(f"Could not seed dedup hashes from store: {e}")
+        return seen
+
+    def _split_duplicate_chunks(self, chunks: List[Document], seen: Optional[set] = None):
+        """Partition chunks into first occurrences and exact duplicates.
+
+        Every chunk gets a content_hash in its metadata; duplicates are
+        additionally marked with duplicate_of pointing at that hash. Hashes
+        already present in the store count as seen, so re-ingesting content
+        that was embedded in an earlier call reuses those vectors too.
+
+        Args:
+            chunks: Chunks about to be embedded
+            seen: Optional hash set shared across calls, so streaming
+                  consumers can dedup batch by batch; seeded from the
+                  store when omitted
+
+        Returns:
+            Tuple of (unique chunks, duplicate chunks)
+        """
+        unique_chunks, duplicate_chunks = [], []
+        if seen is None:
+            seen = self._seed_seen_hashes()
+        for chunk in chunks:
+            content_hash = chunk.metadata.get('content_hash')
+            if content_hash is None:
+                content_hash = self._chunk_hash(chunk.page_content)
+                chunk.metadata['content_hash'] = content_hash
+            if content_hash in seen:
+                chunk.metadata['duplicate_of'] = content_hash
+                duplicate_chunks.append(chunk)
+            else:
+                seen.add(content_hash)
+                unique_chunks.append(chunk)
+        return unique_chunks, duplicate_chunks
+
+    def _replicate_duplicate_embeddings(self, duplicate_chunks: List[Document]):
+        """Reuse stored vectors for duplicate chunks instead of re-embedding.
+
+        Looks up each duplicate's content_hash among the vectors already in
+        the InMemoryVectorStore and inserts a new entry sharing the same
+        vector but carrying the duplicate's own metadata.
+
+        Args:
+            duplicate_chunks: Chunks flagged as exact duplicates
+
+        Returns:
+            Tuple of (ids added, chunks added, chunks with no vector to copy)
+        """
+        vector_by_hash = {}
+        try:
+            for entry in self.vector_store.store.values():
+                entry_hash = entry.get('metadata', {}).get('content_hash')
+                if entry_hash and entry_hash not in vector_by_hash:
+                    vector_by_hash[entry_hash] = entry['vector']
+        except Exception as e:
+            logger.warning(f"Could not read stored vectors for dedup: {e}")
+            return [], [], duplicate_chunks
+
+        ids, added, leftovers = [], [], []
+        for chunk in duplicate_chunks:
+            vector = vector_by_hash.get(chunk.metadata['content_hash'])
+            if vector is None:
+                leftovers.append(chunk)
+                continue
+            doc_id = str(uuid.uuid4())
+            self.vector_store.store[doc_id] = {
+                'id': doc_id,
+                'vector': vector,
+                'text': chunk.page_content,
+                'metadata': chunk.metadata,
+            }
+            ids.append(doc_id)
+            added.append(chunk)
+        return ids, added, leftovers
+
+    async def _add_chunks_batched(self, all_chunks: List[Document], batch_size: int,
+                                  concurrency: int):
+        """Embed and add chunk batches concurrently under a semaphore."""
+        semaphore = asyncio.Semaphore(concurrency)
+        batches = [all_chunks[i:i + batch_size] for i in range(0, len(all_chunks), batch_size)]
+
+        async def _add_batch(batch_num: int, batch: List[Document]):
+            async with semaphore:
+                try:
+                    batch_ids = await self.vector_store.aadd_documents(batch)
+                    logger.info(f"Processed batch {batch_num}/{len(batches)} ({len(batch)} chunks)")
+                    return batch_ids, batch
+                except Exception as e:
+                    logger.warning(f"Failed to process batch {batch_num}: {e}")
+                    # Try adding chunks one by one in this batch
+                    chunk_ids, chunks_added = [], []
+                    for chunk in batch:
+                        try:
+                            chunk_ids.extend(await self.vector_store.aadd_documents([chunk]))
+                            chunks_added.append(chunk)
+                        except Exception as chunk_error:
+                            filename = chunk.metadata.get('filename', 'unknown')
+                            logger.warning(f"Failed to add chunk from {filename}: {chunk_error}")
+                    return chunk_ids, chunks_added
+
+        results = await asyncio.gather(
+            *(_add_batch(batch_num, batch) for batch_num, batch in enumerate(batches, 1))
+        )
+
+        all_ids, successful_chunks = [], []
+        for batch_ids, chunks_added in results:
+            all_ids.extend(batch_ids)
+            successful_chunks.extend(chunks_added)
+        return all_ids, successful_chunks
+
+    def similarity_search(self, query: str, k: int = 5, filter_dict: Dict[str, Any] = None,
+                          precomputed_embedding: Optional[List[float]] = None) -> List[Document]:
         """Perform similarity search.
-        
+
         Args:
             query: Search query
             k: Number of results to return
             filter_dict: Optional metadata filters
-            
+            precomputed_embedding: Optional query embedding; when given the
+                                   query is not re-embedded
+
         Returns:
             List of matching documents
         """
         try:
-            if filter_dict:
-                # Filter documents manually since InMemoryVectorStore doesn't support filters
-                filtered_docs = []
-                for doc in self.cached_documents:
-                    match = all(
-                        doc.metadata.get(key) == value 
-                        for key, value in filter_dict.items()
-                    )
-                    if match:
-                        filtered_docs.append(doc)
-                        
-                if not filtered_docs:
-                    logger.info("No documents match the filter criteria")
-                    return []
-                    
-                # Create temporary vector store with filtered documents
-                temp_store = InMemoryVectorStore(embedding=EMBEDDINGS)
-                temp_store.add_documents(filtered_docs)
-                results = temp_store.similarity_search(query=query, k=k)
+            if self._ensure_matrix():
+                results = self._matrix_search(query, k, filter_dict, precomputed_embedding)
+            elif precomputed_embedding is not None:
+                results = self.vector_store.similarity_search_by_vector(
+                    embedding=precomputed_embedding, k=k
+                )
             else:
                 results = self.vector_store.similarity_search(query=query, k=k)
-                
+
             logger.info(f"Found {len(results)} results for query: '{query[:50]}...'")
             return results
-            
+
         except Exception as e:
             logger.error(f"Error performing similarity search: {e}")
             return []
-            
+
+    def _ensure_matrix(self) -> bool:
+        """Build or refresh the embedding matrix from the store.
+
+        Rebuilds only when the number of stored vectors changed; the
+        rebuild stacks existing vectors (no embedding calls) and
+        precomputes per-key metadata arrays for vectorized filtering.
+
+        Returns:
+            True if the matrix is available for searching
+        """
+        store = getattr(self.vector_store, 'store', None)
+        if store is None:
+            return False
+        if ((self._emb_matrix is not None or self._emb_matrix_int8 is not None)
+                and self._matrix_store_size == len(store)):
+            return True
+
+        try:
+            entries = [entry for entry in store.values() if entry.get('vector') is not None]
+            self._matrix_store_size = len(store)
+            if not entries:
+                self._emb_matrix = None
+                self._emb_matrix_int8 = None
+                self._emb_row_scale = None
+                self._ann_index = None
+                self._matrix_entries = []
+                self._meta_arrays = {}
+                self._filter_row_cache = {}
+                return False
+
+            matrix = np.asarray([entry['vector'] for entry in entries], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+
+            meta_keys = set()
+            for entry in entries:
+                meta_keys.update((entry.get('metadata') or {}).keys())
+            self._meta_arrays = {
+                key: np.array(
+                    [(entry.get('metadata') or {}).get(key) for entry in entries],
+                    dtype=object
+                )
+                for key in meta_keys
+            }
+
+            if self.quantize_embeddings:
+                # Symmetric per-row quantization: row i becomes int8 codes
+                # plus one float scale, cutting matrix memory 4x for a
+                # typical < 0.5% hit on cosine scores
+                scales = np.abs(matrix).max(axis=1) / 127.0
+                scales[scales == 0] = 1.0
+                self._emb_matrix_int8 = np.round(
+                    matrix / scales[:, np.newaxis]
+                ).astype(np.int8)
+                self._emb_row_scale = scales.astype(np.float32)
+                self._emb_matrix = None
+                # An HNSW index would keep full float copies of every
+                # vector, undoing the memory win quantization is for
+                self._ann_index = None
+            else:
+                self._emb_matrix = matrix
+                self._emb_matrix_int8 = None
+                self._emb_row_scale = None
+                self._ann_index = self._build_ann_index(matrix)
+            self._matrix_entries = entries
+            self._filter_row_cache = {}
+            return True
+        except Exception as e:
+            logger.warning(f"Could not build embedding matrix: {e}")
+            self._emb_matrix = None
+            self._emb_matrix_int8 = None
+            self._emb_row_scale = None
+            self._ann_index = None
+            return False
+
+    @staticmethod
+    def _build_ann_index(matrix: np.ndarray):
+        """Build an HNSW index over the normalized matrix when it pays off.
+
+        Returns None (keeping the exact scan) when faiss is not installed
+        or the corpus is small; above _ANN_MIN_CHUNKS the sub-linear graph
+        search wins decisively and recall at k=5 stays above ~0.95.
+
+        Args:
+            matrix: Row-normalized float32 embedding matrix
+
+        Returns:
+            A populated faiss index, or None
+        """
+        if faiss is None or len(matrix) < _ANN_MIN_CHUNKS:
+            return None
+        try:
+            index = faiss.IndexHNSWFlat(matrix.shape[1], 32)
+            index.hnsw.efConstruction = 200
+            # Rows are unit-normalized, so inner product equals cosine
+            index.metric_type = faiss.METRIC_INNER_PRODUCT
+            index.add(np.ascontiguousarray(matrix))
+            logger.info(f"Built HNSW index over {len(matrix)} vectors")
+            return index
+        except Exception as e:
+            logger.warning(f"Could not build HNSW index, using exact scan: {e}")
+            return None
+
+    def _ann_search(self, query_vec: np.ndarray, k: int) -> List[Document]:
+        """Top-k search through the HNSW index (unfiltered queries only)."""
+        self._ann_index.hnsw.efSearch = 64
+        _, indices = self._ann_index.search(
+            query_vec.reshape(1, -1).astype(np.float32), min(k, len(self._matrix_entries))
+        )
+        return [
+            Document(page_content=self._matrix_entries[i]['text'],
+                     metadata=self._matrix_entries[i].get('metadata') or {})
+            for i in indices[0] if i >= 0
+        ]
+
+    def _matrix_search(self, query: str, k: int, filter_dict: Dict[str, Any] = None,
+                       precomputed_embedding: Optional[List[float]] = None) -> List[Document]:
+        """Top-k cosine search over the embedding matrix with optional filters.
+
+        Filters become a boolean mask over precomputed metadata arrays, so
+        filtered searches cost one masked matrix-vector product instead of
+        re-embedding the filtered subset into a temporary store.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+            precomputed_embedding: Optional query embedding to reuse
+
+        Returns:
+            List of matching documents, best first
+        """
+        if precomputed_embedding is not None:
+            query_vec = np.asarray(precomputed_embedding, dtype=np.float32)
+        else:
+            query_vec = np.asarray(_embed_query_cached(query), dtype=np.float32)
+        query_vec /= np.linalg.norm(query_vec) or 1.0
+
+        # Filtered queries restrict the scan to their row bucket, so only
+        # the unfiltered path can take the sub-linear ANN route
+        if self._ann_index is not None and not filter_dict:
+            return self._ann_search(query_vec, k)
+
+        if filter_dict:
+            rows = self._filter_rows(filter_dict)
+            if rows.size == 0:
+                logger.info("No documents match the filter criteria")
+                return []
+            # Score only the selected rows - cost is proportional to the
+            # filter's selectivity, not the corpus size
+            if self._emb_matrix is not None:
+                scores = self._emb_matrix[rows] @ query_vec
+            else:
+                scores = self._similarity_scores(query_vec)[rows]
+            candidates = rows
+        else:
+            scores = self._similarity_scores(query_vec)
+            candidates = None
+
+        # O(N) partition plus an O(k log k) resort instead of a full
+        # O(N log N) argsort over every score
+        k_eff = min(k, len(scores))
+        if k_eff >= len(scores):
+            top = np.argsort(-scores)
+        else:
+            top = np.argpartition(-scores, k_eff - 1)[:k_eff]
+            top = top[np.argsort(-scores[top])]
+
+        results = []
+        for local_i in top:
+            if not np.isfinite(scores[local_i]):
+                continue
+            entry_i = candidates[local_i] if candidates is not None else local_i
+            entry = self._matrix_entries[entry_i]
+            results.append(Document(page_content=entry['text'],
+                                    metadata=entry.get('metadata') or {}))
+        return results
+
+    def _filter_rows(self, filter_dict: Dict[str, Any]) -> np.ndarray:
+        """Row indices matching the filters, cached per filter combination.
+
+        Args:
+            filter_dict: Metadata filters (key -> exact value)
+
+        Returns:
+            int array of matching row indices (possibly empty)
+        """
+        try:
+            cache_key = tuple(sorted(filter_dict.items()))
+        except TypeError:
+            cache_key = None  # Unhashable filter values - skip caching
+        if cache_key is not None:
+            cached = self._filter_row_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        mask = np.ones(len(self._matrix_entries), dtype=bool)
+        for key, value in filter_dict.items():
+            values = self._meta_arrays.get(key)
+            if values is None:
+                mask = np.zeros(len(self._matrix_entries), dtype=bool)
+                break
+            mask &= (values == value)
+        rows = np.nonzero(mask)[0]
+
+        if cache_key is not None:
+            self._filter_row_cache[cache_key] = rows
+        return rows
+
+    def _similarity_scores(self, query_vec: np.ndarray) -> np.ndarray:
+        """Score the normalized query vector against every stored row.
+
+        The float32 matrix is one matrix-vector product. The quantized
+        matrix is scanned in blocks - each block of int8 codes is upcast,
+        multiplied, and its rows rescaled - so peak memory stays at one
+        block's worth of float32 rather than a full dequantized copy.
+
+        Args:
+            query_vec: Normalized query embedding
+
+        Returns:
+            Cosine scores aligned with _matrix_entries
+        """
+        if self._emb_matrix is not None:
+            return self._emb_matrix @ query_vec
+
+        n = len(self._emb_matrix_int8)
+        scores = np.empty(n, dtype=np.float32)
+        block = 8192
+        for start in range(0, n, block):
+            rows = self._emb_matrix_int8[start:start + block].astype(np.float32)
+            scores[start:start + block] = rows @ query_vec
+        scores *= self._emb_row_scale
+        return scores
+
+    def _ensure_meta_cols(self) -> bool:
+        """Build or refresh the columnar metadata view of cached documents.
+
+        Rebuilds only when the cached-document count changes; each metadata
+        key becomes one contiguous object array.
+
+        Returns:
+            True if columns are available
+        """
+        if self._meta_cols_size == len(self.cached_documents):
+            return bool(self._meta_cols)
+
+        try:
+            keys = set()
+            for doc in self.cached_documents:
+                keys.update(doc.metadata.keys())
+            self._meta_cols = {
+                key: np.array(
+                    [doc.metadata.get(key) for doc in self.cached_documents],
+                    dtype=object
+                )
+                for key in keys
+            }
+            self._meta_cols_size = len(self.cached_documents)
+            return bool(self._meta_cols)
+        except Exception as e:
+            logger.warning(f"Could not build metadata columns: {e}")
+            self._meta_cols = {}
+            return False
+
+    @staticmethod
+    def _column_values(column: Optional[np.ndarray]) -> np.ndarray:
+        """Return a column with missing (None) entries dropped."""
+        if column is None:
+            return np.empty(0, dtype=object)
+        return column[column != None]  # noqa: E711 - elementwise None test
+
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector store."""
         try:
-            languages = set()
-            directories = set()
-            file_types = set()
-            total_size = 0
-            
-            for doc in self.cached_documents:
-                metadata = doc.metadata
-                if 'language' in metadata:
-                    languages.add(metadata['language'])
-                if 'directory' in metadata:
-                    directories.add(metadata['directory'])
-                if 'filename' in metadata:
-                    ext = os.path.splitext(metadata['filename'])[1]
-                    if ext:
-                        file_types.add(ext)
-                if 'size' in metadata:
-                    total_size += metadata['size']
-                    
-            return {
+            if (self._stats_cache is not None
+                    and self._stats_cache_size == len(self.cached_documents)):
+                return dict(self._stats_cache)
+
+            if not self._ensure_meta_cols():
+                return {
+                    'total_documents': len(self.cached_documents),
+                    'languages': [],
+                    'directories': [],
+                    'file_types': [],
+                    'total_code_size_bytes': 0,
+                    'cache_directory': self.cache_directory
+                }
+
+            # Column scans instead of per-document metadata lookups
+            languages = np.unique(self._column_values(self._meta_cols.get('language')))
+            directories = np.unique(self._column_values(self._meta_cols.get('directory')))
+            filenames = np.unique(self._column_values(self._meta_cols.get('filename')))
+            sizes = self._column_values(self._meta_cols.get('size'))
+
+            file_types = {
+                ext for ext in (os.path.splitext(name)[1] for name in filenames) if ext
+            }
+
+            # Resident size of the search matrix, so the int8-quantized
+            # mode's saving is visible in status output
+            index_bytes = 0
+            if self._emb_matrix is not None:
+                index_bytes = int(self._emb_matrix.nbytes)
+            elif self._emb_matrix_int8 is not None:
+                index_bytes = int(self._emb_matrix_int8.nbytes
+                                  + self._emb_row_scale.nbytes)
+
+            stats = {
                 'total_documents': len(self.cached_documents),
-                'languages': sorted(list(languages)),
-                'directories': sorted(list(directories)),
-                'file_types': sorted(list(file_types)),
-                'total_code_size_bytes': total_size,
+                'languages': sorted(languages.tolist()),
+                'directories': sorted(directories.tolist()),
+                'file_types': sorted(file_types),
+                'total_code_size_bytes': int(sizes.sum()) if len(sizes) else 0,
+                'index_bytes': index_bytes,
                 'cache_directory': self.cache_directory
             }
-            
+            self._stats_cache = stats
+            self._stats_cache_size = len(self.cached_documents)
+            return dict(stats)
+
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {}
@@ -362,9 +1341,23 @@ class CodeVectorStore:
             # Clear vector store
             self.vector_store = InMemoryVectorStore(embedding=EMBEDDINGS)
             self.cached_documents = []
-            
+            self._emb_matrix = None
+            self._emb_matrix_int8 = None
+            self._emb_row_scale = None
+            self._ann_index = None
+            self._matrix_entries = []
+            self._meta_arrays = {}
+            self._filter_row_cache = {}
+            self._matrix_store_size = -1
+            self._meta_cols = {}
+            self._meta_cols_size = -1
+            self._stats_cache = None
+            self._stats_cache_size = -1
+
             # Remove cache files
-            for file_path in [self.documents_cache_file, self.metadata_file]:
+            for file_path in [self.documents_cache_file, self.metadata_file,
+                              self.embeddings_cache_file, self.texts_cache_file,
+                              self.doc_meta_cache_file]:
                 if os.path.exists(file_path):
                     os.remove(file_path)
                     
@@ -1,9 +1,10 @@
 """Example usage of the Code Repository RAG system."""
 
+import asyncio
 import os
 from main import CodeRAGSystem
 
-def main():
+async def main():
     """Demonstrate the RAG system functionality."""
     
     print("🔍 Code Repository RAG System - Example Usage")
@@ -41,32 +42,49 @@ def main():
     print(f"\n🔍 Running example searches...")
     print("-" * 30)
     
-    for i, query in enumerate(example_queries, 1):
+    # Queries run concurrently - embedding and summarization are both
+    # I/O-bound, so wall time tracks the slowest query, not the sum
+    results = await asyncio.gather(
+        *[rag_system.asearch_and_summarize(query, k=3) for query in example_queries],
+        return_exceptions=True
+    )
+
+    for i, (query, result) in enumerate(zip(example_queries, results), 1):
+        if isinstance(result, Exception):
+            print(f"\n{i}. Query: '{query}'")
+            print(f"   ⚠️  Error: {result}")
+            continue
+
         print(f"\n{i}. Query: '{query}'")
-        
-        try:
-            result = rag_system.search_and_summarize(query, k=3)
-            
-            if result['documents_found'] > 0:
-                print(f"   📄 Found: {result['documents_found']} documents")
-                print(f"   💻 Languages: {', '.join(result['languages'])}")
-                
-                # Show brief summary (first 200 chars)
-                summary = result['summary']
-                if len(summary) > 200:
-                    summary = summary[:200] + "..."
-                print(f"   📝 Summary: {summary}")
-                
-            else:
-                print("   ❌ No relevant documents found")
-                
-        except Exception as e:
-            print(f"   ⚠️  Error: {e}")
+
+        if result['documents_found'] > 0:
+            print(f"   📄 Found: {result['documents_found']} documents")
+            print(f"   💻 Languages: {', '.join(result['languages'])}")
+
+            # Show brief summary (first 200 chars)
+            summary = result['summary']
+            if len(summary) > 200:
+                summary = summary[:200] + "..."
+            print(f"   📝 Summary: {summary}")
+
+        else:
+            print("   ❌ No relevant documents found")
     
+    # Streaming demo: summary tokens print as the model produces them, so
+    # output starts at time-to-first-token instead of after the whole
+    # response has been generated
+    print(f"\n🔊 Streaming summary for: '{example_queries[0]}'")
+    try:
+        for token in rag_system.stream_search_and_summarize(example_queries[0], k=3):
+            print(token, end='', flush=True)
+        print()
+    except Exception as e:
+        print(f"⚠️  Error: {e}")
+
     print(f"\n🎉 Example usage complete!")
     print("\n💡 Try running your own searches:")
     print("python main.py search --query 'your search query here'")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,10 +1,19 @@
 """Main interface for the Code Repository RAG system."""
 
+import hashlib
 import os
 import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Optional
 from .core.retriever import CodeRetriever
 from .core.summarizer import CodeSummarizer
+from .core.summary_cache import SummaryCache
+from .config.llms import EMBEDDINGS
 import logging
 
 # Set up logging
@@ -12,6 +21,49 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class QueryCache:
+    """LRU cache with TTL expiry for query results.
+
+    Repeat queries (CLI re-runs, the example's hard-coded list) skip the
+    embedding round trip and the LLM summary entirely while an entry is
+    fresh; least-recently-used entries are evicted once full.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_secs: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl_secs: Seconds an entry stays servable
+        """
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self._entries = OrderedDict()  # key -> (timestamp, value)
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        timestamp, value = entry
+        if time.time() - timestamp > self.ttl_secs:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Insert a value, evicting the least-recently-used entry if full."""
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry."""
+        self._entries.clear()
+
+
 class CodeRAGSystem:
     """Main class for the Code Repository RAG system."""
     
@@ -23,6 +75,8 @@ class CodeRAGSystem:
         """
         self.retriever = CodeRetriever(cache_directory)
         self.summarizer = CodeSummarizer()
+        self._query_cache = QueryCache()
+        self._summary_cache = SummaryCache(os.path.join(cache_directory, "summaries.db"))
         logger.info(f"Initialized Code RAG system with cache directory: {cache_directory}")
         
     def index_repository(self, repo_path: str) -> dict:
@@ -41,6 +95,7 @@ class CodeRAGSystem:
             raise ValueError(f"Repository path does not exist: {repo_path}")
             
         logger.info(f"Starting repository indexing: {repo_path}")
+        self._query_cache.clear()  # Cached results describe the old index
         result = self.retriever.index_repository(repo_path)
         
         if result['success']:
@@ -55,21 +110,30 @@ class CodeRAGSystem:
             
         return result
         
-    def search_only(self, query: str, k: int = 5, language: Optional[str] = None, 
-                   directory: Optional[str] = None) -> dict:
+    def search_only(self, query: str, k: int = 5, language: Optional[str] = None,
+                   directory: Optional[str] = None,
+                   query_embedding: Optional[list] = None) -> dict:
         """Search repository and return documents without summary.
-        
+
         Args:
             query: Search query
             k: Number of results to retrieve
             language: Optional language filter
             directory: Optional directory filter
-            
+            query_embedding: Optional precomputed embedding of query, passed
+                             through to the retriever on the unfiltered path
+
         Returns:
             Dictionary with search results (no LLM summary)
         """
         logger.info(f"Searching for: '{query}' (no summary)")
-        
+
+        cache_key = ('search_only', query, k, language, directory)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Query cache hit, skipping search")
+            return dict(cached)
+
         # Prepare filters
         filters = {}
         if language:
@@ -83,8 +147,9 @@ class CodeRAGSystem:
         elif directory:
             documents = self.retriever.search_by_directory(query, directory, k)
         else:
-            documents = self.retriever.search(query, k, filters)
-            
+            documents = self.retriever.search(query, k, filters,
+                                              query_embedding=query_embedding)
+
         if not documents:
             return {
                 'query': query,
@@ -94,13 +159,36 @@ class CodeRAGSystem:
             }
             
         # Extract basic info without LLM processing
+        key_files, languages, directories = self._extract_metadata(documents)
+
+        result = {
+            'query': query,
+            'documents_found': len(documents),
+            'documents': documents,
+            'key_files': key_files,
+            'languages': sorted(list(languages)),
+            'directories': sorted(list(directories))
+        }
+        self._query_cache.put(cache_key, result)
+        return dict(result)
+    
+    @staticmethod
+    def _extract_metadata(documents) -> tuple:
+        """Collect file info, languages and directories in one pass.
+
+        Args:
+            documents: Retrieved documents
+
+        Returns:
+            Tuple of (key_files list, languages set, directories set)
+        """
         key_files = []
         languages = set()
         directories = set()
-        
+
         for doc in documents:
             metadata = doc.metadata
-            
+
             if 'source' in metadata and 'filename' in metadata:
                 key_files.append({
                     'file': metadata['filename'],
@@ -109,22 +197,38 @@ class CodeRAGSystem:
                     'size': metadata.get('size', 0),
                     'content': doc.page_content
                 })
-                
+
             if 'language' in metadata:
                 languages.add(metadata['language'])
             if 'directory' in metadata:
                 directories.add(metadata['directory'])
-                
-        return {
-            'query': query,
-            'documents_found': len(documents),
-            'documents': documents,
-            'key_files': key_files,
-            'languages': sorted(list(languages)),
-            'directories': sorted(list(directories))
-        }
-    
-    def search_and_summarize(self, query: str, k: int = 5, language: Optional[str] = None, 
+
+        return key_files, languages, directories
+
+    @staticmethod
+    def _summary_key(query: str, documents) -> str:
+        """Content-addressed key for the summary cache.
+
+        Hashes the normalized query together with the sorted content
+        hashes of the retrieved documents, so the same documents for the
+        same question hit the cache no matter how they were retrieved -
+        different k, filters, or even a reindex of unchanged files.
+
+        Args:
+            query: Search query
+            documents: Retrieved documents
+
+        Returns:
+            Hex digest identifying this (query, documents) pair
+        """
+        doc_ids = sorted(
+            doc.metadata.get('content_hash') or doc.metadata.get('source', '')
+            for doc in documents
+        )
+        material = '\x00'.join([' '.join(query.lower().split())] + doc_ids)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def search_and_summarize(self, query: str, k: int = 5, language: Optional[str] = None,
                            directory: Optional[str] = None) -> dict:
         """Search repository and generate summary.
         
@@ -138,14 +242,20 @@ class CodeRAGSystem:
             Dictionary with search results and summary
         """
         logger.info(f"Searching for: '{query}'")
-        
+
+        cache_key = ('summarize', query, k, language, directory)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Query cache hit, skipping search and summary")
+            return dict(cached)
+
         # Prepare filters
         filters = {}
         if language:
             filters['language'] = language
         if directory:
             filters['directory'] = directory
-            
+
         # Search for relevant documents
         if language:
             documents = self.retriever.search_by_language(query, language, k)
@@ -153,7 +263,7 @@ class CodeRAGSystem:
             documents = self.retriever.search_by_directory(query, directory, k)
         else:
             documents = self.retriever.search(query, k, filters)
-            
+
         if not documents:
             return {
                 'query': query,
@@ -161,11 +271,19 @@ class CodeRAGSystem:
                 'summary': 'No relevant code documents found for your query.',
                 'suggestions': ['Try using different search terms', 'Check if the repository has been indexed']
             }
-            
-        # Generate comprehensive insights
-        insights = self.summarizer.generate_insights(query, documents)
-        
-        return {
+
+        # Generate comprehensive insights, unless this exact (query,
+        # documents) pair was already summarized - then the LLM call is
+        # skipped entirely
+        summary_key = self._summary_key(query, documents)
+        insights = self._summary_cache.get(summary_key)
+        if insights is None:
+            insights = self.summarizer.generate_insights(query, documents)
+            self._summary_cache.put(summary_key, insights)
+        else:
+            logger.info("Summary cache hit, skipping insight generation")
+
+        result = {
             'query': query,
             'documents_found': len(documents),
             'summary': insights['summary'],
@@ -174,7 +292,164 @@ class CodeRAGSystem:
             'directories': insights['directories'],
             'suggestions': insights['suggestions']
         }
+        self._query_cache.put(cache_key, result)
+        return dict(result)
         
+    def stream_search_and_summarize(self, query: str, k: int = 5,
+                                    language: Optional[str] = None,
+                                    directory: Optional[str] = None):
+        """Search and stream the summary instead of returning it whole.
+
+        The caller sees output at time-to-first-token rather than after
+        the full LLM response; total compute is unchanged.
+
+        Args:
+            query: Search query
+            k: Number of results to retrieve
+            language: Optional language filter
+            directory: Optional directory filter
+
+        Yields:
+            Summary text fragments in generation order
+        """
+        logger.info(f"Searching for: '{query}' (streaming summary)")
+
+        filters = {}
+        if language:
+            filters['language'] = language
+        if directory:
+            filters['directory'] = directory
+
+        if language:
+            documents = self.retriever.search_by_language(query, language, k)
+        elif directory:
+            documents = self.retriever.search_by_directory(query, directory, k)
+        else:
+            documents = self.retriever.search(query, k, filters)
+
+        yield from self.summarizer.stream_summary(query, documents)
+
+    async def asearch_and_summarize(self, query: str, k: int = 5, language: Optional[str] = None,
+                                    directory: Optional[str] = None) -> dict:
+        """Async variant of search_and_summarize for concurrent querying.
+
+        The query embedding and the insight-summary LLM call both await
+        instead of blocking, so several queries can run under
+        asyncio.gather with wall time near the slowest one.
+
+        Args:
+            query: Search query
+            k: Number of results to retrieve
+            language: Optional language filter
+            directory: Optional directory filter
+
+        Returns:
+            Dictionary with search results and summary
+        """
+        logger.info(f"Searching for: '{query}' (async)")
+
+        cache_key = ('summarize', query, k, language, directory)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Query cache hit, skipping search and summary")
+            return dict(cached)
+
+        # Prepare filters
+        filters = {}
+        if language:
+            filters['language'] = language
+        if directory:
+            filters['directory'] = directory
+
+        try:
+            query_embedding = await EMBEDDINGS.aembed_query(query)
+        except Exception as e:
+            logger.warning(f"Async query embedding failed, embedding synchronously: {e}")
+            query_embedding = None
+
+        # The scan itself is local and fast once the embedding is in hand
+        documents = self.retriever.search(query, k, filters or None,
+                                          query_embedding=query_embedding)
+
+        if not documents:
+            return {
+                'query': query,
+                'documents_found': 0,
+                'summary': 'No relevant code documents found for your query.',
+                'suggestions': ['Try using different search terms', 'Check if the repository has been indexed']
+            }
+
+        summary_key = self._summary_key(query, documents)
+        insights = self._summary_cache.get(summary_key)
+        if insights is None:
+            insights = await self.summarizer.agenerate_insights(query, documents)
+            self._summary_cache.put(summary_key, insights)
+        else:
+            logger.info("Summary cache hit, skipping insight generation")
+
+        result = {
+            'query': query,
+            'documents_found': len(documents),
+            'summary': insights['summary'],
+            'key_files': insights['key_files'],
+            'languages': insights['languages'],
+            'directories': insights['directories'],
+            'suggestions': insights['suggestions']
+        }
+        self._query_cache.put(cache_key, result)
+        return dict(result)
+
+    def search_and_summarize_batch(self, queries: list, k: int = 5) -> list:
+        """Search and summarize several queries with one embedding call.
+
+        All queries are embedded in a single embed_documents request and
+        the vectors are passed straight to the retriever, so N queries pay
+        one embedding round trip instead of N sequential ones.
+
+        Args:
+            queries: Search queries
+            k: Number of results to retrieve per query
+
+        Returns:
+            List of result dictionaries, aligned with queries, in the same
+            shape as search_and_summarize
+        """
+        logger.info(f"Batch searching {len(queries)} queries")
+        if not queries:
+            return []
+
+        try:
+            query_embeddings = EMBEDDINGS.embed_documents(list(queries))
+        except Exception as e:
+            logger.warning(f"Batch query embedding failed, embedding per query: {e}")
+            query_embeddings = [None] * len(queries)
+
+        results = []
+        for query, embedding in zip(queries, query_embeddings):
+            documents = self.retriever.search(query, k, query_embedding=embedding)
+
+            if not documents:
+                results.append({
+                    'query': query,
+                    'documents_found': 0,
+                    'summary': 'No relevant code documents found for your query.',
+                    'suggestions': ['Try using different search terms', 'Check if the repository has been indexed']
+                })
+                continue
+
+            insights = self.summarizer.generate_insights(query, documents)
+            results.append({
+                'query': query,
+                'documents_found': len(documents),
+                'summary': insights['summary'],
+                'key_files': insights['key_files'],
+                'languages': insights['languages'],
+                'directories': insights['directories'],
+                'suggestions': insights['suggestions']
+            })
+
+        return results
+
     def get_system_status(self) -> dict:
         """Get current system status and statistics.
         
@@ -191,14 +466,116 @@ class CodeRAGSystem:
         
     def clear_index(self):
         """Clear all indexed data."""
+        self._query_cache.clear()
+        self._summary_cache.clear()
         self.retriever.clear_index()
         print("🗑️ Cleared all indexed data")
 
 
+def serve(rag_system: CodeRAGSystem, host: str = "127.0.0.1", port: int = 8754):
+    """Run a long-lived daemon that keeps the RAG system warm.
+
+    One CodeRAGSystem (index load, embedding model init, query caches)
+    is shared across requests instead of being rebuilt per CLI call, so
+    each query skips the 1-3s cold start. Exposes POST /search and
+    POST /search_and_summarize taking JSON bodies with query/k/language/
+    directory fields.
+
+    Args:
+        rag_system: The system instance to serve
+        host: Interface to bind
+        port: Port to bind
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                query = payload.get('query')
+                if not query:
+                    self._reply(400, {'error': 'query is required'})
+                    return
+                k = int(payload.get('k', 5))
+                language = payload.get('language')
+                directory = payload.get('directory')
+
+                if self.path == '/search':
+                    result = rag_system.search_only(query, k, language, directory)
+                    # Document objects are not JSON-serializable; key_files
+                    # already carry their content
+                    result.pop('documents', None)
+                elif self.path == '/search_and_summarize':
+                    result = rag_system.search_and_summarize(query, k, language, directory)
+                else:
+                    self._reply(404, {'error': f'unknown endpoint: {self.path}'})
+                    return
+                self._reply(200, result)
+            except Exception as e:
+                logger.error(f"Error handling request: {e}")
+                self._reply(500, {'error': str(e)})
+
+        def _reply(self, status: int, body: dict):
+            # Compact separators: less CPU and fewer bytes on the wire for
+            # the multi-KB result dicts serve mode ships per request
+            data = json.dumps(body, separators=(',', ':'), default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logger.info(f"{self.address_string()} - {format % args}")
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    print(f"🚀 Serving warm RAG system on http://{host}:{port}")
+    print("POST /search or /search_and_summarize with "
+          '{"query": "...", "k": 5} - Ctrl+C to stop')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+
+def query_server(query: str, k: int = 5, language: Optional[str] = None,
+                 directory: Optional[str] = None, host: str = "127.0.0.1",
+                 port: int = 8754) -> dict:
+    """Send one query to a running serve daemon and return its result.
+
+    Args:
+        query: Search query
+        k: Number of results to retrieve
+        language: Optional language filter
+        directory: Optional directory filter
+        host: Daemon host
+        port: Daemon port
+
+    Returns:
+        The daemon's JSON response as a dictionary
+    """
+    payload = {'query': query, 'k': k}
+    if language:
+        payload['language'] = language
+    if directory:
+        payload['directory'] = directory
+    request = urllib.request.Request(
+        f"http://{host}:{port}/search_and_summarize",
+        data=json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
 def main():
     """Main CLI interface."""
     parser = argparse.ArgumentParser(description='Code Repository RAG System')
-    parser.add_argument('command', choices=['index', 'search', 'search-only', 'status', 'clear'],
+    parser.add_argument('command',
+                       choices=['index', 'search', 'search-only', 'status', 'clear',
+                                'serve', 'client'],
                        help='Command to execute')
     parser.add_argument('--repo-path', type=str,
                        help='Absolute path to repository (for index command)')
@@ -212,13 +589,47 @@ def main():
                        help='Number of results to return (default: 5)')
     parser.add_argument('--cache-dir', type=str, default='./cache',
                        help='Cache directory (default: ./cache)')
-    
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                       help='Host for serve/client commands (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8754,
+                       help='Port for serve/client commands (default: 8754)')
+
     args = parser.parse_args()
-    
+
+    # The client talks to an already-warm daemon; constructing a local
+    # CodeRAGSystem here would pay exactly the cold start serve avoids
+    if args.command == 'client':
+        if not args.query:
+            print("❌ --query is required for client command")
+            return
+
+        try:
+            result = query_server(
+                query=args.query,
+                k=args.k,
+                language=args.language,
+                directory=args.directory,
+                host=args.host,
+                port=args.port
+            )
+
+            print(f"\n🔍 Search Query: {result['query']}")
+            print(f"📄 Documents Found: {result['documents_found']}")
+
+            if result['documents_found'] > 0:
+                print(f"\n📝 Summary:\n{result['summary']}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            print(f"Is the daemon running? Start it with 'python main.py serve'")
+        return
+
     # Initialize system
     rag_system = CodeRAGSystem(args.cache_dir)
-    
-    if args.command == 'index':
+
+    if args.command == 'serve':
+        serve(rag_system, args.host, args.port)
+
+    elif args.command == 'index':
         if not args.repo_path:
             print("❌ --repo-path is required for index command")
             return
@@ -0,0 +1,46 @@
+"""Shared session-scoped fixtures for the integration tests.
+
+Agent constructors build OpenAI clients and load schema prompts, which
+is the expensive part of these tests; one instance per pytest session
+amortizes that cost instead of paying it in every test function.
+"""
+
+import pytest
+
+from agent_powered_analysis.agents.summary_agent import SummaryAgent
+from agent_powered_analysis.agents.translator_agent import TranslatorAgent
+
+
+@pytest.fixture(scope="session")
+def translator():
+    """One TranslatorAgent shared across the whole test session."""
+    return TranslatorAgent()
+
+
+@pytest.fixture(scope="session")
+def summary_agent():
+    """One SummaryAgent shared across the whole test session."""
+    return SummaryAgent()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "live: run against the real LLM instead of the canned stub")
+
+
+@pytest.fixture(autouse=True)
+def stub_summary(monkeypatch, request):
+    """Replace the generate_summary LLM call with a canned response.
+
+    The remote call dominates suite runtime; by default every test gets
+    a deterministic stub, and tests marked @pytest.mark.live opt back
+    into the real model (run them with `pytest -m live`).
+    """
+    if 'live' in request.keywords:
+        return
+    monkeypatch.setattr(
+        SummaryAgent, 'generate_summary',
+        lambda self, query_result, original_intent: (
+            f"[stub] {original_intent} ({len(query_result.records)} records)"
+        )
+    )
@@ -19,32 +19,38 @@ def examine_database_code_format():
     try:
         connector = Neo4jConnector()
         
-        # Query to get nodes with code attributes
+        # Classification and truncation happen server-side: the CASE
+        # resolves the format in Cypher (STARTS WITH is index-backed via
+        # the code text indexes) and only a 100-char preview crosses the
+        # wire instead of full code blobs
         query = """
-        MATCH (n) 
-        WHERE n.code IS NOT NULL 
-        RETURN n.name, labels(n), n.code, n.file_path 
+        MATCH (n)
+        WHERE n.code IS NOT NULL
+        RETURN n.name, labels(n), n.file_path,
+               CASE WHEN n.code STARTS WITH '<CODE>' THEN 'METADATA' ELSE 'REGULAR' END AS fmt,
+               left(n.code, 100) AS preview
         LIMIT 10
         """
-        
+
         print("Executing query to find nodes with code attributes...")
-        results = connector.execute_query(query)
-        
-        print(f"Found {len(results)} nodes with code attributes:")
-        print()
-        
-        for i, record in enumerate(results, 1):
+
+        # Stream records instead of buffering the whole result: the first
+        # row prints after one round-trip and memory stays O(1)
+        found = 0
+        for i, record in enumerate(connector.iter_query(query), 1):
+            found = i
             name = record.get('n.name', 'unknown')
             labels = record.get('labels(n)', [])
-            code = record.get('n.code', '')
             file_path = record.get('n.file_path', '')
-            
+
             print(f"{i}. {':'.join(labels)} '{name}'")
             print(f"   File: {file_path}")
-            print(f"   Code format: {'METADATA' if str(code).startswith('<CODE>') else 'REGULAR'}")
-            print(f"   Code preview: {str(code)[:100]}...")
+            print(f"   Code format: {record.get('fmt', 'REGULAR')}")
+            print(f"   Code preview: {record.get('preview', '')}...")
             print()
-        
+
+        print(f"Found {found} nodes with code attributes.")
+
         # Also check for any metadata format specifically
         metadata_query = """
         MATCH (n) 
@@ -54,15 +60,17 @@ def examine_database_code_format():
         """
         
         print("\nLooking specifically for metadata format code...")
-        metadata_results = connector.execute_query(metadata_query)
-        
-        if metadata_results:
-            print(f"Found {len(metadata_results)} nodes with metadata format code:")
-            for record in metadata_results:
-                name = record.get('n.name', 'unknown')
-                labels = record.get('labels(n)', [])
-                code = record.get('n.code', '')
-                print(f"- {':'.join(labels)} '{name}': {code}")
+
+        metadata_found = 0
+        for record in connector.iter_query(metadata_query):
+            metadata_found += 1
+            name = record.get('n.name', 'unknown')
+            labels = record.get('labels(n)', [])
+            code = record.get('n.code', '')
+            print(f"- {':'.join(labels)} '{name}': {code}")
+
+        if metadata_found:
+            print(f"Found {metadata_found} nodes with metadata format code.")
         else:
             print("No nodes found with metadata format code (<CODE>...)")
     
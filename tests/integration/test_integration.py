@@ -6,6 +6,7 @@ This script tests the new functionality without requiring a full system setup.
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add agent_powered_analysis to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'agent_powered_analysis'))
@@ -93,18 +94,29 @@ def main():
     
     passed = 0
     total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
+
+    def _run_test(test_func):
         try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} PASSED")
-            else:
-                print(f"❌ {test_name} FAILED")
+            return test_func()
         except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
-    
+            return e
+
+    # The tests are independent and dominated by import-time I/O
+    # (LangChain, OpenAI client, Neo4j driver), so run them concurrently
+    # and report in order; wall time is roughly the slowest import
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        outcomes = list(executor.map(_run_test, (test_func for _, test_func in tests)))
+
+    for (test_name, _), outcome in zip(tests, outcomes):
+        print(f"\n🧪 Ran: {test_name}")
+        if isinstance(outcome, Exception):
+            print(f"❌ {test_name} FAILED with exception: {outcome}")
+        elif outcome:
+            passed += 1
+            print(f"✅ {test_name} PASSED")
+        else:
+            print(f"❌ {test_name} FAILED")
+
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
     
@@ -5,20 +5,23 @@ This shows how the system now generates and stores natural language summaries
 instead of raw query results.
 """
 
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import pytest
+
 from agent_powered_analysis.agents.summary_agent import SummaryAgent
 from agent_powered_analysis.graphdb.query_executor import QueryResult
 from agent_powered_analysis.search.iterative_pipeline import SearchIteration
 
-def test_summary_generation():
-    """Test the summary generation functionality."""
-    print("Testing Summary Generation:")
-    print("=" * 50)
-    
-    # Create a SummaryAgent instance
-    summary_agent = SummaryAgent()
-    
-    # Mock some query results that would typically come from Neo4j
-    mock_records = [
+# Mock Neo4j records built once at import and frozen behind read-only
+# views, so every call (and any suite importing this module) shares the
+# same objects instead of re-allocating the nested dicts
+_MOCK_RECORDS = tuple(
+    {key: MappingProxyType(value) for key, value in record.items()}
+    for record in [
         {
             'class': {
                 'labels': ['CLASS'],
@@ -41,10 +44,17 @@ def test_summary_generation():
             }
         }
     ]
-    
-    # Create a QueryResult with mock data
+)
+
+def test_summary_generation(summary_agent, stream=None):
+    """Test the summary generation functionality."""
+    # Collected lines go out in one write instead of a syscall per print
+    out = ["Testing Summary Generation:", "=" * 50]
+
+    # Create a QueryResult with the shared mock data; QueryResult keeps
+    # the tuple as-is, no copy needed
     query_result = QueryResult(
-        records=mock_records,
+        records=_MOCK_RECORDS,
         summary={'total_records': 3, 'execution_time_ms': 45.2},
         success=True,
         execution_time_ms=45.2
@@ -54,18 +64,24 @@ def test_summary_generation():
     intent = "Find all authentication-related classes and methods in the user system"
     summary = summary_agent.generate_summary(query_result, intent)
     
-    print(f"Original Intent: {intent}")
-    print(f"Raw Records: {len(mock_records)} items")
-    print(f"Generated Summary: {summary}")
-    print()
-    
+    out.append(f"Original Intent: {intent}")
+    out.append(f"Raw Records: {len(_MOCK_RECORDS)} items")
+    out.append(f"Generated Summary: {summary}")
+    out.append("")
+    (stream or sys.stdout).write("\n".join(out) + "\n")
+
     return summary
 
-def test_search_iteration_structure():
+@pytest.mark.live
+def test_summary_generation_live(summary_agent):
+    """Same flow against the real LLM; opt in with pytest -m live."""
+    test_summary_generation(summary_agent)
+
+
+def test_search_iteration_structure(stream=None):
     """Test the new SearchIteration structure with summaries."""
-    print("Testing SearchIteration Structure:")
-    print("=" * 50)
-    
+    out = ["Testing SearchIteration Structure:", "=" * 50]
+
     # Create a SearchIteration with the new summary-based structure
     iteration = SearchIteration(
         iteration_number=1,
@@ -80,52 +96,60 @@ def test_search_iteration_structure():
         query_success=True
     )
     
-    print(f"Iteration: {iteration.iteration_number}")
-    print(f"Intent: {iteration.nl_intent}")
-    print(f"Records Found: {iteration.records_count}")
-    print(f"Execution Time: {iteration.execution_time_ms}ms")
-    print(f"Summary: {iteration.result_summary}")
-    print(f"Sufficient: {iteration.sufficient} (confidence: {iteration.confidence})")
-    print()
-    
+    out.append(f"Iteration: {iteration.iteration_number}")
+    out.append(f"Intent: {iteration.nl_intent}")
+    out.append(f"Records Found: {iteration.records_count}")
+    out.append(f"Execution Time: {iteration.execution_time_ms}ms")
+    out.append(f"Summary: {iteration.result_summary}")
+    out.append(f"Sufficient: {iteration.sufficient} (confidence: {iteration.confidence})")
+    out.append("")
+    (stream or sys.stdout).write("\n".join(out) + "\n")
+
     return iteration
 
-def test_workflow_comparison():
+def test_workflow_comparison(stream=None):
     """Show the difference between old and new workflow."""
-    print("Workflow Comparison:")
-    print("=" * 50)
-    
-    print("OLD WORKFLOW:")
-    print("  Query → Raw Results → Store Raw Data → Analyze Raw Data → Report")
-    print("  Issues: Large memory usage, complex processing, raw data exposure")
-    print()
-    
-    print("NEW WORKFLOW:")
-    print("  Query → Raw Results → Generate Summary → Store Summary → Analyze Summary → Report")
-    print("  Benefits: Reduced memory, architectural insights, cleaner data flow")
-    print()
-    
-    print("Key Changes:")
-    print("  • SearchIteration.query_result → SearchIteration.result_summary")
-    print("  • Raw records replaced with natural language insights")
-    print("  • Sufficiency analysis works on summaries")
-    print("  • Final reports built from architectural summaries")
-    print()
+    (stream or sys.stdout).write("\n".join([
+        "Workflow Comparison:",
+        "=" * 50,
+        "OLD WORKFLOW:",
+        "  Query → Raw Results → Store Raw Data → Analyze Raw Data → Report",
+        "  Issues: Large memory usage, complex processing, raw data exposure",
+        "",
+        "NEW WORKFLOW:",
+        "  Query → Raw Results → Generate Summary → Store Summary → Analyze Summary → Report",
+        "  Benefits: Reduced memory, architectural insights, cleaner data flow",
+        "",
+        "Key Changes:",
+        "  • SearchIteration.query_result → SearchIteration.result_summary",
+        "  • Raw records replaced with natural language insights",
+        "  • Sufficiency analysis works on summaries",
+        "  • Final reports built from architectural summaries",
+        "",
+    ]) + "\n")
 
 if __name__ == "__main__":
     print("CodexGraph Summary Workflow Test")
     print("=" * 60)
     print()
     
-    # Test summary generation
-    summary = test_summary_generation()
-    
-    # Test new data structure
-    iteration = test_search_iteration_structure()
-    
-    # Show workflow comparison
-    test_workflow_comparison()
-    
+    # The three tests are independent, so they run concurrently and the
+    # LLM latency in generate_summary overlaps the pure-Python ones; each
+    # writes into its own buffer, flushed in order so output can't
+    # interleave. Under pytest the agent comes from the session-scoped
+    # fixture; as a script we construct it once here
+    buffers = [io.StringIO() for _ in range(3)]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(test_summary_generation, SummaryAgent(), buffers[0]),
+            executor.submit(test_search_iteration_structure, buffers[1]),
+            executor.submit(test_workflow_comparison, buffers[2]),
+        ]
+        for future in futures:
+            future.result()
+    for buffer in buffers:
+        sys.stdout.write(buffer.getvalue())
+
     print("✅ All tests completed successfully!")
     print("The system now generates concise natural language summaries")
     print("that capture architectural insights instead of storing raw data.")
\ No newline at end of file
@@ -3,63 +3,79 @@
 Test script to verify the UNION query validation fix.
 """
 
+import re
+import sys
+
 from agent_powered_analysis.agents.translator_agent import TranslatorAgent
 
-def test_union_validation_fix():
+_UNION_RE = re.compile(r'UNION', re.IGNORECASE)
+
+# Test queries that would previously fail but should now pass
+_TEST_QUERIES = (
+    # Query with mismatched column names (should warn but not fail)
+    """
+    MATCH (m:MODULE)-[:CONTAINS]->(c:CLASS)
+    RETURN m.name AS module_name, c.name AS class_name
+    UNION
+    MATCH (m:MODULE)-[:CONTAINS]->(f:FUNCTION)
+    RETURN m.name AS module_name, f.name AS function_name
+    """,
+
+    # Query with correct UNION structure
+    """
+    MATCH (c:CLASS)-[:HAS_METHOD]->(m:METHOD)
+    RETURN m.name AS name, "method" AS type, m.file_path AS file_path
+    UNION
+    MATCH (c:CLASS)-[:HAS_FIELD]->(f:FIELD)
+    RETURN f.name AS name, "field" AS type, f.file_path AS file_path
+    """,
+
+    # System overview query without UNION
+    """
+    MATCH (m:MODULE)-[:CONTAINS]->(n)
+    WHERE n:CLASS OR n:FUNCTION OR n:GLOBAL_VARIABLE
+    RETURN m.name AS module_name, labels(n)[0] AS node_type, n.name AS component_name
+    ORDER BY m.name, node_type, n.name
+    """
+)
+
+# Strip, UNION-probe and preview-slice each query once at module load so
+# the loop below does no per-iteration string work (the UNION membership
+# test previously upper-cased a full copy of each query every pass)
+_NORMALIZED_QUERIES = tuple(
+    (query.strip(), _UNION_RE.search(query) is not None, query.strip()[:100])
+    for query in _TEST_QUERIES
+)
+
+
+def test_union_validation_fix(translator):
     """Test that the UNION validation is now more lenient."""
-    print("Testing UNION Validation Fix")
-    print("=" * 40)
-    
-    translator = TranslatorAgent()
-    
-    # Test queries that would previously fail but should now pass
-    test_queries = [
-        # Query with mismatched column names (should warn but not fail)
-        """
-        MATCH (m:MODULE)-[:CONTAINS]->(c:CLASS) 
-        RETURN m.name AS module_name, c.name AS class_name
-        UNION 
-        MATCH (m:MODULE)-[:CONTAINS]->(f:FUNCTION) 
-        RETURN m.name AS module_name, f.name AS function_name
-        """,
-        
-        # Query with correct UNION structure
-        """
-        MATCH (c:CLASS)-[:HAS_METHOD]->(m:METHOD) 
-        RETURN m.name AS name, "method" AS type, m.file_path AS file_path
-        UNION 
-        MATCH (c:CLASS)-[:HAS_FIELD]->(f:FIELD) 
-        RETURN f.name AS name, "field" AS type, f.file_path AS file_path
-        """,
-        
-        # System overview query without UNION
-        """
-        MATCH (m:MODULE)-[:CONTAINS]->(n) 
-        WHERE n:CLASS OR n:FUNCTION OR n:GLOBAL_VARIABLE 
-        RETURN m.name AS module_name, labels(n)[0] AS node_type, n.name AS component_name
-        ORDER BY m.name, node_type, n.name
-        """
-    ]
-    
-    for i, query in enumerate(test_queries, 1):
-        print(f"\nTest Query {i}:")
-        print("-" * 20)
-        query = query.strip()
-        
-        # Test validation
-        is_valid = translator.validate_cypher(query)
-        print(f"Query validation result: {is_valid}")
-        
-        if 'UNION' in query.upper():
-            print("Query contains UNION - validation should be lenient")
+    # Collected lines go out in one write instead of a syscall per print
+    out = ["Testing UNION Validation Fix", "=" * 40]
+
+    # One batched validation pass instead of a call per query
+    results = translator.validate_cypher_batch(
+        [query for query, _, _ in _NORMALIZED_QUERIES])
+
+    for i, ((query, has_union, preview), is_valid) in enumerate(
+            zip(_NORMALIZED_QUERIES, results), 1):
+        out.append(f"\nTest Query {i}:")
+        out.append("-" * 20)
+        out.append(f"Query validation result: {is_valid}")
+
+        if has_union:
+            out.append("Query contains UNION - validation should be lenient")
         else:
-            print("Query does not contain UNION")
-        
-        print(f"Query preview: {query[:100]}...")
-    
-    print("\n✅ All tests completed!")
-    print("The system should now handle UNION queries more gracefully.")
-    print("Mismatched column names will generate warnings but not block execution.")
+            out.append("Query does not contain UNION")
+
+        out.append(f"Query preview: {preview}...")
+
+    out.append("\n✅ All tests completed!")
+    out.append("The system should now handle UNION queries more gracefully.")
+    out.append("Mismatched column names will generate warnings but not block execution.")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
-    test_union_validation_fix()
\ No newline at end of file
+    # Under pytest the agent comes from the session-scoped fixture; as a
+    # script we construct it once here
+    test_union_validation_fix(TranslatorAgent())
\ No newline at end of file
@@ -3,15 +3,15 @@
 Test the improved UNION validation to catch column count mismatches.
 """
 
+import sys
+
 from agent_powered_analysis.agents.translator_agent import TranslatorAgent
 
-def test_union_validation():
+def test_union_validation(translator):
     """Test UNION validation catches column count and name mismatches."""
-    print("Testing UNION Validation")
-    print("=" * 40)
-    
-    translator = TranslatorAgent()
-    
+    # Collected lines go out in one write instead of a syscall per print
+    out = ["Testing UNION Validation", "=" * 40]
+
     # Test the problematic query that caused the error
     problematic_query = """
     MATCH (m:MODULE)-[:CONTAINS]->(n) WHERE n:CLASS OR n:FUNCTION OR n:GLOBAL_VARIABLE 
@@ -23,12 +23,12 @@ def test_union_validation():
     ORDER BY source_type, source_name, relationship, target_type, target_name
     """.strip()
     
-    print("Testing problematic query (should FAIL validation):")
-    print(f"Query: {problematic_query[:100]}...")
-    
-    is_valid = translator.validate_cypher(problematic_query)
-    print(f"Validation result: {is_valid}")
-    print("Expected: False (should catch column count mismatch)")
+    out.append("Testing problematic query (should FAIL validation):")
+    out.append(f"Query: {problematic_query[:100]}...")
+
+    prob_valid = translator.validate_cypher(problematic_query)
+    out.append(f"Validation result: {prob_valid}")
+    out.append("Expected: False (should catch column count mismatch)")
     
     # Test a correct query
     correct_query = """
@@ -39,15 +39,18 @@ def test_union_validation():
     ORDER BY m.name, n.name
     """.strip()
     
-    print("\nTesting correct query (should PASS validation):")
-    print(f"Query: {correct_query[:100]}...")
-    
-    is_valid = translator.validate_cypher(correct_query)
-    print(f"Validation result: {is_valid}")
-    print("Expected: True (should pass)")
-    
-    print(f"\n{'✅' if not translator.validate_cypher(problematic_query) else '❌'} Validation correctly catches problematic UNION queries")
-    print(f"{'✅' if translator.validate_cypher(correct_query) else '❌'} Validation allows correct queries")
+    out.append("\nTesting correct query (should PASS validation):")
+    out.append(f"Query: {correct_query[:100]}...")
+
+    correct_valid = translator.validate_cypher(correct_query)
+    out.append(f"Validation result: {correct_valid}")
+    out.append("Expected: True (should pass)")
+
+    out.append(f"\n{'✅' if not prob_valid else '❌'} Validation correctly catches problematic UNION queries")
+    out.append(f"{'✅' if correct_valid else '❌'} Validation allows correct queries")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
-    test_union_validation()
\ No newline at end of file
+    # Under pytest the agent comes from the session-scoped fixture; as a
+    # script we construct it once here
+    test_union_validation(TranslatorAgent())
\ No newline at end of file